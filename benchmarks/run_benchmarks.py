@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the hot paths of the weekly refresh.
+
+Each case times one function on the checked-in MEGA exports, or on a
+league scaled up from them, and reports a rate (simulations, seedings or
+rows per second) together with the peak Python heap seen while it runs.
+
+Wall-clock rates move with the machine and whatever else it is doing, so
+each timed sample of a case is paired with a fixed pure-Python reference
+workload timed in the same sample. The gate compares the median of
+case rate / reference rate against ``benchmarks/baseline.json``; a case
+whose relative speed drops, or whose peak heap grows, by more than
+``--tolerance`` fails the run. Each sample alternates short chunks of the
+two, and every chunk repeats its work for at least ``MIN_CHUNK_SECONDS``,
+so short cases are not timed at the scale of timer and scheduler noise.
+
+Run from the project root:
+    python3 benchmarks/run_benchmarks.py                   # compare against baseline
+    python3 benchmarks/run_benchmarks.py --update-baseline # record a new baseline
+    python3 benchmarks/run_benchmarks.py --only sim --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import dataclasses as dc
+import gc
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+for _dir in ('scripts', 'stats_scripts', 'scripts/fixtures'):
+    if str(ROOT / _dir) not in sys.path:
+        sys.path.insert(0, str(ROOT / _dir))
+
+import generate_synthetic_league  # noqa: E402
+import league_data  # noqa: E402
+import stat_store  # noqa: E402
+from aggregate_team_stats import aggregate_team_stats  # noqa: E402
+from build_player_team_stints import build_player_team_stints  # noqa: E402
+from calc_playoff_probabilities import (  # noqa: E402
+    GameModel, LeagueState, calculate_team_stats, determine_playoff_teams,
+    load_data, load_rankings_data, simulate_remaining_games,
+)
+from calc_sos_by_rankings import run_season  # noqa: E402
+from power_rankings_roster import (  # noqa: E402
+    build_team_index, build_team_metrics, normalize_player_row, read_players, read_teams,
+)
+
+BASELINE_PATH = ROOT / 'benchmarks' / 'baseline.json'
+DEFAULT_TOLERANCE = 0.30
+DEFAULT_REPEAT = 7
+# A timed sample alternates CHUNKS chunks of the case, each repeating its work
+# for at least MIN_CHUNK_SECONDS, with as long chunks of the reference workload.
+CHUNKS = 4
+MIN_CHUNK_SECONDS = 0.05
+# Peak-heap growth below this is noise for the small cases, whatever the ratio.
+MEMORY_SLACK_MB = 1.0
+STAT_FILES = ('MEGA_passing.csv', 'MEGA_rushing.csv', 'MEGA_receiving.csv',
+              'MEGA_defense.csv', 'MEGA_punting.csv', 'MEGA_kicking.csv')
+SYNTHETIC_SEASONS = 12
+
+
+@dc.dataclass
+class Case:
+    """One benchmark: ``setup()`` returns a callable that does the work once
+    and returns how many ``unit`` it processed."""
+    name: str
+    unit: str
+    setup: Callable[[], Callable[[], int]]
+    teardown: Optional[Callable[[], None]] = None
+
+
+# --- Playoff simulation ------------------------------------------------------
+
+def _season(reopen_from_week=None):
+    """Current-season inputs, optionally with every game from ``reopen_from_week`` unplayed."""
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        teams_info, games, _ = load_data()
+        rankings = load_rankings_data()
+    finally:
+        os.chdir(cwd)
+    if reopen_from_week is not None:
+        games = [dict(g, completed=g['completed'] and g['week'] < reopen_from_week) for g in games]
+    stats = calculate_team_stats(teams_info, games)
+    return teams_info, stats, games, rankings
+
+
+def simulate_case(sims, reopen_from_week=None):
+    def setup():
+        teams_info, stats, games, rankings = _season(reopen_from_week)
+        model = GameModel(teams_info, stats, rankings, games)
+
+        def run():
+            random.seed(0)
+            for _ in range(sims):
+                simulate_remaining_games(teams_info, stats, None, games, rankings, game_model=model)
+            return sims
+        return run
+    return setup
+
+
+def seeding_case(sims, reopen_from_week=None):
+    def setup():
+        teams_info, stats, games, rankings = _season(reopen_from_week)
+        model = GameModel(teams_info, stats, rankings, games)
+        state = LeagueState(teams_info, stats)
+        random.seed(0)
+        seasons = [simulate_remaining_games(teams_info, stats, None, games, rankings, game_model=model)
+                   for _ in range(sims)]
+
+        def run():
+            for simulated in seasons:
+                determine_playoff_teams(teams_info, stats, simulated, state=state)
+            return sims
+        return run
+    return setup
+
+
+# --- Player/team stints ------------------------------------------------------
+
+class StintsCase:
+    """``build_player_team_stints`` over a scratch copy of the exports whose
+    stat rows are repeated ``scale`` times under fresh roster ids."""
+
+    def __init__(self, scale=1):
+        self.scale = scale
+        self.tmp = None
+
+    def setup(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix='mega_bench_'))
+        shutil.copy(ROOT / 'MEGA_teams.csv', self.tmp / 'MEGA_teams.csv')
+        rows = 0
+        for name in STAT_FILES:
+            rows += _scale_csv(ROOT / name, self.tmp / name, self.scale)
+        saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = str(self.tmp / 'cache')
+        self._restore = lambda: setattr(league_data, 'CACHE_DIR', saved_cache_dir)
+        for kind in stat_store.KINDS:
+            stat_store.refresh(kind, str(self.tmp))
+
+        def run():
+            # Start from the partitioned exports, as a pipeline run with a warm
+            # store does, rather than from tables already held in memory.
+            league_data.clear()
+            stat_store.clear()
+            build_player_team_stints(self.tmp)
+            return rows
+        return run
+
+    def teardown(self):
+        self._restore()
+        league_data.clear()
+        stat_store.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+class TeamStatsCase(StintsCase):
+    """``aggregate_team_stats`` over the stints built from the scaled exports."""
+
+    def setup(self):
+        super().setup()
+        build_player_team_stints(self.tmp)
+        with open(self.tmp / 'output' / 'player_team_stints.csv', newline='', encoding='utf-8') as f:
+            rows = sum(1 for _ in f) - 1
+
+        def run():
+            league_data.clear()
+            stat_store.clear()
+            aggregate_team_stats(self.tmp)
+            return rows
+        return run
+
+
+def _scale_csv(src, dst, scale):
+    with open(src, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames
+        rows = list(reader)
+    with open(dst, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for copy in range(scale):
+            for row in rows:
+                if copy:
+                    row = dict(row, player__rosterId=f"{row['player__rosterId']}{copy:02d}")
+                writer.writerow(row)
+    return len(rows) * scale
+
+
+# --- Ranked strength of schedule --------------------------------------------
+
+class SeasonsCase:
+    """``calc_sos_by_rankings.run_season`` for every season of a league: the
+    checked-in exports, or a synthetic league of ``seasons`` seasons written
+    by ``scripts/fixtures/generate_synthetic_league.py``."""
+
+    def __init__(self, seasons=None):
+        self.seasons = seasons
+        self.tmp = None
+
+    def setup(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix='mega_bench_'))
+        if self.seasons is None:
+            league = ROOT
+        else:
+            league = self.tmp / 'league'
+            src = generate_synthetic_league.Source(str(ROOT))
+            generate_synthetic_league.generate_league(src, str(league), 'SYN1', self.seasons, players=800,
+                                                      current_week=src.current_week, seed=0)
+        saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = str(self.tmp / 'cache')
+        self._restore = lambda: setattr(league_data, 'CACHE_DIR', saved_cache_dir)
+        paths = [str(league / name) for name in ('MEGA_rankings.csv', 'MEGA_games.csv', 'MEGA_teams.csv')]
+        index = league_data.index_rows(paths[1], *league_data.GAME_KEYS)
+        seasons = [si for si in index.values() if 1 in index.values(si)]
+        games = sum(len(index.positions(si, 1)) for si in seasons)
+
+        def run():
+            league_data.clear()
+            for si in seasons:
+                run_season(si, *paths, str(self.tmp / f'season{si + 1}.csv'))
+            return games
+        return run
+
+    def teardown(self):
+        self._restore()
+        league_data.clear()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+# --- Roster power rankings ---------------------------------------------------
+
+def team_metrics_case(scale=1):
+    def setup():
+        team_index = build_team_index(read_teams(str(ROOT / 'MEGA_teams.csv')))
+        players = [normalize_player_row(r, team_index) for r in read_players(str(ROOT / 'MEGA_players.csv'))]
+        pool = [dict(p, player_id=f"{p.get('player_id', '')}-{copy}") if copy else p
+                for copy in range(scale) for p in players]
+
+        def run():
+            build_team_metrics(pool, team_index)
+            return len(pool)
+        return run
+    return setup
+
+
+def _stints(scale, kind=StintsCase, name='build_player_team_stints'):
+    case = kind(scale)
+    label = name + (f'[{scale}x rows]' if scale > 1 else '')
+    return Case(label, 'rows', case.setup, case.teardown)
+
+
+def _seasons(seasons=None):
+    case = SeasonsCase(seasons)
+    label = 'ranked_sos_all_seasons' + (f'[{seasons} seasons]' if seasons else '')
+    return Case(label, 'games', case.setup, case.teardown)
+
+
+def reference_case():
+    """Fixed pure-Python work shaped like the cases (row dicts built from
+    strings, grouped, summed and sorted) whose rate stands in for the speed
+    of the machine during the run. The rows are rebuilt on every call so the
+    rate does not depend on where one long-lived list happened to land in
+    memory."""
+    def run():
+        rows = [{'team': f'T{i % 32}', 'player': str(i), 'yds': f'{(i * 37) % 500}.5'} for i in range(5000)]
+        totals = {}
+        for row in rows:
+            team = row['team']
+            totals[team] = totals.get(team, 0.0) + float(row['yds'])
+        ranked = sorted(rows, key=lambda row: (row['team'], -float(row['yds'])))
+        return len(ranked)
+    return run
+
+
+REFERENCE = Case('reference', 'items', reference_case)
+
+CASES = [
+    Case('simulate_remaining_games', 'sims', simulate_case(2000)),
+    Case('simulate_remaining_games[from week 8]', 'sims', simulate_case(500, reopen_from_week=8)),
+    Case('determine_playoff_teams', 'seedings', seeding_case(1000)),
+    Case('determine_playoff_teams[from week 8]', 'seedings', seeding_case(1000, reopen_from_week=8)),
+    _stints(1),
+    _stints(10),
+    _stints(1, TeamStatsCase, 'aggregate_team_stats'),
+    _stints(10, TeamStatsCase, 'aggregate_team_stats'),
+    Case('build_team_metrics', 'players', team_metrics_case()),
+    Case('build_team_metrics[10x players]', 'players', team_metrics_case(10)),
+    _seasons(),
+    _seasons(SYNTHETIC_SEASONS),
+]
+
+
+# --- Runner ------------------------------------------------------------------
+
+def _call_seconds(run) -> float:
+    """Wall time of one call of ``run``."""
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def _loops(seconds: float, call_seconds: float) -> int:
+    """Calls that make a chunk last about ``seconds``."""
+    return max(1, math.ceil(seconds / call_seconds)) if call_seconds else 1
+
+
+def _timed(run, loops):
+    """(units, seconds) of ``loops`` back-to-back calls of ``run``."""
+    start = time.perf_counter()
+    units = sum(run() for _ in range(loops))
+    return units, time.perf_counter() - start
+
+
+def _sample(run, loops, ref_run, ref_loops):
+    """(case rate, reference rate) of one sample: ``CHUNKS`` alternating
+    chunks of the reference workload and the case, of about the same length,
+    so both rates see the machine in the same state."""
+    units = ref_units = 0
+    seconds = ref_seconds = 0.0
+    # Start with an empty young generation, so garbage left by the previous
+    # sample is not collected on this one's time.
+    gc.collect()
+    for _ in range(CHUNKS):
+        chunk_units, chunk_seconds = _timed(ref_run, ref_loops)
+        ref_units += chunk_units
+        ref_seconds += chunk_seconds
+        chunk_units, chunk_seconds = _timed(run, loops)
+        units += chunk_units
+        seconds += chunk_seconds
+    return units / seconds, ref_units / ref_seconds
+
+
+def measure(case: Case, repeat: int, reference) -> Dict[str, float]:
+    """Median rate over ``repeat`` samples, and its median ratio to the
+    reference workload sampled alongside, plus the peak traced heap of one
+    extra run."""
+    quiet = io.StringIO()
+    with contextlib.redirect_stdout(quiet), contextlib.redirect_stderr(quiet):
+        run = case.setup()
+        try:
+            ref_run, ref_call_seconds = reference
+            call_seconds = _call_seconds(run)
+            loops = _loops(MIN_CHUNK_SECONDS, call_seconds)
+            ref_loops = _loops(loops * call_seconds, ref_call_seconds)
+            rates, ratios = [], []
+            for _ in range(repeat):
+                rate, ref_rate = _sample(run, loops, ref_run, ref_loops)
+                rates.append(rate)
+                ratios.append(rate / ref_rate)
+            tracemalloc.start()
+            try:
+                units = run()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        finally:
+            if case.teardown:
+                case.teardown()
+    rate = statistics.median(rates)
+    return {
+        'unit': case.unit,
+        'units': units,
+        'seconds': round(units / rate, 6),
+        'rate': round(rate, 1),
+        'relative': round(statistics.median(ratios), 6),
+        'peak_mb': round(peak / (1024 * 1024), 2),
+    }
+
+
+def _rate(result):
+    return f"{result['rate']:,.1f} {result['unit']}/s"
+
+
+def compare(results, baseline, tolerance):
+    """Print the results table and return the names of cases that regressed.
+
+    Speed is judged on ``relative`` (rate over the reference rate of the same
+    run), so a baseline recorded on another machine, or under other load,
+    still compares like for like.
+    """
+    regressions = []
+    print(f"{'case':<40} {'rate':>22} {'peak':>9} {'x ref':>9} {'baseline':>9} {'change':>7}")
+    for name, r in results.items():
+        base = baseline.get(name)
+        line = f"{name:<40} {_rate(r):>22} {r['peak_mb']:>6.2f} MB {r['relative']:>9.4g}"
+        if not base or not base.get('relative'):
+            print(f"{line} {'(none)':>9}")
+            continue
+        change = r['relative'] / base['relative'] - 1
+        flags = []
+        if change < -tolerance:
+            flags.append('SLOWER')
+        if r['peak_mb'] > max(base['peak_mb'] * (1 + tolerance), base['peak_mb'] + MEMORY_SLACK_MB):
+            flags.append('MORE MEMORY')
+        print(f"{line} {base['relative']:>9.4g} {change:>+7.0%}  {' '.join(flags)}")
+        if flags:
+            regressions.append(name)
+    return regressions
+
+
+def load_baseline(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('cases', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def write_baseline(path, results):
+    data = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cases': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the simulation, stints and power-ranking hot paths.')
+    parser.add_argument('--only', action='append', default=[],
+                        help='Run only cases whose name contains this text (repeatable)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Timed samples per case; the median counts (default {DEFAULT_REPEAT})')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'Allowed fractional drop in speed relative to the reference workload, '
+                             f'or growth in memory (default {DEFAULT_TOLERANCE})')
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help='Baseline JSON to compare against')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Write these results to the baseline instead of comparing')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.only or any(s in c.name for s in args.only)]
+    if not cases:
+        print(f"No benchmark matches {args.only}", file=sys.stderr)
+        return 2
+
+    ref_run = REFERENCE.setup()
+    ref_run()  # warm up before timing a call
+    reference = (ref_run, _call_seconds(ref_run))
+    results = {}
+    for case in cases:
+        print(f"Running {case.name}...", file=sys.stderr)
+        results[case.name] = measure(case, max(1, args.repeat), reference)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        merged = dict(load_baseline(args.baseline))
+        merged.update(results)
+        write_baseline(args.baseline, merged)
+        compare(results, {}, args.tolerance)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+    if regressions:
+        print(f"\n✗ {len(regressions)} case(s) regressed by more than {args.tolerance:.0%}: "
+              + ', '.join(regressions))
+        return 1
+    print(f"\n✓ No case regressed by more than {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
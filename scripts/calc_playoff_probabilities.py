@@ -1,12 +1,42 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import hashlib
 import itertools
 from collections import defaultdict
 import json
+import math
+import os
 import random
 
+from league_data import GAME_KEYS, index_rows, read_rows, season_indexes
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the batched engine needs it
+    np = None
+
 DEFAULT_NUM_SIMULATIONS = 10000
+NUMPY_BATCH_SIZE = 2000
+ENGINES = ('python', 'numpy')
+ADAPTIVE_BATCH_SIZE = 1000  # simulations between confidence-interval checks
+WILSON_Z = 1.96  # 95% confidence
+EXACT_MAX_OUTCOMES = 200000  # above this many evaluations exact mode falls back to Monte Carlo
+MODEL_CACHE_DIR = os.path.join('output', 'cache')
+MODEL_CACHE_VERSION = 1
+CERTAINTY_NODE_LIMIT = 500  # search nodes per clinch/elimination question before giving up
+LEAF_EXPANSION_LIMIT = 81  # most re-seedings of one ending whose SoV/SoS depend on other games
+PLAYOFF_SEEDS = 7
+RANKED_SOS_CSV = 'output/ranked_sos_by_conference.csv'
+PLAYOFF_JSON = 'output/playoff_probabilities.json'
+# Postseason rounds a team can reach, with the playoff_probabilities.json field for each
+BRACKET_FIELDS = {
+    'divisional': 'divisional_round_probability',
+    'conference': 'conference_championship_probability',
+    'superbowl': 'superbowl_appearance_probability',
+    'champion': 'superbowl_win_probability',
+}
+BRACKET_ROUNDS = tuple(BRACKET_FIELDS)
 TIE_PROBABILITY = 0.003  # ~0.3% of NFL games end in ties
 
 HOME_FIELD_ADVANTAGE = 0.02
@@ -23,33 +53,27 @@ DEFAULT_ELO = 1200.0
 def load_elo_data():
     """Load team ELO ratings from MEGA_elo.csv."""
     elo_map = {}
-    with open('MEGA_elo.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row.get('Team', '').strip()
-            elo_str = row.get('Week 14+', '')
-            if team and elo_str:
-                try:
-                    elo_map[team] = float(elo_str)
-                except ValueError:
-                    continue
+    for row in read_rows('MEGA_elo.csv'):
+        team = row.get('Team', '').strip()
+        elo_str = row.get('Week 14+', '')
+        if team and elo_str:
+            try:
+                elo_map[team] = float(elo_str)
+            except ValueError:
+                continue
     return elo_map
 
 
 def load_rankings_data(season_index=3):
     rankings = {}
     max_week = {}
-    with open('MEGA_rankings.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if int(row.get('seasonIndex', 0)) != season_index:
-                continue
-            team = row['team'].strip()
-            week = int(row.get('weekIndex', 0))
-            rank = int(row.get('rank', 16))
-            if team not in max_week or week > max_week[team]:
-                max_week[team] = week
-                rankings[team] = rank
+    for row in index_rows('MEGA_rankings.csv', *GAME_KEYS).select(season_index):
+        team = row['team'].strip()
+        week = int(row.get('weekIndex', 0))
+        rank = int(row.get('rank', 16))
+        if team not in max_week or week > max_week[team]:
+            max_week[team] = week
+            rankings[team] = rank
     return rankings
 
 
@@ -80,45 +104,43 @@ def is_divisional_game(home, away, teams_info):
     return home_div == away_div and home_div != ''
 
 
-def load_data(season_index=3):
+def season_paths(season_index):
+    """(ranked SoS CSV, probabilities JSON) of one season in a --seasons run (N = seasonIndex + 1)."""
+    number = season_index + 1
+    return (f'output/ranked_sos_by_conference_season{number}.csv',
+            f'output/playoff_probabilities_season{number}.json')
+
+def load_data(season_index=3, sos_csv=RANKED_SOS_CSV):
     teams_info = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            streak_val = row.get('winLossStreak', '0')
-            try:
-                streak = int(streak_val)
-                if streak > 127:
-                    streak = streak - 256
-            except (ValueError, TypeError):
-                streak = 0
-            teams_info[team] = {
-                'division': row.get('divisionName', '').strip(),
-                'conference': row.get('conferenceName', '').strip(),
-                'win_streak': streak
-            }
+    for row in read_rows('MEGA_teams.csv'):
+        team = row['displayName'].strip()
+        streak_val = row.get('winLossStreak', '0')
+        try:
+            streak = int(streak_val)
+            if streak > 127:
+                streak = streak - 256
+        except (ValueError, TypeError):
+            streak = 0
+        teams_info[team] = {
+            'division': row.get('divisionName', '').strip(),
+            'conference': row.get('conferenceName', '').strip(),
+            'win_streak': streak
+        }
     
     games = []
-    with open('MEGA_games.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if int(row.get('seasonIndex', 0)) != season_index:
-                continue
-            if int(row.get('stageIndex', 0)) != 1:
-                continue
-            status = int(row['status']) if row['status'] else 1
-            games.append({
-                'home': row['homeTeam'].strip(),
-                'away': row['awayTeam'].strip(),
-                'home_score': int(row['homeScore']) if row['homeScore'] else 0,
-                'away_score': int(row['awayScore']) if row['awayScore'] else 0,
-                'week': int(row['weekIndex']) if row['weekIndex'] else 0,
-                'status': status,
-                'completed': status in [2, 3, 4]
-            })
+    for row in index_rows('MEGA_games.csv', *GAME_KEYS).select(season_index, 1):
+        status = int(row['status']) if row['status'] else 1
+        games.append({
+            'home': row['homeTeam'].strip(),
+            'away': row['awayTeam'].strip(),
+            'home_score': int(row['homeScore']) if row['homeScore'] else 0,
+            'away_score': int(row['awayScore']) if row['awayScore'] else 0,
+            'week': int(row['weekIndex']) if row['weekIndex'] else 0,
+            'status': status,
+            'completed': status in [2, 3, 4]
+        })
     
-    with open('output/ranked_sos_by_conference.csv', 'r', encoding='utf-8') as f:
+    with open(sos_csv, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         sos_data = {row['team']: row for row in reader}
     
@@ -134,7 +156,7 @@ def load_data(season_index=3):
     
     return teams_info, games, sos_data
 
-def calculate_team_stats(teams_info, games):
+def _new_team_stats(teams_info):
     stats = {}
     
     for team in teams_info:
@@ -148,79 +170,79 @@ def calculate_team_stats(teams_info, games):
             'opponents': [],
             'defeated_opponents': []
         }
+    return stats
+
+def _add_completed_game(stats, teams_info, game):
+    home = game['home']
+    away = game['away']
+    home_score = game['home_score']
+    away_score = game['away_score']
     
-    for game in games:
-        if not game['completed']:
-            continue
-        
-        home = game['home']
-        away = game['away']
-        home_score = game['home_score']
-        away_score = game['away_score']
-        
-        if home not in stats or away not in stats:
-            continue
-        
-        stats[home]['opponents'].append(away)
-        stats[away]['opponents'].append(home)
-        
-        stats[home]['points_for'] += home_score
-        stats[home]['points_against'] += away_score
-        stats[away]['points_for'] += away_score
-        stats[away]['points_against'] += home_score
-        
-        home_conf = teams_info[home]['conference']
-        away_conf = teams_info[away]['conference']
-        home_div = teams_info[home]['division']
-        away_div = teams_info[away]['division']
-        
-        if home_score > away_score:
-            stats[home]['W'] += 1
-            stats[away]['L'] += 1
-            stats[home]['defeated_opponents'].append(away)
-            stats[home]['head_to_head'][away]['W'] += 1
-            stats[away]['head_to_head'][home]['L'] += 1
+    if home not in stats or away not in stats:
+        return
+    
+    stats[home]['opponents'].append(away)
+    stats[away]['opponents'].append(home)
+    
+    stats[home]['points_for'] += home_score
+    stats[home]['points_against'] += away_score
+    stats[away]['points_for'] += away_score
+    stats[away]['points_against'] += home_score
+    
+    home_conf = teams_info[home]['conference']
+    away_conf = teams_info[away]['conference']
+    home_div = teams_info[home]['division']
+    away_div = teams_info[away]['division']
+    
+    if home_score > away_score:
+        stats[home]['W'] += 1
+        stats[away]['L'] += 1
+        stats[home]['defeated_opponents'].append(away)
+        stats[home]['head_to_head'][away]['W'] += 1
+        stats[away]['head_to_head'][home]['L'] += 1
+        
+        if home_conf == away_conf:
+            stats[home]['conference_W'] += 1
+            stats[away]['conference_L'] += 1
+            stats[home]['conference_points_for'] += home_score
+            stats[home]['conference_points_against'] += away_score
+            stats[away]['conference_points_for'] += away_score
+            stats[away]['conference_points_against'] += home_score
             
-            if home_conf == away_conf:
-                stats[home]['conference_W'] += 1
-                stats[away]['conference_L'] += 1
-                stats[home]['conference_points_for'] += home_score
-                stats[home]['conference_points_against'] += away_score
-                stats[away]['conference_points_for'] += away_score
-                stats[away]['conference_points_against'] += home_score
-                
-            if home_div == away_div:
-                stats[home]['division_W'] += 1
-                stats[away]['division_L'] += 1
-                
-        elif away_score > home_score:
-            stats[away]['W'] += 1
-            stats[home]['L'] += 1
-            stats[away]['defeated_opponents'].append(home)
-            stats[away]['head_to_head'][home]['W'] += 1
-            stats[home]['head_to_head'][away]['L'] += 1
+        if home_div == away_div:
+            stats[home]['division_W'] += 1
+            stats[away]['division_L'] += 1
             
-            if home_conf == away_conf:
-                stats[away]['conference_W'] += 1
-                stats[home]['conference_L'] += 1
-                stats[home]['conference_points_for'] += home_score
-                stats[home]['conference_points_against'] += away_score
-                stats[away]['conference_points_for'] += away_score
-                stats[away]['conference_points_against'] += home_score
-                
-            if home_div == away_div:
-                stats[away]['division_W'] += 1
-                stats[home]['division_L'] += 1
-        else:
-            stats[home]['T'] += 1
-            stats[away]['T'] += 1
-            stats[home]['head_to_head'][away]['T'] += 1
-            stats[away]['head_to_head'][home]['T'] += 1
+    elif away_score > home_score:
+        stats[away]['W'] += 1
+        stats[home]['L'] += 1
+        stats[away]['defeated_opponents'].append(home)
+        stats[away]['head_to_head'][home]['W'] += 1
+        stats[home]['head_to_head'][away]['L'] += 1
+        
+        if home_conf == away_conf:
+            stats[away]['conference_W'] += 1
+            stats[home]['conference_L'] += 1
+            stats[home]['conference_points_for'] += home_score
+            stats[home]['conference_points_against'] += away_score
+            stats[away]['conference_points_for'] += away_score
+            stats[away]['conference_points_against'] += home_score
             
-            if home_conf == away_conf:
-                stats[home]['conference_T'] += 1
-                stats[away]['conference_T'] += 1
-    
+        if home_div == away_div:
+            stats[away]['division_W'] += 1
+            stats[home]['division_L'] += 1
+    else:
+        stats[home]['T'] += 1
+        stats[away]['T'] += 1
+        stats[home]['head_to_head'][away]['T'] += 1
+        stats[away]['head_to_head'][home]['T'] += 1
+        
+        if home_conf == away_conf:
+            stats[home]['conference_T'] += 1
+            stats[away]['conference_T'] += 1
+
+def _finish_team_stats(stats):
+    """Fill in the percentages, SoV and SoS from the accumulated counts."""
     for team in stats:
         total = stats[team]['W'] + stats[team]['L'] + stats[team]['T']
         stats[team]['win_pct'] = (stats[team]['W'] + 0.5 * stats[team]['T']) / total if total > 0 else 0
@@ -247,14 +269,165 @@ def calculate_team_stats(teams_info, games):
     
     return stats
 
-def compare_head_to_head(teams, stats):
+def calculate_team_stats(teams_info, games):
+    stats = _new_team_stats(teams_info)
+    for game in games:
+        if game['completed']:
+            _add_completed_game(stats, teams_info, game)
+    return _finish_team_stats(stats)
+
+class LeagueState:
+    """Integer-indexed league table that the tiebreakers work on.
+    
+    Team ``i`` is ``teams[i]``. Records are flat lists: per-team W/L/T
+    vectors plus ``n x n`` matrices (row-major, ``i * n + j``) for
+    head-to-head wins, head-to-head ties and games played between each
+    pair. Build one per run from the completed-game ``stats``, then for each
+    simulation call ``reset()``, ``record_game()`` per simulated game and
+    ``finalize()``. All of these overwrite the same lists in place.
+    SoV and SoS are opponent-weighted sums over a matrix row, computed only
+    for teams that reach those tiebreak steps; ``opponent_pct_teams`` records
+    which teams needed them since the last ``finalize()``, and
+    ``coin_flips`` how many ties fell through to a coin flip. Coin flips
+    draw from ``random`` unless ``flip_script`` is set, in which case they
+    take those picks in turn (0 once it runs out) and log each
+    (pick, candidates) pair in ``flip_log``.
+    """
+    
+    COUNTERS = ('W', 'L', 'T', 'conference_W', 'conference_L', 'conference_T',
+                'division_W', 'division_L', 'division_T')
+    
+    def __init__(self, teams_info, stats):
+        self.teams = [t for t in teams_info if t in stats]
+        self.index = {t: i for i, t in enumerate(self.teams)}
+        self.n = n = len(self.teams)
+        self.conference = [teams_info[t]['conference'] for t in self.teams]
+        self.division = [teams_info[t]['division'] for t in self.teams]
+        
+        self.conf_members = {}
+        self.div_members = {}
+        for i, t in enumerate(self.teams):
+            self.conf_members.setdefault(self.conference[i], []).append(i)
+            self.div_members.setdefault(self.conference[i], {}).setdefault(self.division[i], []).append(i)
+        
+        self.points_for = [stats[t]['points_for'] for t in self.teams]
+        self._base = {key: [stats[t][key] for t in self.teams] for key in self.COUNTERS}
+        self._base_h2h_w = [0] * (n * n)
+        self._base_h2h_t = [0] * (n * n)
+        self._base_games = [0] * (n * n)
+        for i, t in enumerate(self.teams):
+            for opp, rec in stats[t]['head_to_head'].items():
+                j = self.index.get(opp)
+                if j is None:
+                    continue
+                self._base_h2h_w[i * n + j] = rec['W']
+                self._base_h2h_t[i * n + j] = rec['T']
+                self._base_games[i * n + j] = rec['W'] + rec['L'] + rec['T']
+        
+        self.counts = {key: list(values) for key, values in self._base.items()}
+        self.h2h_w = list(self._base_h2h_w)
+        self.h2h_t = list(self._base_h2h_t)
+        self.games = list(self._base_games)
+        self.win_pct = [0.0] * n
+        self.conference_pct = [0.0] * n
+        self.division_pct = [0.0] * n
+        self.flip_script = None
+        self.flip_log = []
+        self._sov = [None] * n
+        self._sos = [None] * n
+        self.finalize()
+    
+    def reset(self):
+        for key, values in self._base.items():
+            self.counts[key][:] = values
+        self.h2h_w[:] = self._base_h2h_w
+        self.h2h_t[:] = self._base_h2h_t
+        self.games[:] = self._base_games
+    
+    def record_game(self, home, away, outcome):
+        """Add one result: outcome 0 = tie, 1 = home win, 2 = away win."""
+        n = self.n
+        c = self.counts
+        same_conf = self.conference[home] == self.conference[away]
+        same_div = self.division[home] == self.division[away]
+        self.games[home * n + away] += 1
+        self.games[away * n + home] += 1
+        if outcome == 0:
+            c['T'][home] += 1
+            c['T'][away] += 1
+            self.h2h_t[home * n + away] += 1
+            self.h2h_t[away * n + home] += 1
+            if same_conf:
+                c['conference_T'][home] += 1
+                c['conference_T'][away] += 1
+            if same_div:
+                c['division_T'][home] += 1
+                c['division_T'][away] += 1
+            return
+        winner, loser = (home, away) if outcome == 1 else (away, home)
+        c['W'][winner] += 1
+        c['L'][loser] += 1
+        self.h2h_w[winner * n + loser] += 1
+        if same_conf:
+            c['conference_W'][winner] += 1
+            c['conference_L'][loser] += 1
+        if same_div:
+            c['division_W'][winner] += 1
+            c['division_L'][loser] += 1
+    
+    def finalize(self):
+        c = self.counts
+        for prefix, out in (('', self.win_pct), ('conference_', self.conference_pct), ('division_', self.division_pct)):
+            wins, losses, ties = c[prefix + 'W'], c[prefix + 'L'], c[prefix + 'T']
+            for i in range(self.n):
+                total = wins[i] + losses[i] + ties[i]
+                out[i] = (wins[i] + 0.5 * ties[i]) / total if total > 0 else 0
+        self._sov[:] = [None] * self.n
+        self._sos[:] = [None] * self.n
+        self.opponent_pct_teams = set()
+        self.coin_flips = 0
+    
+    def _weighted_opponent_pct(self, matrix, i):
+        self.opponent_pct_teams.add(i)
+        n = self.n
+        row = matrix[i * n:(i + 1) * n]
+        count = sum(row)
+        if not count:
+            return 0
+        return sum(k * pct for k, pct in zip(row, self.win_pct) if k) / count
+    
+    def strength_of_victory(self, i):
+        if self._sov[i] is None:
+            self._sov[i] = self._weighted_opponent_pct(self.h2h_w, i)
+        return self._sov[i]
+    
+    def strength_of_schedule(self, i):
+        if self._sos[i] is None:
+            self._sos[i] = self._weighted_opponent_pct(self.games, i)
+        return self._sos[i]
+    
+    def coin_flip(self, teams):
+        self.coin_flips += 1
+        if self.flip_script is None:
+            return random.choice(teams)
+        depth = len(self.flip_log)
+        pick = self.flip_script[depth] if depth < len(self.flip_script) else 0
+        self.flip_log.append((pick, len(teams)))
+        return teams[pick]
+
+def compare_head_to_head(teams, state):
+    n = state.n
+    h2h_w = state.h2h_w
+    h2h_t = state.h2h_t
     if len(teams) == 2:
         t1, t2 = teams
-        h2h = stats[t1]['head_to_head'][t2]
-        total = h2h['W'] + h2h['L'] + h2h['T']
+        w = h2h_w[t1 * n + t2]
+        l = h2h_w[t2 * n + t1]
+        t = h2h_t[t1 * n + t2]
+        total = w + l + t
         if total == 0:
             return None
-        pct = (h2h['W'] + 0.5 * h2h['T']) / total
+        pct = (w + 0.5 * t) / total
         if pct > 0.5:
             return t1
         elif pct < 0.5:
@@ -266,10 +439,9 @@ def compare_head_to_head(teams, stats):
             w, l, t = 0, 0, 0
             for other in teams:
                 if team != other:
-                    h2h = stats[team]['head_to_head'][other]
-                    w += h2h['W']
-                    l += h2h['L']
-                    t += h2h['T']
+                    w += h2h_w[team * n + other]
+                    l += h2h_w[other * n + team]
+                    t += h2h_t[team * n + other]
             total = w + l + t
             h2h_records[team] = (w + 0.5 * t) / total if total > 0 else 0
         
@@ -280,103 +452,238 @@ def compare_head_to_head(teams, stats):
             return winners[0]
         return None
 
-def apply_tiebreakers(teams, stats, teams_info, is_division=False):
+def apply_tiebreakers(teams, state, is_division=False):
     if len(teams) == 1:
         return teams[0]
     
     if len(teams) == 0:
         return None
     
-    winner = compare_head_to_head(teams, stats)
-    if winner:
+    winner = compare_head_to_head(teams, state)
+    if winner is not None:
         return winner
     
     if is_division:
-        div_pcts = {t: stats[t]['division_pct'] for t in teams}
+        div_pcts = {t: state.division_pct[t] for t in teams}
         max_pct = max(div_pcts.values())
         remaining = [t for t in teams if div_pcts[t] == max_pct]
         if len(remaining) == 1:
             return remaining[0]
         teams = remaining
     
-    conf_pcts = {t: stats[t]['conference_pct'] for t in teams}
+    conf_pcts = {t: state.conference_pct[t] for t in teams}
     max_pct = max(conf_pcts.values())
     remaining = [t for t in teams if conf_pcts[t] == max_pct]
     if len(remaining) == 1:
         return remaining[0]
     teams = remaining
     
-    sov_scores = {t: stats[t]['strength_of_victory'] for t in teams}
+    sov_scores = {t: state.strength_of_victory(t) for t in teams}
     max_sov = max(sov_scores.values())
     remaining = [t for t in teams if abs(sov_scores[t] - max_sov) < 0.001]
     if len(remaining) == 1:
         return remaining[0]
     teams = remaining
     
-    sos_scores = {t: stats[t]['strength_of_schedule'] for t in teams}
+    sos_scores = {t: state.strength_of_schedule(t) for t in teams}
     max_sos = max(sos_scores.values())
     remaining = [t for t in teams if abs(sos_scores[t] - max_sos) < 0.001]
     if len(remaining) == 1:
         return remaining[0]
     
-    return random.choice(remaining) if remaining else random.choice(teams)
+    return state.coin_flip(remaining or teams)
 
-def simulate_remaining_games(teams_info, stats, sos_data, games, rankings):
-    remaining_games = [g for g in games if not g['completed']]
+def calculate_team_rating(team, teams_info, stats, rankings):
+    """Composite team strength: 50% ELO + 25% Win% + 15% past SoS + 10% SoV."""
+    info = teams_info.get(team, {})
+    team_stats = stats.get(team, {})
+    elo_norm = max(0, min(1, (info.get('elo', DEFAULT_ELO) - 1000) / 400))
+    sov = calculate_sov_rating(team_stats.get('defeated_opponents', []), rankings)
+    return (
+        elo_norm * ELO_WEIGHT +
+        team_stats.get('win_pct', 0.5) * WIN_PCT_WEIGHT +
+        info.get('past_sos', 0.5) * SOS_WEIGHT +
+        sov * SOV_WEIGHT
+    )
+
+def matchup_home_probability(home_rating, away_rating, home_streak, away_streak, divisional):
+    """Home win probability (ties excluded) from two team ratings."""
+    if home_rating + away_rating > 0:
+        home_prob = home_rating / (home_rating + away_rating)
+    else:
+        home_prob = 0.5
     
-    simulated_games = []
-    for game in remaining_games:
-        home = game['home']
-        away = game['away']
-        
-        if home not in stats or away not in stats:
-            continue
-        
-        home_win_pct = stats[home]['win_pct']
-        away_win_pct = stats[away]['win_pct']
-        home_past_sos = teams_info[home]['past_sos']
-        away_past_sos = teams_info[away]['past_sos']
-        
-        home_elo = teams_info[home].get('elo', DEFAULT_ELO)
-        away_elo = teams_info[away].get('elo', DEFAULT_ELO)
-        home_elo_norm = max(0, min(1, (home_elo - 1000) / 400))
-        away_elo_norm = max(0, min(1, (away_elo - 1000) / 400))
-        
-        home_sov = calculate_sov_rating(stats[home]['defeated_opponents'], rankings)
-        away_sov = calculate_sov_rating(stats[away]['defeated_opponents'], rankings)
-        
-        home_rating = (
-            home_elo_norm * ELO_WEIGHT +
-            home_win_pct * WIN_PCT_WEIGHT +
-            home_past_sos * SOS_WEIGHT +
-            home_sov * SOV_WEIGHT
-        )
-        away_rating = (
-            away_elo_norm * ELO_WEIGHT +
-            away_win_pct * WIN_PCT_WEIGHT +
-            away_past_sos * SOS_WEIGHT +
-            away_sov * SOV_WEIGHT
+    home_prob += HOME_FIELD_ADVANTAGE
+    home_prob += get_streak_modifier(home_streak)
+    home_prob -= get_streak_modifier(away_streak)
+    
+    if divisional:
+        home_prob = home_prob + (0.5 - home_prob) * DIVISIONAL_REGRESSION
+    
+    return max(0.25, min(0.75, home_prob))
+
+def calculate_home_win_probability(home, away, teams_info, stats, rankings):
+    """Probability that the home team wins, given the game is not a tie."""
+    return matchup_home_probability(
+        calculate_team_rating(home, teams_info, stats, rankings),
+        calculate_team_rating(away, teams_info, stats, rankings),
+        teams_info[home].get('win_streak', 0),
+        teams_info[away].get('win_streak', 0),
+        is_divisional_game(home, away, teams_info),
+    )
+
+class GameModel:
+    """Win probabilities compiled once from the pre-simulation stats.
+    
+    Team ratings only depend on stats before any game is simulated, so they
+    are computed once per run. ``remaining`` holds one entry per unplayed
+    game with the thresholds the simulators compare a uniform draw against:
+    below ``tie_threshold`` is a tie, below ``home_threshold`` a home win,
+    anything else an away win.
+    
+    ``ratings`` and ``home_probs`` (keyed by ``game_key``) let a cached
+    compile be reused; missing entries are computed.
+    """
+    
+    def __init__(self, teams_info, stats, rankings, games=(), ratings=None, home_probs=None):
+        self.teams_info = teams_info
+        if ratings is None:
+            ratings = {
+                team: calculate_team_rating(team, teams_info, stats, rankings)
+                for team in teams_info
+            }
+        self.ratings = ratings
+        home_probs = home_probs or {}
+        self.remaining = []
+        for game in games:
+            home, away = game['home'], game['away']
+            if game['completed'] or home not in stats or away not in stats:
+                continue
+            home_prob = home_probs.get(game_key(game))
+            if home_prob is None:
+                home_prob = self.home_win_probability(home, away)
+            self.remaining.append({
+                'game': game,
+                'home': home,
+                'away': away,
+                'home_prob': home_prob,
+                'tie_threshold': TIE_PROBABILITY,
+                'home_threshold': TIE_PROBABILITY + home_prob * (1 - TIE_PROBABILITY),
+            })
+    
+    def home_win_probability(self, home, away):
+        return matchup_home_probability(
+            self.ratings[home],
+            self.ratings[away],
+            self.teams_info[home].get('win_streak', 0),
+            self.teams_info[away].get('win_streak', 0),
+            is_divisional_game(home, away, self.teams_info),
         )
-        
-        if home_rating + away_rating > 0:
-            home_prob = home_rating / (home_rating + away_rating)
-        else:
-            home_prob = 0.5
-        
-        home_prob += HOME_FIELD_ADVANTAGE
-        
-        home_streak = teams_info[home].get('win_streak', 0)
-        away_streak = teams_info[away].get('win_streak', 0)
-        home_prob += get_streak_modifier(home_streak)
-        home_prob -= get_streak_modifier(away_streak)
-        
-        if is_divisional_game(home, away, teams_info):
-            home_prob = home_prob + (0.5 - home_prob) * DIVISIONAL_REGRESSION
-        
-        home_prob = max(0.25, min(0.75, home_prob))
+    
+    def bracket_probabilities(self, teams):
+        """Playoff home win probabilities between every pair of ``teams``, as a
+        flat list indexed ``home * len(teams) + away``. Playoff games cannot tie."""
+        return [
+            self.home_win_probability(home, away) if home != away else 0.5
+            for home in teams for away in teams
+        ]
+
+def game_key(game):
+    return f"{game['week']}:{game['away']}@{game['home']}"
+
+def _content_hash(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _stats_to_json(stats):
+    return {team: dict(team_stats, head_to_head=dict(team_stats['head_to_head'])) for team, team_stats in stats.items()}
+
+def _stats_from_json(data):
+    stats = {}
+    for team, team_stats in data.items():
+        head_to_head = defaultdict(lambda: {'W': 0, 'L': 0, 'T': 0})
+        head_to_head.update(team_stats['head_to_head'])
+        stats[team] = dict(team_stats, head_to_head=head_to_head)
+    return stats
+
+def load_season_model(teams_info, games, rankings, season_index=3, cache_dir=MODEL_CACHE_DIR):
+    """Return (stats, game_model), reusing the compile saved by the last run.
+    
+    The cache is keyed by a content hash of the season's game rows, with the
+    team table and rankings hashed alongside. An unchanged season reuses the
+    cached stats, ratings and per-game probability table as they are. If
+    the only change is newly completed games, those are added to the cached
+    counts as deltas and only the ratings and probabilities are recompiled.
+    Anything else rebuilds from scratch.
+    """
+    path = os.path.join(cache_dir, f'playoff_model_season{season_index}.json')
+    inputs_hash = _content_hash([teams_info, rankings])
+    games_hash = _content_hash(games)
+    
+    cached = None
+    if os.path.exists(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+    if cached and (cached.get('version') != MODEL_CACHE_VERSION or cached.get('inputs_hash') != inputs_hash):
+        cached = None
+    
+    if cached and cached['games_hash'] == games_hash:
+        print(f"Model cache: season {season_index} unchanged, reusing compiled stats and probabilities")
+        stats = _stats_from_json(cached['counts'])
+        _finish_team_stats(stats)
+        return stats, GameModel(teams_info, stats, rankings, games,
+                                ratings=cached['ratings'], home_probs=cached['home_probs'])
+    
+    new_games = None
+    if cached:
+        current = {game_key(g): [g['home_score'], g['away_score']] for g in games if g['completed']}
+        previous = cached['completed']
+        if all(current.get(key) == score for key, score in previous.items()):
+            new_games = [g for g in games if g['completed'] and game_key(g) not in previous]
+    
+    if new_games is not None:
+        print(f"Model cache: applying {len(new_games)} newly completed games to the cached season {season_index} counts")
+        stats = _stats_from_json(cached['counts'])
+        for game in new_games:
+            _add_completed_game(stats, teams_info, game)
+    else:
+        print(f"Model cache: compiling season {season_index} from scratch")
+        stats = _new_team_stats(teams_info)
+        for game in games:
+            if game['completed']:
+                _add_completed_game(stats, teams_info, game)
+    
+    # Save the raw counts before the derived fields are filled in
+    counts = _stats_to_json(stats)
+    _finish_team_stats(stats)
+    game_model = GameModel(teams_info, stats, rankings, games)
+    
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': MODEL_CACHE_VERSION,
+            'inputs_hash': inputs_hash,
+            'games_hash': games_hash,
+            'completed': {game_key(g): [g['home_score'], g['away_score']] for g in games if g['completed']},
+            'counts': counts,
+            'ratings': game_model.ratings,
+            'home_probs': {game_key(e['game']): e['home_prob'] for e in game_model.remaining},
+        }, f)
+    return stats, game_model
+
+def simulate_remaining_games(teams_info, stats, sos_data, games, rankings, game_model=None):
+    if game_model is None:
+        game_model = GameModel(teams_info, stats, rankings, games)
+    
+    simulated_games = []
+    for entry in game_model.remaining:
+        home = entry['home']
+        away = entry['away']
         
         rand_val = random.random()
-        if rand_val < TIE_PROBABILITY:
+        if rand_val < entry['tie_threshold']:
             tie_score = random.randint(10, 27)
             simulated_games.append({
                 'home': home,
@@ -385,7 +692,7 @@ def simulate_remaining_games(teams_info, stats, sos_data, games, rankings):
                 'home_score': tie_score,
                 'away_score': tie_score
             })
-        elif rand_val < TIE_PROBABILITY + home_prob * (1 - TIE_PROBABILITY):
+        elif rand_val < entry['home_threshold']:
             winner = home
             loser = away
             winner_score = random.randint(17, 35)
@@ -416,16 +723,34 @@ def simulate_remaining_games(teams_info, stats, sos_data, games, rankings):
     
     return simulated_games
 
-def rank_teams_with_tiebreakers(teams, sim_stats, teams_info, is_division=False):
-    from collections import defaultdict
+def draw_outcome_codes(game_model):
+    """One simulated result per ``game_model.remaining`` entry, as the outcome
+    codes ``LeagueState.record_game`` takes (0 tie, 1 home win, 2 away win)."""
+    codes = []
+    for entry in game_model.remaining:
+        rand_val = random.random()
+        if rand_val < entry['tie_threshold']:
+            codes.append(0)
+        elif rand_val < entry['home_threshold']:
+            codes.append(1)
+        else:
+            codes.append(2)
+    return codes
+
+def rank_teams_with_tiebreakers(teams, state, is_division=False, limit=None):
+    """Order team indices by win% and resolve ties with NFL tiebreakers.
     
+    With ``limit``, stop once that many places are settled; the order
+    of the remaining teams is not worked out.
+    """
     win_pct_groups = defaultdict(list)
     for team in teams:
-        win_pct = sim_stats[team]['win_pct']
-        win_pct_groups[win_pct].append(team)
+        win_pct_groups[state.win_pct[team]].append(team)
     
     ranked_teams = []
     for win_pct in sorted(win_pct_groups.keys(), reverse=True):
+        if limit is not None and len(ranked_teams) >= limit:
+            break
         tied_teams = win_pct_groups[win_pct]
         
         if len(tied_teams) == 1:
@@ -438,15 +763,17 @@ def rank_teams_with_tiebreakers(teams, sim_stats, teams_info, is_division=False)
                 if len(remaining) == 1:
                     resolved.append(remaining[0])
                     break
+                if limit is not None and len(ranked_teams) + len(resolved) >= limit:
+                    break
                 
-                winner = apply_tiebreakers(remaining, sim_stats, teams_info, is_division)
-                if winner and winner in remaining:
+                winner = apply_tiebreakers(remaining, state, is_division)
+                if winner is not None and winner in remaining:
                     resolved.append(winner)
                     remaining.remove(winner)
                 else:
                     resolved.extend(sorted(remaining, key=lambda t: (
-                        -sim_stats[t]['conference_pct'],
-                        -sim_stats[t]['points_for']
+                        -state.conference_pct[t],
+                        -state.points_for[t]
                     )))
                     break
             
@@ -454,268 +781,916 @@ def rank_teams_with_tiebreakers(teams, sim_stats, teams_info, is_division=False)
     
     return ranked_teams
 
-def determine_playoff_teams(teams_info, stats, simulated_games):
-    sim_stats = {}
-    for team in stats:
-        sim_stats[team] = {
-            'W': stats[team]['W'],
-            'L': stats[team]['L'],
-            'T': stats[team]['T'],
-            'conference_W': stats[team]['conference_W'],
-            'conference_L': stats[team]['conference_L'],
-            'conference_T': stats[team]['conference_T'],
-            'division_W': stats[team]['division_W'],
-            'division_L': stats[team]['division_L'],
-            'division_T': stats[team]['division_T'],
-            'head_to_head': defaultdict(lambda: {'W': 0, 'L': 0, 'T': 0}),
-            'points_for': stats[team]['points_for'],
-            'points_against': stats[team]['points_against'],
-            'conference_points_for': stats[team]['conference_points_for'],
-            'conference_points_against': stats[team]['conference_points_against'],
-            'defeated_opponents': list(stats[team]['defeated_opponents']),
-            'opponents': list(stats[team]['opponents'])
-        }
-        for opp in stats[team]['head_to_head']:
-            sim_stats[team]['head_to_head'][opp] = dict(stats[team]['head_to_head'][opp])
+def determine_playoff_teams(teams_info, stats, simulated_games, state=None):
+    """Seed both conferences after applying ``simulated_games`` to ``stats``.
     
+    Pass a ``LeagueState`` built once per run to avoid rebuilding the
+    league table on every call.
+    """
+    if state is None:
+        state = LeagueState(teams_info, stats)
+    state.reset()
+    index = state.index
     for game in simulated_games:
-        home = game['home']
-        away = game['away']
-        
-        home_conf = teams_info[home]['conference']
-        away_conf = teams_info[away]['conference']
-        home_div = teams_info[home]['division']
-        away_div = teams_info[away]['division']
-        
+        home = index[game['home']]
+        away = index[game['away']]
         if game.get('is_tie', False):
-            sim_stats[home]['T'] += 1
-            sim_stats[away]['T'] += 1
-            sim_stats[home]['head_to_head'][away]['T'] += 1
-            sim_stats[away]['head_to_head'][home]['T'] += 1
-            sim_stats[home]['opponents'].append(away)
-            sim_stats[away]['opponents'].append(home)
-            
-            if home_conf == away_conf:
-                sim_stats[home]['conference_T'] += 1
-                sim_stats[away]['conference_T'] += 1
-                tie_score = game.get('home_score', 0)
-                sim_stats[home]['conference_points_for'] += tie_score
-                sim_stats[home]['conference_points_against'] += tie_score
-                sim_stats[away]['conference_points_for'] += tie_score
-                sim_stats[away]['conference_points_against'] += tie_score
-            
-            if home_div == away_div:
-                sim_stats[home]['division_T'] += 1
-                sim_stats[away]['division_T'] += 1
+            state.record_game(home, away, 0)
+        elif game['winner'] == game['home']:
+            state.record_game(home, away, 1)
         else:
-            winner = game['winner']
-            loser = game['loser']
-            
-            sim_stats[winner]['W'] += 1
-            sim_stats[loser]['L'] += 1
-            sim_stats[winner]['head_to_head'][loser]['W'] += 1
-            sim_stats[loser]['head_to_head'][winner]['L'] += 1
-            sim_stats[winner]['defeated_opponents'].append(loser)
-            sim_stats[winner]['opponents'].append(loser)
-            sim_stats[loser]['opponents'].append(winner)
-            
-            if home_conf == away_conf:
-                sim_stats[winner]['conference_W'] += 1
-                sim_stats[loser]['conference_L'] += 1
-                winner_score = game.get('winner_score', 0)
-                loser_score = game.get('loser_score', 0)
-                sim_stats[winner]['conference_points_for'] += winner_score
-                sim_stats[winner]['conference_points_against'] += loser_score
-                sim_stats[loser]['conference_points_for'] += loser_score
-                sim_stats[loser]['conference_points_against'] += winner_score
-            
-            if home_div == away_div:
-                sim_stats[winner]['division_W'] += 1
-                sim_stats[loser]['division_L'] += 1
-    
-    for team in sim_stats:
-        total = sim_stats[team]['W'] + sim_stats[team]['L'] + sim_stats[team]['T']
-        sim_stats[team]['win_pct'] = (sim_stats[team]['W'] + 0.5 * sim_stats[team]['T']) / total if total > 0 else 0
-        
-        conf_total = sim_stats[team]['conference_W'] + sim_stats[team]['conference_L'] + sim_stats[team]['conference_T']
-        sim_stats[team]['conference_pct'] = (sim_stats[team]['conference_W'] + 0.5 * sim_stats[team]['conference_T']) / conf_total if conf_total > 0 else 0
-        
-        div_total = sim_stats[team]['division_W'] + sim_stats[team]['division_L'] + sim_stats[team]['division_T']
-        sim_stats[team]['division_pct'] = (sim_stats[team]['division_W'] + 0.5 * sim_stats[team]['division_T']) / div_total if div_total > 0 else 0
-        
-        defeated_records = []
-        for opp in sim_stats[team]['defeated_opponents']:
-            opp_total = sim_stats[opp]['W'] + sim_stats[opp]['L'] + sim_stats[opp]['T']
-            opp_pct = (sim_stats[opp]['W'] + 0.5 * sim_stats[opp]['T']) / opp_total if opp_total > 0 else 0
-            defeated_records.append(opp_pct)
-        sim_stats[team]['strength_of_victory'] = sum(defeated_records) / len(defeated_records) if defeated_records else 0
-        
-        opponent_records = []
-        for opp in sim_stats[team]['opponents']:
-            opp_total = sim_stats[opp]['W'] + sim_stats[opp]['L'] + sim_stats[opp]['T']
-            opp_pct = (sim_stats[opp]['W'] + 0.5 * sim_stats[opp]['T']) / opp_total if opp_total > 0 else 0
-            opponent_records.append(opp_pct)
-        sim_stats[team]['strength_of_schedule'] = sum(opponent_records) / len(opponent_records) if opponent_records else 0
+            state.record_game(home, away, 2)
+    state.finalize()
     
     playoff_teams = {}
     division_winners = {}
     bye_teams = {}
     
     for conf in ['AFC', 'NFC']:
-        conf_teams = [t for t in teams_info if teams_info[t]['conference'] == conf]
+        seeds = seed_conference(conf, state)
+        playoff_teams[conf], division_winners[conf], bye_teams[conf] = (
+            [state.teams[i] for i in group] for group in seeds
+        )
+    
+    return playoff_teams, division_winners, bye_teams
+
+def seed_conference(conf, state, ordered=False):
+    """Return (playoff teams, division winners, bye teams) as team indices for one conference.
+    
+    With ``ordered``, every division winner is ranked so the playoff teams
+    come back in seed order (seed 1 first), as ``simulate_bracket`` needs.
+    """
+    conf_teams = state.conf_members.get(conf, [])
+    
+    div_leaders = []
+    for div_contenders in state.div_members.get(conf, {}).values():
+        ranked_div = rank_teams_with_tiebreakers(div_contenders, state, is_division=True, limit=1)
+        div_leaders.append(ranked_div[0])
+    
+    ranked_div_leaders = rank_teams_with_tiebreakers(div_leaders, state, is_division=False,
+                                                     limit=None if ordered else 1)
+    
+    wc_candidates = [t for t in conf_teams if t not in div_leaders]
+    ranked_wc = rank_teams_with_tiebreakers(wc_candidates, state, is_division=False, limit=3)
+    
+    leaders = ranked_div_leaders if ordered else div_leaders
+    return leaders + ranked_wc[:3], div_leaders, ranked_div_leaders[:1]
+
+def seed_conference_outcomes(conf, state):
+    """Every seeding ``seed_conference(conf, state, ordered=True)`` can return, with its probability.
+    
+    Seeding is replayed once per combination of coin-flip picks, each pick
+    weighted 1/candidates; without coin flips that is a single (seeds, 1.0).
+    """
+    outcomes = []
+    script = []
+    while True:
+        state.flip_script = script
+        state.flip_log = []
+        seeds = seed_conference(conf, state, ordered=True)
+        log = state.flip_log
+        outcomes.append((seeds, math.prod(1 / size for _, size in log)))
+        # Advance the deepest flip that still has picks left, as an odometer
+        while log and log[-1][0] + 1 == log[-1][1]:
+            log.pop()
+        if not log:
+            state.flip_script = None
+            return outcomes
+        script = [pick for pick, _ in log[:-1]] + [log[-1][0] + 1]
+
+def _bracket_winner(seeds, high, low, home_probs, n):
+    """Seed position that wins a playoff game hosted by the better seed ``high``."""
+    return high if random.random() < home_probs[seeds[high] * n + seeds[low]] else low
+
+def neutral_probability(a, b, home_probs, n):
+    """Chance ``a`` beats ``b`` at a neutral site: the mean of hosting and visiting."""
+    return (home_probs[a * n + b] + 1 - home_probs[b * n + a]) / 2
+
+def simulate_bracket(conference_seeds, home_probs, n):
+    """Play one postseason from each conference's seeds (seed 1 first).
+    
+    Seed 1 has a bye while 2-7, 3-6 and 4-5 meet in the wild card round.
+    Survivors are reseeded each round with the better seed at home, and the
+    two conference champions meet at a neutral-site Super Bowl. ``home_probs``
+    comes from ``GameModel.bracket_probabilities``.
+    
+    Returns {round: [team indices]} for every round in ``BRACKET_ROUNDS``.
+    """
+    reached = {key: [] for key in BRACKET_ROUNDS}
+    for seeds in conference_seeds:
+        wild_card = [_bracket_winner(seeds, high, PLAYOFF_SEEDS - high, home_probs, n) for high in (1, 2, 3)]
+        alive = sorted([0] + wild_card)
+        final_four = sorted([
+            _bracket_winner(seeds, alive[0], alive[3], home_probs, n),
+            _bracket_winner(seeds, alive[1], alive[2], home_probs, n),
+        ])
+        reached['divisional'].extend(seeds[pos] for pos in alive)
+        reached['conference'].extend(seeds[pos] for pos in final_four)
+        reached['superbowl'].append(seeds[_bracket_winner(seeds, final_four[0], final_four[1], home_probs, n)])
+    
+    if len(reached['superbowl']) == 2:
+        a, b = reached['superbowl']
+        reached['champion'].append(a if random.random() < neutral_probability(a, b, home_probs, n) else b)
+    return reached
+
+def run_playoff_simulations(teams_info, stats, sos_data, games, rankings, num_simulations, progress_every=None, game_model=None):
+    """Simulate the rest of the season and its postseason once per iteration and tally every team.
+    
+    Returns {team: {'playoff': count, 'division': count, 'bye': count, <round>: count}}
+    with one count per ``BRACKET_ROUNDS`` round reached.
+    """
+    if game_model is None:
+        game_model = GameModel(teams_info, stats, rankings, games)
+    state = LeagueState(teams_info, stats)
+    n = len(state.teams)
+    pairs = [(state.index[e['home']], state.index[e['away']]) for e in game_model.remaining]
+    home_probs = game_model.bracket_probabilities(state.teams)
+    tallies = [dict.fromkeys(('playoff', 'division', 'bye') + BRACKET_ROUNDS, 0) for _ in range(n)]
+    
+    for sim in range(num_simulations):
+        if progress_every and (sim + 1) % progress_every == 0:
+            print(f"  Simulation {sim + 1:,}/{num_simulations:,}...")
         
-        div_leaders = {}
-        for division in set(teams_info[t]['division'] for t in conf_teams):
-            div_contenders = [t for t in conf_teams if teams_info[t]['division'] == division]
-            ranked_div = rank_teams_with_tiebreakers(div_contenders, sim_stats, teams_info, is_division=True)
-            div_leaders[division] = ranked_div[0]
+        state.reset()
+        for (home, away), code in zip(pairs, draw_outcome_codes(game_model)):
+            state.record_game(home, away, code)
+        state.finalize()
+        
+        conference_seeds = []
+        for conf in state.conf_members:
+            seeds = seed_conference(conf, state, ordered=True)
+            conference_seeds.append(seeds[0])
+            for key, group in zip(('playoff', 'division', 'bye'), seeds):
+                for i in group:
+                    tallies[i][key] += 1
+        for key, group in simulate_bracket(conference_seeds, home_probs, n).items():
+            for i in group:
+                tallies[i][key] += 1
+    
+    counts = {team: dict.fromkeys(('playoff', 'division', 'bye') + BRACKET_ROUNDS, 0) for team in teams_info}
+    counts.update(zip(state.teams, tallies))
+    return counts
+
+def calculate_playoff_probability_simulation(team_name, teams_info, stats, sos_data, games, rankings, num_simulations=1000):
+    counts = run_playoff_simulations(teams_info, stats, sos_data, games, rankings, num_simulations)[team_name]
+    
+    return {
+        'playoff_probability': (counts['playoff'] / num_simulations) * 100,
+        'division_probability': (counts['division'] / num_simulations) * 100,
+        'bye_probability': (counts['bye'] / num_simulations) * 100
+    }
+
+def _batch_pct(wins, losses, ties):
+    total = wins + losses + ties
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(total > 0, (wins + 0.5 * ties) / np.maximum(total, 1), 0.0)
+
+class BatchLeagueTable:
+    """``LeagueState`` for a whole batch of simulations at once.
+    
+    Row ``r`` of every array is one simulated season: win/conference/division
+    percentages are (N x teams) and the head-to-head win, tie and games-played
+    matrices are (N x teams x teams). ``pick`` and ``rank`` are the batched
+    ``apply_tiebreakers`` and ``rank_teams_with_tiebreakers``; they take a
+    boolean (N x teams) mask of candidates per row and work on all rows
+    together, so no simulation has to be replayed through the scalar path.
+    Coin flips draw from ``rng``.
+    """
+    
+    def __init__(self, state, home_idx, away_idx, outcome, rng):
+        n = state.n
+        self.rng = rng
+        self.rows = np.arange(len(outcome))
+        tie, home_win, away_win = outcome == 0, outcome == 1, outcome == 2
         
-        division_winners[conf] = list(div_leaders.values())
+        # Game -> team incidence matrices turn per-game outcomes into per-team tallies
+        n_games = len(home_idx)
+        home_inc = np.zeros((n_games, n))
+        home_inc[np.arange(n_games), home_idx] = 1
+        away_inc = np.zeros((n_games, n))
+        away_inc[np.arange(n_games), away_idx] = 1
+        conference = np.array(state.conference)
+        division = np.array(state.division)
+        same = {
+            '': np.ones(n_games, dtype=bool),
+            'conference_': conference[home_idx] == conference[away_idx],
+            'division_': division[home_idx] == division[away_idx],
+        }
+        hw_f, aw_f, tie_f = home_win.astype(float), away_win.astype(float), tie.astype(float)
+        for prefix, out in (('', 'win_pct'), ('conference_', 'conference_pct'), ('division_', 'division_pct')):
+            sel = same[prefix].astype(float)
+            base = [np.array(state._base[prefix + key], dtype=float) for key in ('W', 'L', 'T')]
+            wins = base[0] + (hw_f * sel) @ home_inc + (aw_f * sel) @ away_inc
+            losses = base[1] + (aw_f * sel) @ home_inc + (hw_f * sel) @ away_inc
+            ties = base[2] + (tie_f * sel) @ (home_inc + away_inc)
+            setattr(self, out, _batch_pct(wins, losses, ties))
         
-        ranked_div_leaders = rank_teams_with_tiebreakers(list(div_leaders.values()), sim_stats, teams_info, is_division=False)
+        size = len(outcome)
+        self.h2h_w = np.broadcast_to(np.array(state._base_h2h_w, dtype=np.int8).reshape(n, n), (size, n, n)).copy()
+        for g, (home, away) in enumerate(zip(home_idx.tolist(), away_idx.tolist())):
+            self.h2h_w[:, home, away] += home_win[:, g]
+            self.h2h_w[:, away, home] += away_win[:, g]
+        # Ties are rare, so they are added one by one; every remaining game is
+        # played in every row, so games between each pair are shared by all rows
+        self.h2h_t = np.broadcast_to(np.array(state._base_h2h_t, dtype=np.int8).reshape(n, n), (size, n, n)).copy()
+        tie_rows, tie_games = np.nonzero(tie)
+        np.add.at(self.h2h_t, (tie_rows, home_idx[tie_games], away_idx[tie_games]), 1)
+        np.add.at(self.h2h_t, (tie_rows, away_idx[tie_games], home_idx[tie_games]), 1)
+        games = np.array(state._base_games, dtype=np.int8).reshape(n, n)
+        np.add.at(games, (home_idx, away_idx), 1)
+        np.add.at(games, (away_idx, home_idx), 1)
+        self.games = np.broadcast_to(games, (size, n, n))
+    
+    def _opponent_pct(self, matrix, rows, cols):
+        """Batched ``LeagueState._weighted_opponent_pct`` (SoV or SoS) of teams ``cols`` in ``rows``."""
+        counts = matrix[np.ix_(rows, cols)].astype(float)
+        weighted = np.einsum('rij,rj->ri', counts, self.win_pct[rows])
+        total = counts.sum(axis=2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(total > 0, weighted / np.maximum(total, 1), 0.0)
+    
+    def pick(self, mask, is_division=False):
+        """Team index that ``apply_tiebreakers`` picks from each row's ``mask``."""
+        winner = np.where(mask.sum(axis=1) == 1, mask.argmax(axis=1), -1)
+        rows = np.flatnonzero(winner < 0)
+        if not len(rows):
+            return winner
+        # Only the teams still tied in some row take part from here on
+        cols = np.flatnonzero(mask[rows].any(axis=0))
+        tied = mask[np.ix_(rows, cols)]
         
-        bye_teams[conf] = ranked_div_leaders[:1]
+        # Head-to-head among the tied teams only; unlike the later steps it
+        # picks a unique leader or changes nothing
+        weights = tied.astype(np.int8)
+        h2h_w = self.h2h_w[np.ix_(rows, cols, cols)]
+        wins = np.einsum('rij,rj->ri', h2h_w, weights, dtype=np.int32)
+        losses = np.einsum('rji,rj->ri', h2h_w, weights, dtype=np.int32)
+        ties = np.einsum('rij,rj->ri', self.h2h_t[np.ix_(rows, cols, cols)], weights, dtype=np.int32)
+        scored = np.where(tied, _batch_pct(wins, losses, ties), -np.inf)
+        top = scored == scored.max(axis=1, keepdims=True)
+        single = top.sum(axis=1) == 1
+        winner[rows[single]] = cols[top[single].argmax(axis=1)]
+        tied, rows = tied[~single], rows[~single]
         
-        wc_candidates = [t for t in conf_teams if t not in div_leaders.values()]
-        ranked_wc = rank_teams_with_tiebreakers(wc_candidates, sim_stats, teams_info, is_division=False)
+        # (value of each row's ``cols``, tolerance) of the steps after head-to-head
+        steps = [(lambda rows: self.conference_pct[np.ix_(rows, cols)], None),
+                 (lambda rows: self._opponent_pct(self.h2h_w, rows, cols), 0.001),
+                 (lambda rows: self._opponent_pct(self.games, rows, cols), 0.001)]
+        if is_division:
+            steps.insert(0, (lambda rows: self.division_pct[np.ix_(rows, cols)], None))
+        for values, tolerance in steps:
+            if not len(rows):
+                return winner
+            scored = np.where(tied, values(rows), -np.inf)
+            best = scored.max(axis=1, keepdims=True)
+            tied &= scored == best if tolerance is None else np.abs(scored - best) < tolerance
+            single = tied.sum(axis=1) == 1
+            winner[rows[single]] = cols[tied[single].argmax(axis=1)]
+            tied, rows = tied[~single], rows[~single]
         
-        playoff_teams[conf] = list(div_leaders.values()) + ranked_wc[:3]
+        if len(rows):
+            flips = np.where(tied, self.rng.random(tied.shape), -1.0)
+            winner[rows] = cols[flips.argmax(axis=1)]
+        return winner
     
-    return playoff_teams, division_winners, bye_teams
+    def rank(self, candidates, places, is_division=False):
+        """(N x ``places``) team indices: ``rank_teams_with_tiebreakers`` with ``limit=places``."""
+        left = np.broadcast_to(candidates, self.win_pct.shape).copy()
+        order = []
+        for _ in range(places):
+            scored = np.where(left, self.win_pct, -np.inf)
+            top = left & (scored == scored.max(axis=1, keepdims=True))
+            chosen = self.pick(top, is_division)
+            order.append(chosen)
+            left[self.rows, chosen] = False
+        return np.stack(order, axis=1)
 
-def calculate_playoff_probability_simulation(team_name, teams_info, stats, sos_data, games, rankings, num_simulations=1000):
-    playoff_count = 0
-    division_count = 0
-    bye_count = 0
-    conf = teams_info[team_name]['conference']
+def run_numpy_simulations(teams_info, stats, games, rankings, num_simulations, seed=None, batch_size=NUMPY_BATCH_SIZE, game_model=None):
+    """Batched Monte Carlo engine: one pass for all teams using NumPy arrays.
     
-    for sim in range(num_simulations):
-        simulated_games = simulate_remaining_games(teams_info, stats, sos_data, games, rankings)
-        playoff_teams, division_winners, bye_teams = determine_playoff_teams(teams_info, stats, simulated_games)
+    Each batch samples an (N x games) outcome matrix, builds the per-season
+    league tables as arrays (``BatchLeagueTable``) and seeds every
+    conference with the batched tiebreakers. The postseason is then played
+    for the whole batch at once (see ``_numpy_bracket``).
+    ``seed`` may also be a ``numpy.random.Generator`` to continue its stream;
+    coin-flip tiebreakers draw from it too.
+    
+    Returns {team: {'playoff': count, 'division': count, 'bye': count, <round>: count}}.
+    """
+    if np is None:
+        raise RuntimeError("The numpy engine requires NumPy (pip install numpy)")
+    
+    rng = np.random.default_rng(seed)
+    state = LeagueState(teams_info, stats)
+    teams = state.teams
+    team_index = state.index
+    n_teams = len(teams)
+    
+    if game_model is None:
+        game_model = GameModel(teams_info, stats, rankings, games)
+    remaining = game_model.remaining
+    n_games = len(remaining)
+    home_idx = np.array([team_index[g['home']] for g in remaining], dtype=np.intp)
+    away_idx = np.array([team_index[g['away']] for g in remaining], dtype=np.intp)
+    tie_threshold = np.array([g['tie_threshold'] for g in remaining])
+    home_threshold = np.array([g['home_threshold'] for g in remaining])
+    
+    conf_layout = []
+    for conf in ['AFC', 'NFC']:
+        members = np.zeros(n_teams, dtype=bool)
+        members[state.conf_members.get(conf, [])] = True
+        divisions = []
+        for div_teams in state.div_members.get(conf, {}).values():
+            div_mask = np.zeros(n_teams, dtype=bool)
+            div_mask[div_teams] = True
+            divisions.append(div_mask)
+        n_wild = min(PLAYOFF_SEEDS - len(divisions), int(members.sum()) - len(divisions))
+        if divisions:
+            conf_layout.append((members, divisions, n_wild))
+    
+    playoff_counts = np.zeros(n_teams, dtype=np.int64)
+    division_counts = np.zeros(n_teams, dtype=np.int64)
+    bye_counts = np.zeros(n_teams, dtype=np.int64)
+    round_counts = {key: np.zeros(n_teams, dtype=np.int64) for key in BRACKET_ROUNDS}
+    home_probs = np.array(game_model.bracket_probabilities(teams)).reshape(n_teams, n_teams)
+    
+    done = 0
+    while done < num_simulations:
+        size = min(batch_size, num_simulations - done)
+        done += size
         
-        if team_name in playoff_teams[conf]:
-            playoff_count += 1
+        draws = rng.random((size, n_games))
+        outcome = np.where(draws < tie_threshold, 0, np.where(draws < home_threshold, 1, 2))
+        table = BatchLeagueTable(state, home_idx, away_idx, outcome, rng)
         
-        if team_name in division_winners[conf]:
-            division_count += 1
+        conference_seeds = []
+        for members, divisions, n_wild in conf_layout:
+            leaders = np.concatenate([table.rank(div_mask, 1, is_division=True) for div_mask in divisions], axis=1)
+            leader_mask = np.zeros((size, n_teams), dtype=bool)
+            leader_mask[table.rows[:, None], leaders] = True
+            ranked_leaders = table.rank(leader_mask, len(divisions))
+            wild_cards = table.rank(members & ~leader_mask, n_wild)
+            seeds = np.concatenate([ranked_leaders, wild_cards], axis=1)
+            
+            playoff_counts += np.bincount(seeds.ravel(), minlength=n_teams)
+            division_counts += np.bincount(leaders.ravel(), minlength=n_teams)
+            bye_counts += np.bincount(ranked_leaders[:, 0], minlength=n_teams)
+            conference_seeds.append(seeds)
         
-        if team_name in bye_teams[conf]:
-            bye_count += 1
-    
-    playoff_probability = (playoff_count / num_simulations) * 100
-    division_probability = (division_count / num_simulations) * 100
-    bye_probability = (bye_count / num_simulations) * 100
+        for key, reached in _numpy_bracket(rng, conference_seeds, home_probs).items():
+            round_counts[key] += reached
     
     return {
-        'playoff_probability': playoff_probability,
-        'division_probability': division_probability,
-        'bye_probability': bye_probability
+        team: {
+            'playoff': int(playoff_counts[i]),
+            'division': int(division_counts[i]),
+            'bye': int(bye_counts[i]),
+            **{key: int(round_counts[key][i]) for key in BRACKET_ROUNDS},
+        }
+        for i, team in enumerate(teams)
     }
 
-def check_mathematical_certainty(team_name, teams_info, stats, games):
-    """
-    Check if team is mathematically clinched or eliminated.
-    Returns: 'clinched', 'eliminated', or None
+def _numpy_bracket(rng, conference_seeds, home_probs):
+    """Batched ``simulate_bracket``: ``conference_seeds`` holds one (N x 7)
+    array of team indices per conference in seed order, ``home_probs`` is the
+    (teams x teams) playoff home win matrix. Returns per-team counts per round."""
+    n_teams = home_probs.shape[0]
+    reached = {key: np.zeros(n_teams, dtype=np.int64) for key in BRACKET_ROUNDS}
+    finalists = []
+    for seeds in conference_seeds:
+        rows = np.arange(len(seeds))
+        
+        def play(high, low):
+            home_wins = rng.random(len(rows)) < home_probs[seeds[rows, high], seeds[rows, low]]
+            return np.where(home_wins, high, low)
+        
+        wild_card = [play(np.full(len(rows), high), np.full(len(rows), PLAYOFF_SEEDS - high)) for high in (1, 2, 3)]
+        alive = np.sort(np.stack([np.zeros(len(rows), dtype=np.intp)] + wild_card, axis=1), axis=1)
+        final_four = np.sort(np.stack([play(alive[:, 0], alive[:, 3]), play(alive[:, 1], alive[:, 2])], axis=1), axis=1)
+        finalist = seeds[rows, play(final_four[:, 0], final_four[:, 1])]
+        reached['divisional'] += np.bincount(np.take_along_axis(seeds, alive, axis=1).ravel(), minlength=n_teams)
+        reached['conference'] += np.bincount(np.take_along_axis(seeds, final_four, axis=1).ravel(), minlength=n_teams)
+        reached['superbowl'] += np.bincount(finalist, minlength=n_teams)
+        finalists.append(finalist)
+    
+    if len(finalists) == 2:
+        a, b = finalists
+        a_wins = (home_probs[a, b] + 1 - home_probs[b, a]) / 2
+        reached['champion'] += np.bincount(np.where(rng.random(len(a)) < a_wins, a, b), minlength=n_teams)
+    return reached
+
+def outcome_probabilities(entry):
+    """(tie, home win, away win) probabilities of one ``GameModel.remaining`` entry,
+    indexed by the outcome codes ``LeagueState.record_game`` takes."""
+    tie = entry['tie_threshold']
+    return (tie, entry['home_threshold'] - tie, 1 - entry['home_threshold'])
+
+def decisive_probabilities(entry):
+    """``outcome_probabilities`` with the tie chance split evenly between the
+    two results, since a tie counts as half a win; the tie code gets 0."""
+    tie, home, away = outcome_probabilities(entry)
+    return (0.0, home + tie / 2, away + tie / 2)
+
+def tie_chance(entries):
+    """Probability that at least one of ``entries`` ends in a tie."""
+    return 1 - math.prod(1 - outcome_probabilities(entry)[0] for entry in entries)
+
+def _weighted_outcomes(entries, probabilities=outcome_probabilities):
+    """Every outcome combination of ``entries`` with its probability."""
+    choices = [
+        [(code, p) for code, p in enumerate(probabilities(entry)) if p > 0]
+        for entry in entries
+    ]
+    for combo in itertools.product(*choices):
+        weight = 1.0
+        for _, p in combo:
+            weight *= p
+        yield [code for code, _ in combo], weight
+
+def _outcome_count(entries, probabilities=outcome_probabilities):
+    count = 1
+    for entry in entries:
+        count *= sum(1 for p in probabilities(entry) if p > 0)
+    return count
+
+def run_exact_enumeration(teams_info, stats, games, rankings, max_outcomes=EXACT_MAX_OUTCOMES, game_model=None,
+                          ties=True):
+    """Playoff, division and bye probabilities by enumerating outcomes.
+    
+    Every remaining game is enumerated as a home win, away win or tie, and
+    every coin-flip tiebreak as each of its picks (see
+    ``seed_conference_outcomes``), so the result is exact for the model.
+    With ``ties=False`` only decisive results are enumerated: each game's tie
+    chance is split evenly between its two results (see
+    ``decisive_probabilities``), so k games cost 2^k seedings instead of 3^k,
+    but any probability may then be off by up to ``tie_chance`` of the
+    remaining games.
+    
+    Each conference is handled on its own: only games involving one of its
+    teams can change its records, so those are enumerated with every other
+    game held at its likeliest result. Other games only matter through
+    SoV/SoS; if a seeding reaches those tiebreakers, that combination is
+    expanded over the other games involving an opponent of the teams
+    compared, widening the set if another team's SoV/SoS turns out to be
+    needed. Each outcome is weighted by the model's per-game probabilities.
     
-    Uses conference-aware logic for games not involving target team:
-    - Worst-case: Same-conference rivals win their games
-    - Best-case: Same-conference rivals lose their games
+    Postseason odds are exact for each distinct seeding (see
+    ``bracket_distribution``); Super Bowl winners treat the two conference
+    champions as independent, as the per-conference enumeration already does.
     
-    Special handling when team has 0 games remaining:
-    - If other teams could finish with same record, don't mark as certain
-    - This allows Monte Carlo to properly handle tiebreaker probabilities
+    Returns {team: {'playoff': p, 'division': p, 'bye': p, <round>: p}} as
+    fractions, or None if more than ``max_outcomes`` game combinations would
+    have to be seeded. The combinations of both conferences are counted before
+    any is seeded, and each SoV/SoS expansion as soon as its seeding is found,
+    before any expansion starts; replays for coin flips are not counted.
     """
-    remaining_games = [g for g in games if not g['completed']]
-    conf = teams_info[team_name]['conference']
+    if game_model is None:
+        game_model = GameModel(teams_info, stats, rankings, games)
+    state = LeagueState(teams_info, stats)
+    index = state.index
+    n = state.n
+    remaining = game_model.remaining
+    pairs = [(index[e['home']], index[e['away']]) for e in remaining]
+    probs = {team: dict.fromkeys(('playoff', 'division', 'bye') + BRACKET_ROUNDS, 0.0) for team in state.teams}
+    home_probs = game_model.bracket_probabilities(state.teams)
+    finalists = []
+    probabilities = outcome_probabilities if ties else decisive_probabilities
     
-    team_remaining_games = [g for g in remaining_games if team_name in (g['home'], g['away'])]
+    layout = []
+    for conf in state.conf_members:
+        direct = [k for k, (home, away) in enumerate(pairs)
+                  if state.conference[home] == conf or state.conference[away] == conf]
+        direct_set = set(direct)
+        layout.append((conf, direct, [k for k in range(len(pairs)) if k not in direct_set]))
+    budget = max_outcomes - sum(
+        _outcome_count([remaining[k] for k in direct], probabilities) for _, direct, _ in layout
+    )
+    if budget < 0:
+        return None
+    
+    held = {}
+    for k, entry in enumerate(remaining):
+        odds = probabilities(entry)
+        held[k] = max((1, 2, 0), key=lambda code: odds[code])
     
-    if not team_remaining_games and remaining_games:
-        team_record = stats[team_name]['W'] + 0.5 * stats[team_name]['T']
+    def seed(conf, outcomes):
+        state.reset()
+        for k, outcome in outcomes.items():
+            state.record_game(*pairs[k], outcome)
+        state.finalize()
+        return seed_conference_outcomes(conf, state)
+    
+    for conf, direct, other in layout:
+        seedings = defaultdict(float)
+        
+        def tally(seeds, weight):
+            for key, group in zip(('playoff', 'division', 'bye'), seeds):
+                for i in group:
+                    probs[state.teams[i]][key] += weight
+            seedings[tuple(seeds[0])] += weight
         
-        for other_team, other_stats in stats.items():
-            if other_team == team_name:
+        def relevant(teams):
+            # Other games that move the win% of an opponent of ``teams``
+            opponents = {j for i in teams for j in range(n) if state.games[i * n + j]}
+            return [k for k in other if pairs[k][0] in opponents or pairs[k][1] in opponents]
+        
+        # SoV/SoS read opponents' records, which the other games change;
+        # those endings are charged as soon as they are found and expanded
+        # once every one has been
+        leaves = []
+        for codes, weight in _weighted_outcomes([remaining[k] for k in direct], probabilities):
+            outcomes = dict(held)
+            outcomes.update(zip(direct, codes))
+            seeded = seed(conf, outcomes)
+            if state.opponent_pct_teams:
+                teams = set(state.opponent_pct_teams)
+                budget -= _outcome_count([remaining[k] for k in relevant(teams)], probabilities)
+                if budget < 0:
+                    return None
+                leaves.append((outcomes, weight, teams))
+            else:
+                for seeds, flip_weight in seeded:
+                    tally(seeds, weight * flip_weight)
+        
+        for outcomes, weight, teams in leaves:
+            while True:
+                expanded = relevant(teams)
+                results = []
+                for codes, other_weight in _weighted_outcomes([remaining[k] for k in expanded], probabilities):
+                    outcomes.update(zip(expanded, codes))
+                    seeded = seed(conf, outcomes)
+                    if not state.opponent_pct_teams <= teams:
+                        break
+                    results.extend((seeds, other_weight * flip_weight) for seeds, flip_weight in seeded)
+                else:
+                    break
+                # Another team's SoV/SoS decided a tie: expand over its opponents' games too
+                teams |= state.opponent_pct_teams
+                budget -= _outcome_count([remaining[k] for k in relevant(teams)], probabilities)
+                if budget < 0:
+                    return None
+            for seeds, other_weight in results:
+                tally(seeds, weight * other_weight)
+        
+        conf_finalists = defaultdict(float)
+        for seeds, weight in seedings.items():
+            for key, reached in bracket_distribution(seeds, home_probs, state.n).items():
+                for i, p in reached.items():
+                    probs[state.teams[i]][key] += weight * p
+                    if key == 'superbowl':
+                        conf_finalists[i] += weight * p
+        finalists.append(conf_finalists)
+    
+    if len(finalists) == 2:
+        for a, p_a in finalists[0].items():
+            for b, p_b in finalists[1].items():
+                a_wins = neutral_probability(a, b, home_probs, state.n)
+                probs[state.teams[a]]['champion'] += p_a * p_b * a_wins
+                probs[state.teams[b]]['champion'] += p_a * p_b * (1 - a_wins)
+    
+    return probs
+
+def bracket_distribution(seeds, home_probs, n):
+    """Exact ``simulate_bracket`` odds for one conference's seeds (seed 1 first).
+    
+    Returns {round: {team index: probability}} for the rounds up to and
+    including reaching the Super Bowl.
+    """
+    reached = {key: defaultdict(float) for key in ('divisional', 'conference', 'superbowl')}
+    
+    def game(high, low):
+        p = home_probs[seeds[high] * n + seeds[low]]
+        return (high, p), (low, 1 - p)
+    
+    for wild_card in itertools.product(*(game(high, PLAYOFF_SEEDS - high) for high in (1, 2, 3))):
+        p_alive = math.prod(p for _, p in wild_card)
+        alive = sorted([0] + [pos for pos, _ in wild_card])
+        for pos in alive:
+            reached['divisional'][seeds[pos]] += p_alive
+        for divisional in itertools.product(game(alive[0], alive[3]), game(alive[1], alive[2])):
+            p_final_four = p_alive * divisional[0][1] * divisional[1][1]
+            final_four = sorted(pos for pos, _ in divisional)
+            for pos in final_four:
+                reached['conference'][seeds[pos]] += p_final_four
+            for pos, p in game(final_four[0], final_four[1]):
+                reached['superbowl'][seeds[pos]] += p_final_four * p
+    return reached
+
+def wilson_interval(successes, trials, z=WILSON_Z):
+    """Wilson score interval for a binomial proportion, as (low, high) fractions."""
+    if trials <= 0:
+        return 0.0, 1.0
+    p = successes / trials
+    z2 = z * z
+    denom = 1 + z2 / trials
+    centre = (p + z2 / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+def intervals_converged(counts, trials, ci_width, certainty=None):
+    """True once every uncertain probability's interval is narrower than ``ci_width``.
+    
+    ``ci_width`` is in percentage points. ``certainty`` holds the
+    ``solve_certainties`` flags; probabilities they already settle are skipped.
+    """
+    certainty = certainty or {}
+    for team, tallies in counts.items():
+        for key, successes in tallies.items():
+            if status_from_flags(certainty.get(team), key) is not None:
                 continue
-            if teams_info.get(other_team, {}).get('conference') != conf:
+            low, high = wilson_interval(successes, trials)
+            if (high - low) * 100 >= ci_width:
+                return False
+    return True
+
+def run_until_converged(run_batch, max_simulations, ci_width, certainty=None, batch_size=ADAPTIVE_BATCH_SIZE):
+    """Call ``run_batch(size)`` in batches until the intervals converge.
+    
+    Stops at ``max_simulations`` if they never do. Returns (counts, simulations used).
+    """
+    counts = None
+    done = 0
+    while done < max_simulations:
+        size = min(batch_size, max_simulations - done)
+        batch = run_batch(size)
+        if counts is None:
+            counts = batch
+        else:
+            for team, tallies in batch.items():
+                for key, count in tallies.items():
+                    counts[team][key] += count
+        done += size
+        if intervals_converged(counts, done, ci_width, certainty):
+            print(f"  Converged after {done:,} simulations (95% intervals < {ci_width:g} pts)")
+            break
+        print(f"  {done:,}/{max_simulations:,} simulations, intervals still wider than {ci_width:g} pts...")
+    return counts, done
+
+def probability_interval(successes, trials):
+    """Wilson interval as a rounded [low, high] pair of percentages."""
+    low, high = wilson_interval(successes, trials)
+    return [round(low * 100, 1), round(high * 100, 1)]
+
+def _most_reaching(group, need, unplayed, pair_unplayed, n):
+    """Largest number of ``group`` that can all gain ``need[i]`` more points.
+    
+    A set of teams can gain at most 2 points per remaining game, minus 2
+    for every game they still play among themselves (only one side wins).
+    """
+    for size in range(len(group), 0, -1):
+        for subset in itertools.combinations(group, size):
+            if any(need[i] > 2 * unplayed[i] for i in subset):
                 continue
-            
-            other_remaining = [g for g in remaining_games if other_team in (g['home'], g['away'])]
-            if not other_remaining:
+            internal = sum(pair_unplayed[i * n + j] for i, j in itertools.combinations(subset, 2))
+            if sum(need[i] for i in subset) <= sum(2 * unplayed[i] for i in subset) - 2 * internal:
+                return size
+    return 0
+
+def _most_staying(group, allow, pair_unplayed, n):
+    """Largest number of ``group`` that can all gain at most ``allow[i]`` points.
+    
+    Games among the set still hand out 2 points each.
+    """
+    for size in range(len(group), 0, -1):
+        for subset in itertools.combinations(group, size):
+            if any(allow[i] < 0 for i in subset):
                 continue
-            
-            other_current = other_stats['W'] + 0.5 * other_stats['T']
-            other_max = other_current + len(other_remaining)
-            other_min = other_current
-            
-            if abs(other_max - team_record) < 0.01 or abs(other_min - team_record) < 0.01:
-                return None
-            if other_min < team_record < other_max:
-                return None
+            internal = sum(pair_unplayed[i * n + j] for i, j in itertools.combinations(subset, 2))
+            if 2 * internal <= sum(allow[i] for i in subset):
+                return size
+    return 0
+
+def _bound_verdict(question, target, points, unplayed, total_games, pair_unplayed, n, conf_divisions):
+    """'in'/'out' if reachable records alone settle ``question`` for ``target``.
     
-    if not remaining_games:
-        return None
+    Points are 2 per win and 1 per tie. Other teams are measured against the
+    target's floor (it loses out) and ceiling (it wins out); finishing level
+    with it counts against the target, since it might lose the tiebreaker.
+    """
+    floor = points[target]
+    ceiling = floor + 2 * unplayed[target]
+    games_played = max(total_games[target], 1)
+    reach = {}
+    ahead = {}
+    for div in conf_divisions:
+        others = [t for t in div if t != target]
+        need = {}
+        allow = {}
+        for t in others:
+            need[t] = -(-floor * total_games[t] // games_played) - points[t]
+            allow[t] = ceiling * total_games[t] // games_played - points[t]
+        # Counting teams one at a time is cheap; the joint check only
+        # matters when several of them are in range
+        key = tuple(div)
+        reach[key] = sum(1 for t in others if need[t] <= 2 * unplayed[t])
+        if reach[key] > 1:
+            reach[key] = _most_reaching(others, need, unplayed, pair_unplayed, n)
+        ahead[key] = sum(1 for t in others if allow[t] < 0)
+        if ahead[key] < len(others):
+            ahead[key] = len(others) - _most_staying(others, allow, pair_unplayed, n)
+    own = next(tuple(div) for div in conf_divisions if target in div)
     
-    worst_case_games = []
-    for game in remaining_games:
-        home, away = game['home'], game['away']
-        if team_name in (home, away):
-            winner = away if home == team_name else home
-            loser = team_name
-        else:
-            home_conf = teams_info.get(home, {}).get('conference', '')
-            away_conf = teams_info.get(away, {}).get('conference', '')
-            home_is_rival = (home_conf == conf)
-            away_is_rival = (away_conf == conf)
-            if home_is_rival and not away_is_rival:
-                winner, loser = home, away
-            elif away_is_rival and not home_is_rival:
-                winner, loser = away, home
-            elif home_is_rival and away_is_rival:
-                home_wins = stats.get(home, {}).get('W', 0)
-                away_wins = stats.get(away, {}).get('W', 0)
-                if home_wins >= away_wins:
-                    winner, loser = home, away
-                else:
-                    winner, loser = away, home
-            else:
-                winner, loser = home, away
-        worst_case_games.append({'home': home, 'away': away, 'winner': winner, 'loser': loser})
-    
-    playoff_teams, _, _ = determine_playoff_teams(teams_info, stats, worst_case_games)
-    if team_name in playoff_teams[conf]:
-        return 'clinched'
-    
-    best_case_games = []
-    for game in remaining_games:
-        home, away = game['home'], game['away']
-        if team_name in (home, away):
-            winner = team_name
-            loser = away if home == team_name else home
-        else:
-            home_conf = teams_info.get(home, {}).get('conference', '')
-            away_conf = teams_info.get(away, {}).get('conference', '')
-            home_is_rival = (home_conf == conf)
-            away_is_rival = (away_conf == conf)
-            if home_is_rival and not away_is_rival:
-                winner, loser = away, home
-            elif away_is_rival and not home_is_rival:
-                winner, loser = home, away
-            elif home_is_rival and away_is_rival:
-                home_wins = stats.get(home, {}).get('W', 0)
-                away_wins = stats.get(away, {}).get('W', 0)
-                if home_wins >= away_wins:
-                    winner, loser = home, away
+    if question == 'division':
+        if reach[own] == 0:
+            return 'in'
+        return 'out' if ahead[own] else None
+    
+    if question == 'bye':
+        if not any(reach.values()):
+            return 'in'
+        # Anyone strictly ahead puts their own division winner ahead too
+        return 'out' if any(ahead.values()) else None
+    
+    # Playoff spot: a division title or one of three wildcards. Whenever
+    # teams of a division finish ahead, its winner is one of them, so k
+    # teams ahead from one division are at most k - 1 wildcards.
+    if reach[own] == 0:
+        return 'in'
+    if sum(max(0, k - 1) for k in reach.values()) <= 2:
+        return 'in'
+    if ahead[own] and sum(max(0, k - 1) for k in ahead.values()) >= 3:
+        return 'out'
+    return None
+
+def solve_certainties(teams_info, stats, games, node_limit=CERTAINTY_NODE_LIMIT):
+    """Decide which playoff, division and bye outcomes are already certain.
+    
+    For every team a depth-first search over the remaining games that involve
+    its conference looks for a season ending that breaks the claim. At each
+    node the records every team can still reach are checked against the
+    seeding rules (see ``_bound_verdict``), which prunes whole subtrees;
+    complete endings are seeded with the real tiebreakers. When an ending
+    reaches SoV/SoS it is re-seeded under every result of the other
+    conference's games those depend on. Endings that need a coin flip count
+    as uncertain, and so do searches that run past ``node_limit`` nodes, so a
+    flag is only set when it is guaranteed.
+    
+    Returns {team: {'clinched', 'eliminated', 'clinched_division', 'clinched_bye'}} booleans.
+    """
+    state = LeagueState(teams_info, stats)
+    index = state.index
+    n = state.n
+    pairs = [
+        (index[g['home']], index[g['away']]) for g in games
+        if not g['completed'] and g['home'] in index and g['away'] in index
+    ]
+    
+    base_points = [2 * state.counts['W'][i] + state.counts['T'][i] for i in range(n)]
+    base_unplayed = [0] * n
+    base_pair_unplayed = [0] * (n * n)
+    for home, away in pairs:
+        base_unplayed[home] += 1
+        base_unplayed[away] += 1
+        base_pair_unplayed[home * n + away] += 1
+        base_pair_unplayed[away * n + home] += 1
+    total_games = [
+        state.counts['W'][i] + state.counts['L'][i] + state.counts['T'][i] + base_unplayed[i]
+        for i in range(n)
+    ]
+    
+    flags = {}
+    for conf, members in state.conf_members.items():
+        conf_divisions = list(state.div_members[conf].values())
+        direct = [k for k, (home, away) in enumerate(pairs)
+                  if state.conference[home] == conf or state.conference[away] == conf]
+        direct_set = set(direct)
+        other_pairs = [pairs[k] for k in range(len(pairs)) if k not in direct_set]
+        held = [1] * len(other_pairs)
+        
+        def holds_everywhere(target, question, want):
+            """True if every ending gives ``want`` for ``question``."""
+            division_of = next(div for div in conf_divisions if target in div)
+            order = sorted(direct, key=lambda k: (target not in pairs[k],
+                                                  not any(t in division_of for t in pairs[k])))
+            points = list(base_points)
+            unplayed = list(base_unplayed)
+            pair_unplayed = list(base_pair_unplayed)
+            outcomes = [None] * len(order)
+            nodes = 0
+            
+            def seed_ending(other_outcomes):
+                state.reset()
+                for (home, away), outcome in zip(other_pairs, other_outcomes):
+                    state.record_game(home, away, outcome)
+                for k, outcome in zip(order, outcomes):
+                    state.record_game(*pairs[k], outcome)
+                state.finalize()
+                playoff, div_winners, bye_teams = seed_conference(conf, state)
+                if state.coin_flips:
+                    return None
+                group = {'playoff': playoff, 'division': div_winners, 'bye': bye_teams}[question]
+                return 'in' if target in group else 'out'
+            
+            def leaf_verdict():
+                nonlocal nodes
+                verdict = seed_ending(held)
+                if verdict is None or not state.opponent_pct_teams:
+                    return verdict
+                # SoV/SoS also read the records of opponents outside the
+                # conference: re-seed under every result of their games
+                opponents = {j for i in state.opponent_pct_teams
+                             for j in range(n) if state.games[i * n + j]}
+                varying = [k for k, (home, away) in enumerate(other_pairs)
+                           if home in opponents or away in opponents]
+                expansions = 3 ** len(varying)
+                if expansions > min(LEAF_EXPANSION_LIMIT, node_limit - nodes):
+                    return None
+                nodes += expansions
+                ending = list(held)
+                for codes in itertools.product((0, 1, 2), repeat=len(varying)):
+                    for k, code in zip(varying, codes):
+                        ending[k] = code
+                    if seed_ending(ending) != verdict:
+                        return None
+                return verdict
+            
+            def outcome_order(home, away):
+                # Try the endings most likely to break the claim first
+                if target in (home, away):
+                    target_wins = 1 if target == home else 2
+                    first = 3 - target_wins if want == 'in' else target_wins
+                    return (first, 3 - first, 0)
+                home_in_conf = state.conference[home] == conf
+                if home_in_conf != (state.conference[away] == conf):
+                    conf_team_wins = 1 if home_in_conf else 2
+                    first = conf_team_wins if want == 'in' else 3 - conf_team_wins
                 else:
-                    winner, loser = away, home
-            else:
-                winner, loser = home, away
-        best_case_games.append({'home': home, 'away': away, 'winner': winner, 'loser': loser})
+                    # Spreading wins pushes more rivals past the target;
+                    # piling them on a team already ahead keeps the rest behind
+                    home_ahead = points[home] * total_games[away] >= points[away] * total_games[home]
+                    stronger_wins = 1 if home_ahead else 2
+                    first = 3 - stronger_wins if want == 'in' else stronger_wins
+                return (first, 3 - first, 0)
+            
+            def counterexample(depth):
+                nonlocal nodes
+                nodes += 1
+                if nodes > node_limit:
+                    return True
+                verdict = _bound_verdict(question, target, points, unplayed, total_games,
+                                         pair_unplayed, n, conf_divisions)
+                if verdict is not None:
+                    return verdict != want
+                if depth == len(order):
+                    return leaf_verdict() != want
+                
+                home, away = pairs[order[depth]]
+                unplayed[home] -= 1
+                unplayed[away] -= 1
+                pair_unplayed[home * n + away] -= 1
+                pair_unplayed[away * n + home] -= 1
+                for outcome in outcome_order(home, away):
+                    home_points, away_points = ((1, 1), (2, 0), (0, 2))[outcome]
+                    points[home] += home_points
+                    points[away] += away_points
+                    outcomes[depth] = outcome
+                    found = counterexample(depth + 1)
+                    points[home] -= home_points
+                    points[away] -= away_points
+                    if found:
+                        break
+                unplayed[home] += 1
+                unplayed[away] += 1
+                pair_unplayed[home * n + away] += 1
+                pair_unplayed[away * n + home] += 1
+                return found
+            
+            return not counterexample(0)
+        
+        for target in members:
+            clinched = holds_everywhere(target, 'playoff', 'in')
+            eliminated = not clinched and holds_everywhere(target, 'playoff', 'out')
+            clinched_division = clinched and holds_everywhere(target, 'division', 'in')
+            clinched_bye = clinched_division and holds_everywhere(target, 'bye', 'in')
+            flags[state.teams[target]] = {
+                'clinched': clinched,
+                'eliminated': eliminated,
+                'clinched_division': clinched_division,
+                'clinched_bye': clinched_bye,
+            }
     
-    playoff_teams, _, _ = determine_playoff_teams(teams_info, stats, best_case_games)
-    if team_name not in playoff_teams[conf]:
+    return flags
+
+def status_from_flags(flags, key='playoff'):
+    """'clinched', 'eliminated' or None for one probability ('playoff', 'division',
+    'bye' or a ``BRACKET_ROUNDS`` round; a bye clinches the divisional round)."""
+    if not flags:
+        return None
+    if flags['eliminated']:
         return 'eliminated'
+    clinched_flag = {
+        'playoff': 'clinched', 'division': 'clinched_division', 'bye': 'clinched_bye', 'divisional': 'clinched_bye',
+    }.get(key)
+    return 'clinched' if clinched_flag and flags[clinched_flag] else None
+
+def check_mathematical_certainty(team_name, teams_info, stats, games):
+    """
+    Check if team is mathematically clinched or eliminated.
+    Returns: 'clinched', 'eliminated', or None
     
-    return None
+    Solves the whole league; use ``solve_certainties`` directly for more than one team.
+    """
+    return status_from_flags(solve_certainties(teams_info, stats, games).get(team_name))
 
 
 def cap_probability(raw_probability, certainty_status):
@@ -730,28 +1705,32 @@ def cap_probability(raw_probability, certainty_status):
         return 0.1
     return raw_probability
 
+def bracket_results(fractions, intervals, flags):
+    """playoff_probabilities.json fields for the postseason rounds, with their intervals."""
+    results = {}
+    for key, field in BRACKET_FIELDS.items():
+        results[field] = round(cap_probability(fractions[key] * 100, status_from_flags(flags, key)), 1)
+        results[f'{field}_ci'] = intervals[key]
+    return results
 
-def cap_simulation_probability(raw_probability):
-    """Cap simulation probabilities without certainty check (for division/bye).
+def main(num_simulations=DEFAULT_NUM_SIMULATIONS, season_index=3, engine='python', seed=None, ci_width=None,
+         exact=False, max_outcomes=EXACT_MAX_OUTCOMES, sos_csv=RANKED_SOS_CSV, output_json=PLAYOFF_JSON):
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r} (expected one of {', '.join(ENGINES)})")
     
-    Since mathematical certainty for division/bye is complex to calculate,
-    we simply prevent false 100%/0% from simulations.
-    """
-    if raw_probability >= 100:
-        return 99.9
-    if raw_probability <= 0:
-        return 0.1
-    return raw_probability
-
-def main(num_simulations=DEFAULT_NUM_SIMULATIONS, season_index=3):
-    teams_info, games, sos_data = load_data(season_index=season_index)
-    stats = calculate_team_stats(teams_info, games)
+    teams_info, games, sos_data = load_data(season_index=season_index, sos_csv=sos_csv)
     rankings = load_rankings_data(season_index=season_index)
+    stats, game_model = load_season_model(teams_info, games, rankings, season_index)
+    certainty = solve_certainties(teams_info, stats, games)
     
     print("\n" + "="*80)
     print("SIMULATING PLAYOFF SCENARIOS")
     print("="*80)
-    print(f"Running {num_simulations:,} simulations for each team's playoff chances...")
+    engine_label = "NumPy batched engine" if engine == 'numpy' else "Python engine"
+    if ci_width is None:
+        print(f"Running {num_simulations:,} simulations ({engine_label}, all teams tracked simultaneously)...")
+    else:
+        print(f"Running up to {num_simulations:,} simulations ({engine_label}) until every 95% interval is narrower than {ci_width:g} pts...")
     print("Enhanced model: 50% ELO + 25% Win% + 15% SoS + 10% SoV + streak bonus")
     print(f"Home field advantage: +{HOME_FIELD_ADVANTAGE*100:.0f}%")
     print(f"Win streak bonus (>={WIN_STREAK_THRESHOLD}): +{WIN_STREAK_BONUS*100:.0f}%")
@@ -759,13 +1738,60 @@ def main(num_simulations=DEFAULT_NUM_SIMULATIONS, season_index=3):
     
     results = {}
     
+    if engine == 'numpy':
+        rng = np.random.default_rng(seed)
+        def run_batch(size):
+            return run_numpy_simulations(teams_info, stats, games, rankings, size, seed=rng, game_model=game_model)
+    else:
+        def run_batch(size):
+            return run_playoff_simulations(teams_info, stats, sos_data, games, rankings, size,
+                                           progress_every=None if ci_width else 1000, game_model=game_model)
+    
+    exact_probs = None
+    method = 'monte_carlo'
+    tie_margin = 0.0
+    if exact:
+        exact_probs = run_exact_enumeration(teams_info, stats, games, rankings, max_outcomes, game_model)
+        if exact_probs is not None:
+            method = 'exact'
+            print("Enumerated every remaining outcome: probabilities are exact")
+        else:
+            exact_probs = run_exact_enumeration(teams_info, stats, games, rankings, max_outcomes, game_model,
+                                                ties=False)
+            if exact_probs is None:
+                print(f"More than {max_outcomes:,} outcomes to enumerate; falling back to Monte Carlo")
+            else:
+                method = 'enumerated_decisive'
+                tie_margin = tie_chance(game_model.remaining)
+                print(f"Too many outcomes with ties; enumerated wins and losses only, "
+                      f"probabilities within ±{tie_margin * 100:.1f} pts (chance any remaining game ties)")
+        if exact_probs is not None:
+            num_simulations = 0
+    
+    if exact_probs is not None:
+        sim_counts = None
+    elif ci_width is None:
+        sim_counts = run_batch(num_simulations)
+    else:
+        sim_counts, num_simulations = run_until_converged(run_batch, num_simulations, ci_width, certainty)
+    
     for conf in ['AFC', 'NFC']:
         conf_teams = [t for t in teams_info if teams_info[t]['conference'] == conf]
         
-        for i, team in enumerate(conf_teams, 1):
-            print(f"  [{i}/{len(conf_teams)}] Simulating {team}...")
-            certainty = check_mathematical_certainty(team, teams_info, stats, games)
-            prob_results = calculate_playoff_probability_simulation(team, teams_info, stats, sos_data, games, rankings, num_simulations=num_simulations)
+        for team in conf_teams:
+            if exact_probs is not None:
+                fractions = exact_probs[team]
+                intervals = {key: [round(max(0.0, p - tie_margin) * 100, 1), round(min(1.0, p + tie_margin) * 100, 1)]
+                             for key, p in fractions.items()}
+            else:
+                counts = sim_counts[team]
+                fractions = {key: count / num_simulations for key, count in counts.items()}
+                intervals = {key: probability_interval(count, num_simulations) for key, count in counts.items()}
+            prob_results = {
+                'playoff_probability': fractions['playoff'] * 100,
+                'division_probability': fractions['division'] * 100,
+                'bye_probability': fractions['bye'] * 100
+            }
             remaining_games = int(sos_data[team]['remaining_games']) if team in sos_data else 4
             results[team] = {
                 'conference': conf,
@@ -778,23 +1804,36 @@ def main(num_simulations=DEFAULT_NUM_SIMULATIONS, season_index=3):
                 'strength_of_victory': stats[team]['strength_of_victory'],
                 'strength_of_schedule': stats[team]['strength_of_schedule'],
                 'elo': teams_info[team]['elo'],
-                'playoff_probability': round(cap_probability(prob_results['playoff_probability'], certainty), 1),
-                'division_win_probability': round(cap_simulation_probability(prob_results['division_probability']), 1),
-                'bye_probability': round(cap_simulation_probability(prob_results['bye_probability']), 1),
+                'playoff_probability': round(cap_probability(prob_results['playoff_probability'], status_from_flags(certainty[team])), 1),
+                'division_win_probability': round(cap_probability(prob_results['division_probability'], status_from_flags(certainty[team], 'division')), 1),
+                'bye_probability': round(cap_probability(prob_results['bye_probability'], status_from_flags(certainty[team], 'bye')), 1),
+                'playoff_probability_ci': intervals['playoff'],
+                'division_win_probability_ci': intervals['division'],
+                'bye_probability_ci': intervals['bye'],
+                **bracket_results(fractions, intervals, certainty[team]),
+                'simulations': num_simulations,
+                'method': method,
                 'remaining_sos': float(sos_data[team]['ranked_sos_avg']) if team in sos_data else 0.5,
                 'remaining_games': remaining_games,
                 'past_sos': teams_info[team]['past_sos'],
-                'clinched': certainty == 'clinched',
-                'eliminated': certainty == 'eliminated'
+                'clinched': certainty[team]['clinched'],
+                'eliminated': certainty[team]['eliminated'],
+                'clinched_division': certainty[team]['clinched_division'],
+                'clinched_bye': certainty[team]['clinched_bye']
             }
     
-    with open('output/playoff_probabilities.json', 'w', encoding='utf-8') as f:
+    with open(output_json, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2)
     
     print("\n" + "="*80)
     print("PLAYOFF PROBABILITY CALCULATION COMPLETE!")
     print("="*80)
-    print(f"\nUsing Monte Carlo simulation ({num_simulations:,} iterations per team)")
+    if method == 'exact':
+        print("\nUsing exact enumeration of every remaining game outcome")
+    elif method == 'enumerated_decisive':
+        print(f"\nUsing enumeration of every remaining win/loss outcome (ties folded in, ±{tie_margin * 100:.1f} pts)")
+    else:
+        print(f"\nUsing Monte Carlo simulation ({num_simulations:,} iterations shared by all teams, {engine} engine)")
     print("Features:")
     print("  ✓ Enhanced rating: 50% ELO + 25% Win% + 15% SoS + 10% SoV")
     print(f"  ✓ Home field advantage: +{HOME_FIELD_ADVANTAGE*100:.0f}% (slight Madden boost)")
@@ -804,8 +1843,9 @@ def main(num_simulations=DEFAULT_NUM_SIMULATIONS, season_index=3):
     print("  ✓ Strength of victories from opponent power rankings")
     print("  ✓ Win probability capped at 25-75% (realistic variance)")
     print("  ✓ Proper NFL tiebreakers (H2H, Division%, Conference%, SoV, SoS)")
-    print("  ✓ Mathematical certainty detection (clinched/eliminated)")
-    print("\nOutput saved to: output/playoff_probabilities.json")
+    print("  ✓ Clinch/elimination solver (playoff spot, division, bye)")
+    print("  ✓ Seeded postseason bracket simulated in the same pass (Super Bowl odds)")
+    print(f"\nOutput saved to: {output_json}")
     print("\nTop AFC Contenders:")
     afc_teams = [(t, r['playoff_probability']) for t, r in results.items() if r['conference'] == 'AFC']
     afc_teams.sort(key=lambda x: x[1], reverse=True)
@@ -817,6 +1857,11 @@ def main(num_simulations=DEFAULT_NUM_SIMULATIONS, season_index=3):
     nfc_teams.sort(key=lambda x: x[1], reverse=True)
     for team, prob in nfc_teams[:10]:
         print(f"  {team:20s} {prob:5.1f}%")
+    
+    print("\nSuper Bowl Favorites:")
+    favorites = sorted(results.items(), key=lambda item: item[1]['superbowl_win_probability'], reverse=True)
+    for team, r in favorites[:5]:
+        print(f"  {team:20s} {r['superbowl_win_probability']:5.1f}%")
 
 if __name__ == "__main__":
     import os
@@ -827,12 +1872,47 @@ if __name__ == "__main__":
                         help=f'Number of simulations to run (default: {DEFAULT_NUM_SIMULATIONS})')
     parser.add_argument('-s', '--seed', type=int, default=None,
                         help='Random seed for reproducible results (default: None)')
-    parser.add_argument('--season-index', type=int, default=3,
-                        help='Season index to filter games and rankings (default: 3)')
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument('--season-index', type=int, default=3,
+                       help='Season index to filter games and rankings (default: 3)')
+    which.add_argument('--seasons',
+                       help="'all', or comma-separated season indexes, to calculate in one run; season N reads "
+                            "output/ranked_sos_by_conference_seasonN.csv (calc_sos_by_rankings.py --seasons) and "
+                            "writes output/playoff_probabilities_seasonN.json")
+    parser.add_argument('--engine', choices=ENGINES, default='python',
+                        help='Simulation engine: per-game Python loop or batched NumPy arrays (default: python)')
+    parser.add_argument('--ci-width', type=float, default=None,
+                        help='Stop once every 95%% interval is narrower than this many percentage points; '
+                             '-n becomes the upper bound (default: run exactly -n simulations)')
+    parser.add_argument('--exact', action='store_true',
+                        help='Enumerate every remaining outcome for exact probabilities; when there are too many, '
+                             'enumerate wins and losses only (within the chance of a tie), then fall back to Monte Carlo')
+    parser.add_argument('--max-outcomes', type=int, default=EXACT_MAX_OUTCOMES,
+                        help=f'Largest number of outcomes --exact will evaluate (default: {EXACT_MAX_OUTCOMES})')
     args = parser.parse_args()
     
-    if args.seed is not None:
-        random.seed(args.seed)
-        print(f"Using random seed: {args.seed}")
+    if args.ci_width is not None and args.ci_width <= 0:
+        parser.error('--ci-width must be positive')
+    
+    if args.engine == 'numpy' and np is None:
+        parser.error('--engine numpy requires NumPy (pip install numpy)')
+    
+    if args.seasons is None:
+        runs = [(args.season_index, RANKED_SOS_CSV, PLAYOFF_JSON)]
+    else:
+        try:
+            runs = [(si, *season_paths(si)) for si in season_indexes(args.seasons)]
+        except ValueError as e:
+            parser.error(str(e))
+        missing = [sos_csv for _, sos_csv, _ in runs if not os.path.exists(sos_csv)]
+        if missing:
+            parser.error(f"missing {', '.join(missing)}; run calc_sos_by_rankings.py --seasons {args.seasons} first")
     
-    main(num_simulations=args.num_simulations, season_index=args.season_index)
+    for season_index, sos_csv, output_json in runs:
+        if args.seed is not None:
+            # Reseeded per season so a batch run matches the single-season runs
+            random.seed(args.seed)
+            print(f"Using random seed: {args.seed}")
+        main(num_simulations=args.num_simulations, season_index=season_index, engine=args.engine, seed=args.seed,
+             ci_width=args.ci_width, exact=args.exact, max_outcomes=args.max_outcomes,
+             sos_csv=sos_csv, output_json=output_json)
@@ -4,72 +4,70 @@ import math
 import os
 from collections import defaultdict
 
+from league_data import read_rows
+
 
 def read_teams(teams_csv_path):
     teams = {}
-    with open(teams_csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Normalize team name keys
-            display_name = (row.get("displayName") or "").strip()
-            team_name = (row.get("teamName") or "").strip()
-            key = display_name or team_name
-            if not key:
-                continue
-
-            # Parse wins/losses/ties
-            def to_int(v):
-                try:
-                    return int(v)
-                except Exception:
-                    return 0
-
-            wins = to_int(row.get("totalWins"))
-            losses = to_int(row.get("totalLosses"))
-            ties = to_int(row.get("totalTies"))
-            gp = wins + losses + ties
-
-            # Compute win_pct if possible
-            win_pct_val = None
-            if gp > 0:
-                win_pct_val = (wins + 0.5 * ties) / gp
-            else:
-                # fallback to provided winPct if present and numeric
-                wp = (row.get("winPct") or "").strip()
-                try:
-                    win_pct_val = float(wp)
-                except Exception:
-                    win_pct_val = 0.0
-
-            teams[key] = {
-                "conference": (row.get("conferenceName") or "").strip(),
-                "wins": wins,
-                "losses": losses,
-                "ties": ties,
-                "gp": gp,
-                "win_pct": win_pct_val,
-            }
+    for row in read_rows(teams_csv_path):
+        # Normalize team name keys
+        display_name = (row.get("displayName") or "").strip()
+        team_name = (row.get("teamName") or "").strip()
+        key = display_name or team_name
+        if not key:
+            continue
+
+        # Parse wins/losses/ties
+        def to_int(v):
+            try:
+                return int(v)
+            except Exception:
+                return 0
+
+        wins = to_int(row.get("totalWins"))
+        losses = to_int(row.get("totalLosses"))
+        ties = to_int(row.get("totalTies"))
+        gp = wins + losses + ties
+
+        # Compute win_pct if possible
+        win_pct_val = None
+        if gp > 0:
+            win_pct_val = (wins + 0.5 * ties) / gp
+        else:
+            # fallback to provided winPct if present and numeric
+            wp = (row.get("winPct") or "").strip()
+            try:
+                win_pct_val = float(wp)
+            except Exception:
+                win_pct_val = 0.0
+
+        teams[key] = {
+            "conference": (row.get("conferenceName") or "").strip(),
+            "wins": wins,
+            "losses": losses,
+            "ties": ties,
+            "gp": gp,
+            "win_pct": win_pct_val,
+        }
     return teams
 
 
 def read_games_split(games_csv_path):
     remaining = []
     past = []
-    with open(games_csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            status = (row.get("status") or "").strip()
-            home = (row.get("homeTeam") or "").strip()
-            away = (row.get("awayTeam") or "").strip()
-            if not home or not away:
-                continue
-            if status == "1":
-                remaining.append((home, away))
-            elif status in {"2", "3", "4"}:  # treat these as completed games
-                past.append((home, away))
-            else:
-                # ignore blanks or unknown statuses
-                pass
+    for row in read_rows(games_csv_path):
+        status = (row.get("status") or "").strip()
+        home = (row.get("homeTeam") or "").strip()
+        away = (row.get("awayTeam") or "").strip()
+        if not home or not away:
+            continue
+        if status == "1":
+            remaining.append((home, away))
+        elif status in {"2", "3", "4"}:  # treat these as completed games
+            past.append((home, away))
+        else:
+            # ignore blanks or unknown statuses
+            pass
     return remaining, past
 
 
@@ -5,6 +5,7 @@ import os
 from collections import defaultdict
 
 from common import to_int, norm_rank, mean_safe
+from league_data import GAME_KEYS, index_rows, read_rows, season_indexes
 
 DEFAULT_SEASON_INDEX = 2
 
@@ -47,25 +48,21 @@ def compute_strength_score(row, w_off=0.4, w_def=0.4, w_rank=0.2):
 def read_latest_rankings(rankings_csv_path, season_index):
     # Keep latest by (seasonIndex, stageIndex, weekIndex) for target season only
     latest = {}
-    with open(rankings_csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = (row.get("team") or "").strip()
-            if not team:
-                continue
-            si = to_int(row.get("seasonIndex"), -1)
-            sti = to_int(row.get("stageIndex"), -1)
-            if si != season_index:
-                continue
-            key = team
-            wi = to_int(row.get("weekIndex"), -1)
-            cur_key = (si, sti, wi)
-            prev = latest.get(key)
-            if prev is None:
+    for row in index_rows(rankings_csv_path, *GAME_KEYS).select(season_index):
+        team = (row.get("team") or "").strip()
+        if not team:
+            continue
+        si = to_int(row.get("seasonIndex"), -1)
+        sti = to_int(row.get("stageIndex"), -1)
+        key = team
+        wi = to_int(row.get("weekIndex"), -1)
+        cur_key = (si, sti, wi)
+        prev = latest.get(key)
+        if prev is None:
+            latest[key] = (cur_key, row)
+        else:
+            if cur_key > prev[0]:
                 latest[key] = (cur_key, row)
-            else:
-                if cur_key > prev[0]:
-                    latest[key] = (cur_key, row)
 
     # Compute strength score per team
     scores = {}
@@ -79,79 +76,64 @@ def read_latest_rankings(rankings_csv_path, season_index):
 def read_games_split(games_csv_path, season_index):
     remaining = []
     past = []
-    with open(games_csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            si = to_int(row.get("seasonIndex"), -1)
-            sti = to_int(row.get("stageIndex"), -1)
-            if si != season_index or sti != 1:
-                continue
-            status = (row.get("status") or "").strip()
-            home = (row.get("homeTeam") or "").strip()
-            away = (row.get("awayTeam") or "").strip()
-            if not home or not away:
-                continue
-            if status == "1":
-                remaining.append((home, away))
-            elif status in {"2", "3", "4"}:  # completed
-                past.append((home, away))
-            else:
-                # ignore other/blank
-                pass
+    for row in index_rows(games_csv_path, *GAME_KEYS).select(season_index, 1):
+        status = (row.get("status") or "").strip()
+        home = (row.get("homeTeam") or "").strip()
+        away = (row.get("awayTeam") or "").strip()
+        if not home or not away:
+            continue
+        if status == "1":
+            remaining.append((home, away))
+        elif status in {"2", "3", "4"}:  # completed
+            past.append((home, away))
+        else:
+            # ignore other/blank
+            pass
     return remaining, past
 
 
 def read_teams_info(teams_csv_path, games_csv_path, season_index):
     info = {}
-    with open(teams_csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            display_name = (row.get("displayName") or "").strip()
-            team_name = (row.get("teamName") or "").strip()
-            key = display_name or team_name
-            if not key:
-                continue
-
-            info[key] = {
-                "conference": (row.get("conferenceName") or "").strip(),
-                "W": 0,
-                "L": 0,
-                "T": 0,
-            }
+    for row in read_rows(teams_csv_path):
+        display_name = (row.get("displayName") or "").strip()
+        team_name = (row.get("teamName") or "").strip()
+        key = display_name or team_name
+        if not key:
+            continue
+
+        info[key] = {
+            "conference": (row.get("conferenceName") or "").strip(),
+            "W": 0,
+            "L": 0,
+            "T": 0,
+        }
     
-    with open(games_csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            si = to_int(row.get("seasonIndex"), -1)
-            sti = to_int(row.get("stageIndex"), -1)
-            if si != season_index or sti != 1:
-                continue
+    for row in index_rows(games_csv_path, *GAME_KEYS).select(season_index, 1):
+        status = (row.get("status") or "").strip()
+        if status not in {"2", "3", "4"}:
+            continue
             
-            status = (row.get("status") or "").strip()
-            if status not in {"2", "3", "4"}:
-                continue
+        home = (row.get("homeTeam") or "").strip()
+        away = (row.get("awayTeam") or "").strip()
             
-            home = (row.get("homeTeam") or "").strip()
-            away = (row.get("awayTeam") or "").strip()
+        if not home or not away:
+            continue
             
-            if not home or not away:
-                continue
+        if home not in info or away not in info:
+            continue
             
-            if home not in info or away not in info:
-                continue
+        home_score = to_int(row.get("homeScore"), 0)
+        away_score = to_int(row.get("awayScore"), 0)
             
-            home_score = to_int(row.get("homeScore"), 0)
-            away_score = to_int(row.get("awayScore"), 0)
-            
-            if home_score > away_score:
-                info[home]["W"] += 1
-                info[away]["L"] += 1
-            elif away_score > home_score:
-                info[away]["W"] += 1
-                info[home]["L"] += 1
-            else:
-                info[home]["T"] += 1
-                info[away]["T"] += 1
+        if home_score > away_score:
+            info[home]["W"] += 1
+            info[away]["L"] += 1
+        elif away_score > home_score:
+            info[away]["W"] += 1
+            info[home]["L"] += 1
+        else:
+            info[home]["T"] += 1
+            info[away]["T"] += 1
     
     return info
 
@@ -233,32 +215,10 @@ def write_output(results, output_path):
             writer.writerow(row)
 
 
-def main(argv=None):
-    parser = argparse.ArgumentParser(description="Compute strength of schedule using rankings-based power scores")
-    parser.add_argument("--season-index", type=int, default=DEFAULT_SEASON_INDEX, help="Season index to analyze")
-    parser.add_argument("--rankings-csv", default="MEGA_rankings.csv", help="Path to rankings CSV")
-    parser.add_argument("--games-csv", default="MEGA_games.csv", help="Path to games CSV")
-    parser.add_argument("--teams-csv", default="MEGA_teams.csv", help="Path to teams CSV")
-    parser.add_argument("--out-csv", default=None, help="Output CSV path (default: output/ranked_sos_by_conference_season{N}.csv, where N = seasonIndex + 1)")
-    args = parser.parse_args(argv)
-
-    base_dir = os.getcwd()
-    rankings_csv = os.path.join(base_dir, args.rankings_csv)
-    games_csv = os.path.join(base_dir, args.games_csv)
-    teams_csv = os.path.join(base_dir, args.teams_csv)
-    season_label = args.season_index + 1
-    if args.out_csv:
-        output_csv = os.path.join(base_dir, args.out_csv)
-    else:
-        output_csv = os.path.join(
-            base_dir,
-            "output",
-            f"ranked_sos_by_conference_season{season_label}.csv",
-        )
-
-    strength_scores = read_latest_rankings(rankings_csv, args.season_index)
-    remaining, past = read_games_split(games_csv, args.season_index)
-    teams_info = read_teams_info(teams_csv, games_csv, args.season_index)
+def run_season(season_index, rankings_csv, games_csv, teams_csv, output_csv):
+    strength_scores = read_latest_rankings(rankings_csv, season_index)
+    remaining, past = read_games_split(games_csv, season_index)
+    teams_info = read_teams_info(teams_csv, games_csv, season_index)
     results = compute_ranked_sos(teams_info, strength_scores, remaining, past)
     write_output(results, output_csv)
 
@@ -268,7 +228,7 @@ def main(argv=None):
         by_conf[r.get("conference", "")].append(r)
 
     for conf in sorted(by_conf.keys()):
-        print(f"\n{conf} — top 5 by ranked SoS avg (seasonIndex={args.season_index}):")
+        print(f"\n{conf} — top 5 by ranked SoS avg (seasonIndex={season_index}):")
         top5 = sorted(by_conf[conf], key=lambda x: -x["ranked_sos_avg"])[:5]
         for row in top5:
             print(
@@ -278,5 +238,42 @@ def main(argv=None):
             )
 
 
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compute strength of schedule using rankings-based power scores")
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument("--season-index", type=int, default=DEFAULT_SEASON_INDEX, help="Season index to analyze")
+    which.add_argument("--seasons", help="'all', or comma-separated season indexes, to analyze in one run (each to its default output path except as --out-csv says)")
+    parser.add_argument("--rankings-csv", default="MEGA_rankings.csv", help="Path to rankings CSV")
+    parser.add_argument("--games-csv", default="MEGA_games.csv", help="Path to games CSV")
+    parser.add_argument("--teams-csv", default="MEGA_teams.csv", help="Path to teams CSV")
+    parser.add_argument("--out-csv", default=None, help="Output CSV path (default: output/ranked_sos_by_conference_season{N}.csv, where N = seasonIndex + 1); "
+                             "with --seasons it applies to the last season listed")
+    args = parser.parse_args(argv)
+
+    base_dir = os.getcwd()
+    rankings_csv = os.path.join(base_dir, args.rankings_csv)
+    games_csv = os.path.join(base_dir, args.games_csv)
+    teams_csv = os.path.join(base_dir, args.teams_csv)
+    if args.seasons is None:
+        seasons = [args.season_index]
+    else:
+        try:
+            seasons = season_indexes(args.seasons, games_csv)
+        except ValueError as e:
+            parser.error(str(e))
+
+    for season_index in seasons:
+        if args.out_csv and season_index == seasons[-1]:
+            output_csv = os.path.join(base_dir, args.out_csv)
+        else:
+            output_csv = os.path.join(
+                base_dir,
+                "output",
+                f"ranked_sos_by_conference_season{season_index + 1}.csv",
+            )
+        run_season(season_index, rankings_csv, games_csv, teams_csv, output_csv)
+
+
 if __name__ == "__main__":
     main()
@@ -4,19 +4,22 @@ Strength of Schedule (SoS) via ELO — parameterized for any season.
 
 CLI contract:
   python3 scripts/calc_sos_elo.py \
-    --season-index N \
-    [--start-row N] \
+    (--season-index N | --seasons all|I,I,...) \
     [--games-csv PATH] [--teams-csv PATH] [--elo-csv PATH] \
     [--include-home-advantage true|false] \
     [--hfa-elo-points N] [--index-scale zscore-mean100-sd15|none] \
     [--out-dir output]
 
-Output paths are derived from --season-index:
+Season N is the regular season (stageIndex 1) of seasonIndex N - 1 in
+MEGA_games.csv. ``--seasons`` takes seasonIndex values, as in the other
+scripts' ``--seasons``, so ``--seasons 2,3`` writes seasons 3 and 4;
+``--seasons all`` computes every season in the export in one process,
+reading MEGA_games.csv, the teams and the ELO table once.
+
+Output paths are derived from the season number:
   output/sos/season{N}_elo.csv
   output/sos/season{N}_elo.json
   output/schedules/season{N}/all_schedules.json
-
-Default --start-row values: season 2 → 287, season 3 → 571, season 4 → 872.
 """
 
 from __future__ import annotations
@@ -26,29 +29,20 @@ import csv
 import json
 import logging
 import os
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List
 
 from common import normalize_team_name, read_elo_map, read_team_meta
+from league_data import GAME_KEYS, index_rows, season_indexes
 
-_DEFAULT_START_ROWS: Dict[int, int] = {
-    2: 287,
-    3: 571,
-    4: 872,
-}
-
+REGULAR_SEASON = 1
 
-def read_games(games_csv: str, start_row: int, season_index: int) -> List[Dict[str, Any]]:
-    """Read the season slice of games from MEGA_games.csv starting near `start_row`.
 
-    Robustness fixes:
-    - Some exports duplicate the header line; DictReader treats the duplicate header as a data row.
-      Relying strictly on a row cut can therefore drop the first real game of the season.
-    - We infer the target `seasonIndex` from the first valid row at or after `start_row`,
-      then include all rows that match that `seasonIndex` (regular season only: stageIndex == 1).
+def read_games(games_csv: str, season_index: int) -> List[Dict[str, Any]]:
+    """Regular-season games of season ``season_index`` (seasonIndex + 1) from MEGA_games.csv.
 
-    Notes:
-    - `start_row` is a 1-based index over DATA rows yielded by DictReader (first data row is 1).
-    - Returns a list of dicts preserving file order for deterministic schedules.
+    Rows come from the ``GAME_KEYS`` index of the export, so a duplicated
+    header line or stray rows of other seasons cannot shift the slice.
+    Returns a list of dicts preserving file order for deterministic schedules.
     """
     needed_cols = {
         "homeTeam",
@@ -60,45 +54,17 @@ def read_games(games_csv: str, start_row: int, season_index: int) -> List[Dict[s
         "weekIndex",
     }
 
-    all_rows: List[Tuple[int, Dict[str, Any]]] = []
-    with open(games_csv, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for idx, row in enumerate(reader, start=1):
-            normalized = {k: row.get(k, "") for k in row.keys()}
-            for col in needed_cols:
-                normalized.setdefault(col, "")
-            all_rows.append((idx, normalized))
-
-    target_season: str | None = None
-    for idx, r in all_rows:
-        if idx >= start_row:
-            si = str(r.get("seasonIndex", "")).strip()
-            if si.isdigit():
-                target_season = si
-                break
-
-    if target_season is None:
-        rows = [r for idx, r in all_rows if idx >= start_row]
-        logging.warning(
-            "Could not infer target seasonIndex at/after row %d; using raw slice with %d rows",
-            start_row,
-            len(rows),
-        )
-        return rows
-
-    rows: List[Dict[str, Any]] = []
-    for idx, r in all_rows:
-        if str(r.get("seasonIndex", "")).strip() == target_season and str(r.get("stageIndex", "")).strip() == "1":
-            rows.append(r)
+    rows = index_rows(games_csv, *GAME_KEYS).select(season_index - 1, REGULAR_SEASON)
+    for row in rows:
+        for col in needed_cols:
+            row.setdefault(col, "")
 
     logging.info(
-        "Season %d slice: %d games from %s (seasonIndex=%s inferred from row %d; start_row arg=%d)",
+        "Season %d slice: %d games from %s (seasonIndex=%d)",
         season_index,
         len(rows),
         games_csv,
-        target_season,
-        next((i for i, _ in all_rows if i >= start_row), start_row),
-        start_row,
+        season_index - 1,
     )
     return rows
 
@@ -314,8 +280,11 @@ def _bool_choice(val: str) -> bool:
 
 def build_arg_parser() -> argparse.ArgumentParser:
     ap = argparse.ArgumentParser(description="SoS via ELO (parameterized by season)")
-    ap.add_argument("--season-index", type=int, required=True, help="Season index to process (e.g. 2 or 3)")
-    ap.add_argument("--start-row", type=int, default=None, help="Row index to start season slice (1-based data row; defaults: season 2=287, season 3=571)")
+    which = ap.add_mutually_exclusive_group(required=True)
+    which.add_argument("--season-index", type=int, help="Season to process, 1-based (seasonIndex + 1; e.g. 2 or 3)")
+    which.add_argument("--seasons", help="'all', or comma-separated season indexes (seasonIndex, not the 1-based "
+                                         "--season-index), to process in one run")
+    ap.add_argument("--start-row", type=int, default=None, help=argparse.SUPPRESS)  # ignored; accepted for the legacy wrappers
     ap.add_argument("--games-csv", default="MEGA_games.csv", help="Path to games CSV (default: MEGA_games.csv)")
     ap.add_argument("--teams-csv", default="MEGA_teams.csv", help="Path to teams CSV (default: MEGA_teams.csv)")
     ap.add_argument("--elo-csv", default="MEGA_elo.csv", help="Path to ELO CSV (default: MEGA_elo.csv)")
@@ -347,32 +316,17 @@ def build_arg_parser() -> argparse.ArgumentParser:
     return ap
 
 
-def main(argv: List[str] | None = None) -> int:
-    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
-    ap = build_arg_parser()
-    args = ap.parse_args(argv)
-
-    season_index: int = args.season_index
-    start_row: int = args.start_row if args.start_row is not None else _DEFAULT_START_ROWS.get(season_index, 1)
-
+def run_season(
+    season_index: int,
+    args: argparse.Namespace,
+    teams_meta: Dict[str, Dict[str, Any]],
+    elo_map: Dict[str, float],
+) -> None:
+    """Compute and write one season's schedules and SoS outputs."""
     logging.info("Starting SoS Season %d ELO calculation", season_index)
-    logging.info(
-        "Args: games_csv=%s teams_csv=%s elo_csv=%s start_row=%d include_home_advantage=%s hfa_elo_points=%d index_scale=%s out_dir=%s",
-        args.games_csv,
-        args.teams_csv,
-        args.elo_csv,
-        start_row,
-        args.include_home_advantage,
-        args.hfa_elo_points,
-        args.index_scale,
-        args.out_dir,
-    )
-
-    games_rows = read_games(args.games_csv, start_row, season_index)
-    teams_meta = read_team_meta(args.teams_csv)
+    games_rows = read_games(args.games_csv, season_index)
     schedules = build_schedules(games_rows, teams_meta)
 
-    elo_map = read_elo_map(args.elo_csv)
     sos_rows = compute_sos_elo(
         schedules,
         elo_map,
@@ -399,6 +353,39 @@ def main(argv: List[str] | None = None) -> int:
         write_outputs(sos_rows, args.out_dir, season_index)
 
     logging.info("Finished Season %d SoS ELO calculation.", season_index)
+
+
+def main(argv: List[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    ap = build_arg_parser()
+    args = ap.parse_args(argv)
+
+    if args.seasons is not None:
+        try:
+            seasons = [si + 1 for si in season_indexes(args.seasons, args.games_csv)]
+        except ValueError as e:
+            ap.error(str(e))
+    else:
+        seasons = [args.season_index]
+    if args.start_row is not None:
+        logging.info("--start-row is no longer needed and is ignored; seasons are selected by seasonIndex")
+
+    logging.info(
+        "Args: seasons=%s games_csv=%s teams_csv=%s elo_csv=%s include_home_advantage=%s hfa_elo_points=%d index_scale=%s out_dir=%s",
+        ",".join(str(s) for s in seasons),
+        args.games_csv,
+        args.teams_csv,
+        args.elo_csv,
+        args.include_home_advantage,
+        args.hfa_elo_points,
+        args.index_scale,
+        args.out_dir,
+    )
+
+    teams_meta = read_team_meta(args.teams_csv)
+    elo_map = read_elo_map(args.elo_csv)
+    for season_index in seasons:
+        run_season(season_index, args, teams_meta, elo_map)
     return 0
 
 
@@ -14,7 +14,9 @@ Usage:
 Prints a sorted breakdown and totals for roster-only Y+1 spend, then adds
 rookie reserve, baseline next-year dead money, and a re-sign reserve estimate.
 """
-import argparse, csv, math, sys
+import argparse, math, sys
+
+from league_data import read_rows
 
 MADDEN_BONUS_PRORATION_MAX_YEARS = 5
 
@@ -142,12 +144,10 @@ def main():
 
     # Load teams
     team_row = None
-    with open(args.teams, newline='') as f:
-        r = csv.DictReader(f)
-        for row in r:
-            if row.get('abbrName') == args.team:
-                team_row = row
-                break
+    for row in read_rows(args.teams):
+        if row.get('abbrName') == args.team:
+            team_row = row
+            break
     if not team_row:
         print(f"Team {args.team} not found in {args.teams}", file=sys.stderr)
         sys.exit(2)
@@ -157,9 +157,7 @@ def main():
     team_name = team_row.get('displayName') or team_row.get('teamName') or args.team
 
     # Load players
-    players = []
-    with open(args.players, newline='') as f:
-        players = list(csv.DictReader(f))
+    players = read_rows(args.players)
 
     # Collect team players by display name in players.csv
     # players.csv uses team full name (e.g., 'Cowboys') not abbr; map from teams.csv displayName
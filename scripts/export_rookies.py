@@ -11,34 +11,35 @@ import csv
 import sys
 from pathlib import Path
 
+from league_data import load_table
+
 
 def export_rookies(input_path: str, output_path: str, year: int):
     """Filter players by rookie year and export to CSV."""
     
     try:
         # Read all players
-        with open(input_path, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.DictReader(f)
-            fieldnames = reader.fieldnames
-            
-            if not fieldnames:
-                print(f"Error: No columns found in {input_path}", file=sys.stderr)
-                sys.exit(1)
-            
-            if 'rookieYear' not in fieldnames:
-                print(f"Error: 'rookieYear' column not found in {input_path}", file=sys.stderr)
-                sys.exit(1)
-            
-            # Filter rookies
-            rookies = []
-            for row in reader:
-                try:
-                    rookie_year = row.get('rookieYear', '').strip()
-                    if rookie_year and int(rookie_year) == year:
-                        rookies.append(row)
-                except (ValueError, TypeError):
-                    # Skip rows with invalid rookieYear
-                    continue
+        players = load_table(input_path, 'utf-8-sig')
+        fieldnames = players.fieldnames
+        
+        if not fieldnames:
+            print(f"Error: No columns found in {input_path}", file=sys.stderr)
+            sys.exit(1)
+        
+        if 'rookieYear' not in fieldnames:
+            print(f"Error: 'rookieYear' column not found in {input_path}", file=sys.stderr)
+            sys.exit(1)
+        
+        # Filter rookies
+        rookies = []
+        for row in players.rows():
+            try:
+                rookie_year = row.get('rookieYear', '').strip()
+                if rookie_year and int(rookie_year) == year:
+                    rookies.append(row)
+            except (ValueError, TypeError):
+                # Skip rows with invalid rookieYear
+                continue
         
         # Write rookies to output
         output_dir = Path(output_path).parent
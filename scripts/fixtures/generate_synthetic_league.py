@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Synthetic league generator, for testing how the pipeline scales.
+
+Writes full-size MEGA exports for any number of seasons, players and
+leagues, resampled from the checked-in ``MEGA_*.csv`` files so that columns,
+value formats and distributions match the real ones:
+
+- MEGA_games.csv: each past season replays the schedule of one of the real
+  completed seasons, and the last season replays the current one, played up
+  to ``--current-week``. Scores and statuses are drawn from real completed
+  games.
+- MEGA_rankings.csv: one row per team per played regular-season week, with
+  records and points ranks computed from the generated games.
+- MEGA_players.csv: real player rows drawn at random, with fresh ids and
+  recombined names. Ratings, contracts and free-agent share follow the
+  real pool.
+- Stat CSVs: about as many rows per position, relative to rostered players,
+  as the real exports, with stat lines drawn from real players at the
+  same position. A few players get a second row for another team, at the
+  real rate of traded players.
+- MEGA_teams.csv and MEGA_elo.csv are copied, moved to the last season,
+  so each league directory holds a complete set of inputs.
+
+Each league goes in its own directory, ``<out>/<league>/``.
+
+Usage:
+  python3 scripts/fixtures/generate_synthetic_league.py --seasons 12 --players 6000
+  python3 scripts/fixtures/generate_synthetic_league.py --leagues 3 --out output/synthetic
+
+No external dependencies. The same ``--seed`` gives the same files.
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import random
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_OUT = os.path.join("output", "synthetic")
+STAT_FILES = (
+    "MEGA_passing.csv", "MEGA_rushing.csv", "MEGA_receiving.csv",
+    "MEGA_defense.csv", "MEGA_kicking.csv", "MEGA_punting.csv",
+)
+COMPLETED_STATUSES = {"2", "3", "4"}
+REGULAR_SEASON = "1"
+
+Rows = List[Dict[str, str]]
+
+
+def read_csv(path: str) -> Tuple[List[str], Rows]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.DictReader(fh)
+        return list(reader.fieldnames or []), list(reader)
+
+
+def write_csv(path: str, fieldnames: List[str], rows: Rows) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class Source:
+    """The real exports the synthetic leagues are drawn from."""
+
+    def __init__(self, root: str = ROOT):
+        self.root = root
+        self.games_fields, games = read_csv(os.path.join(root, "MEGA_games.csv"))
+        self.rankings_fields, _ = read_csv(os.path.join(root, "MEGA_rankings.csv"))
+        self.players_fields, self.players = read_csv(os.path.join(root, "MEGA_players.csv"))
+        self.teams_fields, self.teams = read_csv(os.path.join(root, "MEGA_teams.csv"))
+        self.stats = {name: read_csv(os.path.join(root, name)) for name in STAT_FILES}
+
+        by_season: Dict[int, Rows] = defaultdict(list)
+        for g in games:
+            by_season[int(g["seasonIndex"])].append(g)
+        self.current_schedule = by_season.pop(max(by_season))
+        self.past_schedules = [by_season[s] for s in sorted(by_season)]
+        played = [g for g in games if g["status"] in COMPLETED_STATUSES]
+        self.scores = [(g["homeScore"], g["awayScore"]) for g in played]
+        self.statuses = [g["status"] for g in played]
+        self.current_week = int(self.teams[0]["weekIndex"])
+        self.season_index = int(self.teams[0]["seasonIndex"])
+        self.first_names = [p["firstName"] for p in self.players if p["firstName"]]
+        self.last_names = [p["lastName"] for p in self.players if p["lastName"]]
+
+
+def generate_games(src: Source, rng: random.Random, league: str, seasons: int,
+                   current_week: int) -> Rows:
+    games: Rows = []
+    next_id = 1
+    for season in range(seasons):
+        last = season == seasons - 1
+        schedule = src.current_schedule if last else src.past_schedules[season % len(src.past_schedules)]
+        for template in schedule:
+            g = dict(template, id=str(next_id), gameId=str(500000000 + next_id),
+                     league=league, seasonIndex=str(season))
+            next_id += 1
+            if not last:
+                played = True
+            elif template["stageIndex"] == REGULAR_SEASON:
+                played = int(template["weekIndex"]) < current_week
+            else:
+                played = template["status"] in COMPLETED_STATUSES
+            if played:
+                g["homeScore"], g["awayScore"] = rng.choice(src.scores)
+                g["status"] = rng.choice(src.statuses)
+            else:
+                g["homeScore"] = g["awayScore"] = "0"
+                g["status"] = "1"
+            games.append(g)
+    return games
+
+
+def _rank(values: Dict[str, float], rng: random.Random, descending: bool = True) -> Dict[str, int]:
+    teams = sorted(values, key=lambda t: (-values[t] if descending else values[t], rng.random()))
+    return {t: i + 1 for i, t in enumerate(teams)}
+
+
+def generate_rankings(games: Rows, teams: List[str], rng: random.Random) -> Rows:
+    """Weekly power rankings computed from the played regular-season games."""
+    rows: Rows = []
+    by_week: Dict[Tuple[int, int], Rows] = defaultdict(list)
+    for g in games:
+        if g["stageIndex"] == REGULAR_SEASON and g["status"] in COMPLETED_STATUSES:
+            by_week[(int(g["seasonIndex"]), int(g["weekIndex"]))].append(g)
+
+    record: Dict[str, Counter] = {}
+    prev_rank: Dict[str, int] = {}
+    season_seen = None
+    for season, week in sorted(by_week):
+        if season != season_seen:
+            season_seen = season
+            record = {t: Counter() for t in teams}
+            prev_rank = dict.fromkeys(teams, 0)
+        for g in by_week[(season, week)]:
+            home, away = g["homeTeam"], g["awayTeam"]
+            hs, as_ = int(g["homeScore"] or 0), int(g["awayScore"] or 0)
+            for team, pf, pa in ((home, hs, as_), (away, as_, hs)):
+                r = record.setdefault(team, Counter())
+                r["W" if pf > pa else "L" if pf < pa else "T"] += 1
+                r["PF"] += pf
+                r["PA"] += pa
+        win_pct = {t: (r["W"] + 0.5 * r["T"]) / max(1, r["W"] + r["L"] + r["T"]) for t, r in record.items()}
+        rank = _rank(win_pct, rng)
+        pts_for = _rank({t: r["PF"] for t, r in record.items()}, rng)
+        pts_against = _rank({t: r["PA"] for t, r in record.items()}, rng, descending=False)
+        yard_ranks = {name: _rank({t: rng.random() for t in record}, rng) for name in (
+            "offPassYdsRank", "offRushYdsRank", "offTotalYdsRank",
+            "defPassYdsRank", "defRushYdsRank", "defTotalYdsRank")}
+        for team in sorted(record):
+            r = record[team]
+            row = {
+                "id": str(len(rows) + 1), "team": team, "seasonIndex": str(season),
+                "stageIndex": REGULAR_SEASON, "weekIndex": str(week),
+                "totalLosses": str(r["L"]), "totalTies": str(r["T"]), "totalWins": str(r["W"]),
+                "rank": str(rank[team]), "customRank": "", "prevRank": str(prev_rank[team]),
+                "ptsAgainstRank": str(pts_against[team]), "ptsForRank": str(pts_for[team]),
+            }
+            row.update((name, str(ranks[team])) for name, ranks in yard_ranks.items())
+            rows.append(row)
+        prev_rank = rank
+    return rows
+
+
+def generate_players(src: Source, rng: random.Random, league: str, count: int) -> Rows:
+    players: Rows = []
+    for i in range(count):
+        first, last = rng.choice(src.first_names), rng.choice(src.last_names)
+        players.append(dict(
+            rng.choice(src.players), id=str(1000000000 + i), rosterId=str(550000000 + i),
+            league=league, firstName=first, lastName=last,
+            fullName=f"{first} {last}", cleanName=f"{first} {last}",
+        ))
+    return players
+
+
+def generate_stats(src: Source, rng: random.Random, players: Rows) -> Dict[str, Rows]:
+    """Stat lines for the rostered ``players``, file by file."""
+    teams = {t["displayName"]: t for t in src.teams}
+    rostered = [p for p in players if p["team"] in teams]
+    real_rostered = Counter(p["position"] for p in src.players if p["team"] in teams)
+    by_position: Dict[str, Rows] = defaultdict(list)
+    for p in rostered:
+        by_position[p["position"]].append(p)
+
+    out: Dict[str, Rows] = {}
+    for name, (_, real_rows) in src.stats.items():
+        lines: Dict[str, Rows] = defaultdict(list)
+        for row in real_rows:
+            lines[row["player__position"]].append(row)
+        traded_rate = 1 - len({r["player__rosterId"] for r in real_rows}) / max(1, len(real_rows))
+        rows: Rows = []
+        for position, samples in sorted(lines.items()):
+            pool = by_position.get(position, [])
+            want = round(len(samples) * len(pool) / max(1, real_rostered[position]))
+            for player in rng.sample(pool, min(want, len(pool))):
+                team_names = [player["team"]]
+                if rng.random() < traded_rate:
+                    team_names.append(rng.choice([t for t in teams if t != player["team"]]))
+                for team_name in team_names:
+                    team = teams[team_name]
+                    rows.append(dict(
+                        rng.choice(samples),
+                        team__displayName=team_name, team__abbrName=team["abbrName"],
+                        team__logoId=team["logoId"], player__position=position,
+                        player__rosterId=player["rosterId"], player__fullName=player["fullName"],
+                        player__yearsPro=player["yearsPro"], player__injuryLength=player["injuryLength"],
+                        player__portraitId=player["portraitId"], player__jerseyNum=player["jerseyNum"],
+                    ))
+        rows.sort(key=lambda r: (r["team__displayName"], r["player__position"]))
+        out[name] = rows
+    return out
+
+
+def generate_teams(src: Source, league: str, seasons: int, current_week: int, rankings: Rows) -> Rows:
+    """MEGA_teams.csv moved to the last generated season, with its records."""
+    season = seasons - 1
+    latest = {}
+    for r in rankings:
+        if int(r["seasonIndex"]) == season:
+            latest[r["team"]] = r
+    teams = []
+    for t in src.teams:
+        row = dict(t, league=league, seasonIndex=str(season), weekIndex=str(current_week),
+                   calendarYear=str(int(t["calendarYear"]) - src.season_index + season))
+        rank = latest.get(t["displayName"])
+        if rank:
+            for key in ("totalWins", "totalLosses", "totalTies", "rank", "prevRank"):
+                row[key] = rank[key]
+        teams.append(row)
+    return teams
+
+
+def generate_league(src: Source, out_dir: str, league: str, seasons: int, players: int,
+                    current_week: int, seed: int) -> Dict[str, int]:
+    """Write one league's exports to ``out_dir``; returns rows written per file."""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    games = generate_games(src, rng, league, seasons, current_week)
+    rankings = generate_rankings(games, [t["displayName"] for t in src.teams], rng)
+    roster = generate_players(src, rng, league, players)
+    files = {
+        "MEGA_games.csv": (src.games_fields, games),
+        "MEGA_rankings.csv": (src.rankings_fields, rankings),
+        "MEGA_players.csv": (src.players_fields, roster),
+        "MEGA_teams.csv": (src.teams_fields, generate_teams(src, league, seasons, current_week, rankings)),
+    }
+    for name, rows in generate_stats(src, rng, roster).items():
+        files[name] = (src.stats[name][0], rows)
+    for name, (fields, rows) in files.items():
+        write_csv(os.path.join(out_dir, name), fields, rows)
+    with open(os.path.join(src.root, "mega_elo.csv"), "rb") as fh:
+        elo = fh.read()
+    with open(os.path.join(out_dir, "MEGA_elo.csv"), "wb") as fh:
+        fh.write(elo)
+    return {name: len(rows) for name, (_, rows) in files.items()}
+
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Generate synthetic MEGA exports at configurable sizes")
+    ap.add_argument("--out", default=DEFAULT_OUT, help=f"Output directory (default: {DEFAULT_OUT})")
+    ap.add_argument("--leagues", type=int, default=1, help="Number of leagues (default: 1)")
+    ap.add_argument("--seasons", type=int, default=10, help="Seasons per league (default: 10)")
+    ap.add_argument("--players", type=int, default=None,
+                    help="Players per league (default: as many as MEGA_players.csv)")
+    ap.add_argument("--current-week", type=int, default=None,
+                    help="Regular-season weeks played in the last season (default: as in MEGA_teams.csv)")
+    ap.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    args = ap.parse_args(argv)
+
+    src = Source()
+    players = args.players if args.players is not None else len(src.players)
+    current_week = args.current_week if args.current_week is not None else src.current_week
+    for i in range(args.leagues):
+        league = f"SYN{i + 1}"
+        out_dir = os.path.join(args.out, league)
+        counts = generate_league(src, out_dir, league, args.seasons, players, current_week, args.seed + i)
+        summary = ", ".join(f"{name} {n:,}" for name, n in counts.items())
+        print(f"Wrote {out_dir}: {summary}")
+
+
+if __name__ == "__main__":
+    main()
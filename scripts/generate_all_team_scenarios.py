@@ -1,20 +1,31 @@
 #!/usr/bin/env python3
 import os
 import json
+import hashlib
 import random
+from functools import partial
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 
 from calc_playoff_probabilities import (
     load_data,
     load_rankings_data,
     calculate_team_stats,
-    simulate_remaining_games,
-    determine_playoff_teams,
+    load_season_model,
+    draw_outcome_codes,
+    seed_conference,
+    simulate_bracket,
+    bracket_results,
+    BRACKET_ROUNDS,
+    GameModel,
+    LeagueState,
     TIE_PROBABILITY,
-    check_mathematical_certainty,
+    solve_certainties,
+    status_from_flags,
+    intervals_converged,
+    probability_interval,
     cap_probability,
-    cap_simulation_probability,
 )
 from team_scenario_report import (
     get_remaining_games_for_team,
@@ -23,12 +34,14 @@ from team_scenario_report import (
 )
 
 DEFAULT_NUM_SIMULATIONS = 10000
+SHARD_SIZE = 1000
 
+# Loaded once per worker process by _init_shard_worker
+_SHARD_CONTEXT = None
 
-def run_consolidated_simulations(teams_info, stats, sos_data, games, rankings, num_simulations):
-    all_teams = list(teams_info.keys())
-    
-    team_data = {team: {
+
+def new_team_data(all_teams):
+    return {team: {
         'final_records': Counter(),
         'playoff_by_record': defaultdict(int),
         'division_by_record': defaultdict(int),
@@ -36,73 +49,228 @@ def run_consolidated_simulations(teams_info, stats, sos_data, games, rankings, n
         'total_playoffs': 0,
         'total_division': 0,
         'total_bye': 0,
+        **{f'total_{key}': 0 for key in BRACKET_ROUNDS},
         'example_outcomes_by_record': {}
     } for team in all_teams}
+
+
+def run_consolidated_simulations(teams_info, stats, sos_data, games, rankings, num_simulations, progress_every=1000,
+                                 game_model=None):
+    """Simulate the season ``num_simulations`` times, tallying every team by final record.
+    
+    Each simulation is a vector of outcome codes. A team's final record is
+    a slot in a flat per-team array: wins added times (remaining + 1) plus
+    ties added, summed from precomputed per-game contributions. Example
+    outcomes are only built the first time a record turns up. The seeded
+    postseason is played after every simulation and the rounds each team
+    reaches are totalled (see ``simulate_bracket``).
+    """
+    if game_model is None:
+        game_model = GameModel(teams_info, stats, rankings, games)
+    state = LeagueState(teams_info, stats)
+    index = state.index
+    teams = state.teams
+    remaining = game_model.remaining
+    pairs = [(index[e['home']], index[e['away']]) for e in remaining]
+    
+    # Per team: which games it plays and what each outcome code adds to its slot
+    team_games = [[] for _ in teams]
+    for k, (home, away) in enumerate(pairs):
+        team_games[home].append((k, True))
+        team_games[away].append((k, False))
+    slot_deltas = []
+    for i, played in enumerate(team_games):
+        stride = len(played) + 1
+        slot_deltas.append([
+            (k, (1, stride, 0) if is_home else (1, 0, stride)) for k, is_home in played
+        ])
+    slot_counts = [(len(played) + 1) ** 2 for played in team_games]
+    final = [[0] * size for size in slot_counts]
+    playoff = [[0] * size for size in slot_counts]
+    division = [[0] * size for size in slot_counts]
+    bye = [[0] * size for size in slot_counts]
+    examples = [{} for _ in teams]
+    home_probs = game_model.bracket_probabilities(teams)
+    rounds = {key: [0] * len(teams) for key in BRACKET_ROUNDS}
     
     for sim in range(num_simulations):
-        if (sim + 1) % 1000 == 0:
+        if progress_every and (sim + 1) % progress_every == 0:
             print(f"  Simulation {sim + 1:,}/{num_simulations:,}...")
         
-        simulated_games = simulate_remaining_games(teams_info, stats, sos_data, games, rankings)
-        playoff_teams, division_winners, bye_teams = determine_playoff_teams(teams_info, stats, simulated_games)
+        codes = draw_outcome_codes(game_model)
+        state.reset()
+        for (home, away), code in zip(pairs, codes):
+            state.record_game(home, away, code)
+        state.finalize()
         
-        for team in all_teams:
-            conf = teams_info[team]['conference']
-            
-            team_results = {
-                'W': stats[team]['W'],
-                'L': stats[team]['L'],
-                'T': stats[team]['T']
-            }
-            
-            game_outcomes = []
-            for game in simulated_games:
-                if game['home'] == team or game['away'] == team:
-                    is_home = (game['home'] == team)
-                    opponent = game['away'] if is_home else game['home']
-                    
-                    if game.get('is_tie', False):
-                        outcome = 'T'
-                        team_results['T'] += 1
-                    elif game.get('winner') == team:
-                        outcome = 'W'
-                        team_results['W'] += 1
-                    else:
-                        outcome = 'L'
-                        team_results['L'] += 1
-                    
-                    game_outcomes.append({
-                        'opponent': opponent,
-                        'outcome': outcome,
-                        'is_home': is_home
-                    })
-            
-            record_key = f"{team_results['W']}-{team_results['L']}-{team_results['T']}"
-            team_data[team]['final_records'][record_key] += 1
-            
-            made_playoffs = team in playoff_teams[conf]
-            won_division = team in division_winners[conf]
-            got_bye = team in bye_teams[conf]
-            
-            if made_playoffs:
-                team_data[team]['playoff_by_record'][record_key] += 1
-                team_data[team]['total_playoffs'] += 1
-            if won_division:
-                team_data[team]['division_by_record'][record_key] += 1
-                team_data[team]['total_division'] += 1
-            if got_bye:
-                team_data[team]['bye_by_record'][record_key] += 1
-                team_data[team]['total_bye'] += 1
-            
-            if record_key not in team_data[team]['example_outcomes_by_record'] and game_outcomes:
-                team_data[team]['example_outcomes_by_record'][record_key] = game_outcomes
+        in_playoffs, won_division, got_bye = set(), set(), set()
+        conference_seeds = []
+        for conf in state.conf_members:
+            seeds = seed_conference(conf, state, ordered=True)
+            conference_seeds.append(seeds[0])
+            in_playoffs.update(seeds[0])
+            won_division.update(seeds[1])
+            got_bye.update(seeds[2])
+        for key, reached in simulate_bracket(conference_seeds, home_probs, len(teams)).items():
+            for i in reached:
+                rounds[key][i] += 1
+        
+        for i, deltas in enumerate(slot_deltas):
+            slot = 0
+            for k, delta in deltas:
+                slot += delta[codes[k]]
+            final[i][slot] += 1
+            if i in in_playoffs:
+                playoff[i][slot] += 1
+            if i in won_division:
+                division[i][slot] += 1
+            if i in got_bye:
+                bye[i][slot] += 1
+            if slot not in examples[i] and team_games[i]:
+                examples[i][slot] = [
+                    {
+                        'opponent': teams[pairs[k][1] if is_home else pairs[k][0]],
+                        'outcome': 'T' if codes[k] == 0 else 'W' if codes[k] == (1 if is_home else 2) else 'L',
+                        'is_home': is_home,
+                    }
+                    for k, is_home in team_games[i]
+                ]
+    
+    team_data = new_team_data(list(teams_info.keys()))
+    for i, team in enumerate(teams):
+        data = team_data[team]
+        stride = len(team_games[i]) + 1
+        for slot, count in enumerate(final[i]):
+            if not count:
+                continue
+            wins, ties = divmod(slot, stride)
+            losses = len(team_games[i]) - wins - ties
+            record_key = f"{stats[team]['W'] + wins}-{stats[team]['L'] + losses}-{stats[team]['T'] + ties}"
+            data['final_records'][record_key] = count
+            for key, counts in (('playoff_by_record', playoff), ('division_by_record', division), ('bye_by_record', bye)):
+                if counts[i][slot]:
+                    data[key][record_key] = counts[i][slot]
+            if slot in examples[i]:
+                data['example_outcomes_by_record'][record_key] = examples[i][slot]
+        data['total_playoffs'] = sum(playoff[i])
+        data['total_division'] = sum(division[i])
+        data['total_bye'] = sum(bye[i])
+        for key in BRACKET_ROUNDS:
+            data[f'total_{key}'] = rounds[key][i]
     
     return team_data
 
 
-def build_team_scenarios_json(teams_info, stats, sos_data, games, team_data, num_simulations):
+def merge_team_data(target, shard):
+    """Fold one shard's tallies into ``target``; shards must be merged in order."""
+    for team, data in shard.items():
+        merged = target[team]
+        merged['final_records'].update(data['final_records'])
+        for key in ('playoff_by_record', 'division_by_record', 'bye_by_record'):
+            for record, count in data[key].items():
+                merged[key][record] += count
+        for key in ('total_playoffs', 'total_division', 'total_bye') + tuple(f'total_{r}' for r in BRACKET_ROUNDS):
+            merged[key] += data[key]
+        for record, outcomes in data['example_outcomes_by_record'].items():
+            merged['example_outcomes_by_record'].setdefault(record, outcomes)
+    return target
+
+
+def derive_shard_seed(seed, shard_index):
+    """Stable per-shard seed, independent of how shards are spread over workers."""
+    digest = hashlib.sha256(f"{seed}:{shard_index}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def plan_shards(num_simulations, shard_size=SHARD_SIZE):
+    sizes = [shard_size] * (num_simulations // shard_size)
+    if num_simulations % shard_size:
+        sizes.append(num_simulations % shard_size)
+    return sizes
+
+
+def _init_shard_worker():
+    global _SHARD_CONTEXT
+    teams_info, games, sos_data = load_data()
+    stats = calculate_team_stats(teams_info, games)
+    rankings = load_rankings_data()
+    _SHARD_CONTEXT = (teams_info, stats, sos_data, games, rankings, None)
+
+
+def _run_shard(task):
+    shard_seed, size = task
+    random.seed(shard_seed)
+    teams_info, stats, sos_data, games, rankings, game_model = _SHARD_CONTEXT
+    return run_consolidated_simulations(teams_info, stats, sos_data, games, rankings, size, progress_every=None,
+                                        game_model=game_model)
+
+
+def run_sharded_simulations(teams_info, stats, sos_data, games, rankings, num_simulations, seed, workers=1,
+                            ci_width=None, certainty=None, game_model=None):
+    """Split the simulations into fixed-size shards, each seeded from ``seed``.
+    
+    Shards are the same no matter how many workers run them and are merged
+    in shard order, so a given seed gives the same tallies for any worker count.
+    
+    With ``ci_width`` set, shards run ``workers`` at a time and the run stops
+    once every uncertain probability's 95% interval is narrower than
+    ``ci_width`` points (see ``intervals_converged``). The shards used are a
+    prefix of the fixed plan, so the tallies match a fixed run of that length.
+    """
+    global _SHARD_CONTEXT
+    sizes = plan_shards(num_simulations)
+    tasks = [(derive_shard_seed(seed, i), size) for i, size in enumerate(sizes)]
+    team_data = new_team_data(list(teams_info.keys()))
+    round_size = max(workers, 1) if ci_width is not None else len(tasks)
+    
+    if workers <= 1:
+        _SHARD_CONTEXT = (teams_info, stats, sos_data, games, rankings, game_model)
+        run_tasks = partial(map, _run_shard)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker)
+        run_tasks = partial(pool.map, _run_shard)
+    
+    try:
+        done = 0
+        for start in range(0, len(tasks), round_size):
+            for i, shard in enumerate(run_tasks(tasks[start:start + round_size]), start + 1):
+                merge_team_data(team_data, shard)
+                done += sizes[i - 1]
+                print(f"  Shard {i}/{len(tasks)} merged ({done:,}/{num_simulations:,} simulations)...")
+            if ci_width is not None and intervals_converged(playoff_counts(team_data), done, ci_width, certainty):
+                print(f"  Converged after {done:,} simulations (95% intervals < {ci_width:g} pts)")
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    
+    return team_data
+
+
+def playoff_counts(team_data):
+    return {
+        team: {
+            'playoff': data['total_playoffs'],
+            'division': data['total_division'],
+            'bye': data['total_bye'],
+            **{key: data[f'total_{key}'] for key in BRACKET_ROUNDS},
+        }
+        for team, data in team_data.items()
+    }
+
+
+def simulations_run(team_data):
+    """Every simulation records exactly one final record per team."""
+    return sum(next(iter(team_data.values()))['final_records'].values()) if team_data else 0
+
+
+def build_team_scenarios_json(teams_info, stats, sos_data, games, team_data, num_simulations, game_model):
+    # Honour SOURCE_DATE_EPOCH so seeded runs can be reproduced byte for byte
+    source_date_epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    generated_at = datetime.fromtimestamp(int(source_date_epoch), timezone.utc) if source_date_epoch else datetime.now(timezone.utc)
     result = {
-        'generated_at': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'generated_at': generated_at.isoformat().replace('+00:00', 'Z'),
         'num_simulations': num_simulations,
         'teams': {}
     }
@@ -113,7 +281,7 @@ def build_team_scenarios_json(teams_info, stats, sos_data, games, team_data, num
         current_record = f"{stats[team]['W']}-{stats[team]['L']}-{stats[team]['T']}"
         
         remaining_games = get_remaining_games_for_team(team, games)
-        game_probs = calculate_game_probabilities(team, teams_info, stats, remaining_games)
+        game_probs = calculate_game_probabilities(team, teams_info, stats, remaining_games, game_model)
         
         data = team_data[team]
         
@@ -182,6 +350,11 @@ def build_team_scenarios_json(teams_info, stats, sos_data, games, team_data, num
                 'division': round(overall_division, 1),
                 'bye': round(overall_bye, 1)
             },
+            'overall_intervals': {
+                'playoff': probability_interval(data['total_playoffs'], num_simulations),
+                'division': probability_interval(data['total_division'], num_simulations),
+                'bye': probability_interval(data['total_bye'], num_simulations)
+            },
             'record_outcomes': record_outcomes,
             'most_likely': most_likely
         }
@@ -189,18 +362,21 @@ def build_team_scenarios_json(teams_info, stats, sos_data, games, team_data, num
     return result
 
 
-def build_playoff_probabilities_json(teams_info, stats, sos_data, games, team_data, num_simulations):
+def build_playoff_probabilities_json(teams_info, stats, sos_data, games, team_data, num_simulations, certainty_by_team=None):
+    if certainty_by_team is None:
+        certainty_by_team = solve_certainties(teams_info, stats, games)
     results = {}
     
     for team in teams_info:
         conf = teams_info[team]['conference']
         division = teams_info[team]['division']
         
-        certainty = check_mathematical_certainty(team, teams_info, stats, games)
+        flags = certainty_by_team[team]
         
         total_playoffs = team_data[team]['total_playoffs']
         total_division = team_data[team]['total_division']
         total_bye = team_data[team]['total_bye']
+        round_totals = {key: team_data[team][f'total_{key}'] for key in BRACKET_ROUNDS}
         
         playoff_probability = (total_playoffs / num_simulations) * 100 if num_simulations > 0 else 0.0
         division_probability = (total_division / num_simulations) * 100 if num_simulations > 0 else 0.0
@@ -218,41 +394,61 @@ def build_playoff_probabilities_json(teams_info, stats, sos_data, games, team_da
             'division_pct': stats[team]['division_pct'],
             'strength_of_victory': stats[team]['strength_of_victory'],
             'strength_of_schedule': stats[team]['strength_of_schedule'],
-            'playoff_probability': round(cap_probability(playoff_probability, certainty), 1),
-            'division_win_probability': round(cap_simulation_probability(division_probability), 1),
-            'bye_probability': round(cap_simulation_probability(bye_probability), 1),
+            'playoff_probability': round(cap_probability(playoff_probability, status_from_flags(flags)), 1),
+            'division_win_probability': round(cap_probability(division_probability, status_from_flags(flags, 'division')), 1),
+            'bye_probability': round(cap_probability(bye_probability, status_from_flags(flags, 'bye')), 1),
+            'playoff_probability_ci': probability_interval(total_playoffs, num_simulations),
+            'division_win_probability_ci': probability_interval(total_division, num_simulations),
+            'bye_probability_ci': probability_interval(total_bye, num_simulations),
+            **bracket_results(
+                {key: count / num_simulations if num_simulations > 0 else 0.0 for key, count in round_totals.items()},
+                {key: probability_interval(count, num_simulations) for key, count in round_totals.items()},
+                flags,
+            ),
+            'simulations': num_simulations,
             'remaining_sos': float(sos_data[team]['ranked_sos_avg']) if team in sos_data else 0.5,
             'remaining_games': remaining_games,
             'past_sos': teams_info[team]['past_sos'],
-            'clinched': certainty == 'clinched',
-            'eliminated': certainty == 'eliminated',
+            'clinched': flags['clinched'],
+            'eliminated': flags['eliminated'],
+            'clinched_division': flags['clinched_division'],
+            'clinched_bye': flags['clinched_bye'],
         }
     
     return results
 
 
-def main(num_simulations=DEFAULT_NUM_SIMULATIONS, seed=None, generate_markdown=False):
-    if seed is not None:
-        random.seed(seed)
+def main(num_simulations=DEFAULT_NUM_SIMULATIONS, seed=None, generate_markdown=False, workers=1, ci_width=None):
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**63)
+    random.seed(seed)
     
     os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
     teams_info, games, sos_data = load_data()
-    stats = calculate_team_stats(teams_info, games)
     rankings = load_rankings_data()
+    stats, game_model = load_season_model(teams_info, games, rankings)
     
     os.makedirs('output', exist_ok=True)
     
     print("\n" + "="*80)
     print("GENERATING CONSOLIDATED TEAM SCENARIOS")
     print("="*80)
-    print(f"Running {num_simulations:,} simulations (all teams tracked simultaneously)...\n")
+    if ci_width is None:
+        print(f"Running {num_simulations:,} simulations (all teams tracked simultaneously)...")
+    else:
+        print(f"Running up to {num_simulations:,} simulations until every 95% interval is narrower than {ci_width:g} pts...")
+    print(f"Seed: {seed} | Workers: {workers} | Shard size: {SHARD_SIZE:,}\n")
     
-    team_data = run_consolidated_simulations(teams_info, stats, sos_data, games, rankings, num_simulations)
+    certainty = solve_certainties(teams_info, stats, games)
+    team_data = run_sharded_simulations(teams_info, stats, sos_data, games, rankings, num_simulations, seed,
+                                        workers=workers, ci_width=ci_width, certainty=certainty,
+                                        game_model=game_model)
+    num_simulations = simulations_run(team_data)
     
     print("\nBuilding JSON output...")
-    scenarios_json = build_team_scenarios_json(teams_info, stats, sos_data, games, team_data, num_simulations)
-    playoff_probabilities = build_playoff_probabilities_json(teams_info, stats, sos_data, games, team_data, num_simulations)
+    scenarios_json = build_team_scenarios_json(teams_info, stats, sos_data, games, team_data, num_simulations, game_model)
+    playoff_probabilities = build_playoff_probabilities_json(teams_info, stats, sos_data, games, team_data, num_simulations, certainty)
     
     scenarios_path = 'output/team_scenarios.json'
     with open(scenarios_path, 'w', encoding='utf-8') as f:
@@ -271,7 +467,7 @@ def main(num_simulations=DEFAULT_NUM_SIMULATIONS, seed=None, generate_markdown=F
         print("\nGenerating markdown reports (optional)...")
         
         for i, team in enumerate(sorted(teams_info.keys()), 1):
-            md_content = generate_markdown_report(team, teams_info, stats, sos_data, games, rankings, num_simulations)
+            md_content = generate_markdown_report(team, teams_info, stats, sos_data, games, rankings, num_simulations, game_model)
             safe_filename = team.replace(' ', '_').replace('/', '_')
             output_path = f'docs/team_scenarios/{safe_filename}.md'
             
@@ -304,6 +500,14 @@ if __name__ == "__main__":
                        help='Random seed for reproducibility')
     parser.add_argument('--markdown', action='store_true',
                        help='Also generate markdown reports (for backward compatibility)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                       help='Worker processes for the simulation shards (default: 1; results do not depend on it)')
+    parser.add_argument('--ci-width', type=float, default=None,
+                       help='Stop once every 95%% interval is narrower than this many percentage points; '
+                            '-n becomes the upper bound (default: run exactly -n simulations)')
     
     args = parser.parse_args()
-    main(num_simulations=args.simulations, seed=args.seed, generate_markdown=args.markdown)
+    if args.ci_width is not None and args.ci_width <= 0:
+        parser.error('--ci-width must be positive')
+    main(num_simulations=args.simulations, seed=args.seed, generate_markdown=args.markdown, workers=args.workers,
+         ci_width=args.ci_width)
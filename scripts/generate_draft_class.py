@@ -11,12 +11,13 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import csv
 import html
 import os
 import statistics as st
 from collections import Counter, defaultdict
 
+from league_data import read_rows
+
 
 DEV_LABELS = {
     "3": "X-Factor",
@@ -27,8 +28,7 @@ DEV_LABELS = {
 
 
 def read_csv(path: str) -> list[dict]:
-    with open(path, newline="", encoding="utf-8") as fh:
-        return list(csv.DictReader(fh))
+    return read_rows(path)
 
 
 def safe_int(v: str, default: int | None = None) -> int | None:
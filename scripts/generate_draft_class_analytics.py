@@ -16,7 +16,6 @@ from __future__ import annotations
 
 import argparse
 import json
-import csv
 import html
 import os
 import re
@@ -24,6 +23,8 @@ import sys
 import statistics as st
 from collections import Counter
 
+from league_data import read_rows
+
 
 # Internal dev labels (raw).
 DEV_LABELS = {"3": "X-Factor", "2": "Superstar", "1": "Star", "0": "Normal"}
@@ -60,9 +61,7 @@ def read_csv(path: str) -> list[dict]:
     - Raises a clear error message on failure
     """
     try:
-        with open(path, newline="", encoding="utf-8-sig") as fh:
-            reader = csv.DictReader(fh)
-            return list(reader)
+        return read_rows(path, "utf-8-sig")
     except FileNotFoundError:
         print(f"error: file not found: {path}", file=sys.stderr)
         sys.exit(2)
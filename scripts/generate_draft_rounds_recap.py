@@ -10,19 +10,18 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import csv
 import html
 import os
 import sys
 
+from league_data import read_rows
+
 DEV_LABELS = {"3": "X-Factor", "2": "Superstar", "1": "Star", "0": "Normal"}
 
 
 def read_csv(path: str) -> list[dict]:
     try:
-        with open(path, newline="", encoding="utf-8-sig") as fh:
-            reader = csv.DictReader(fh)
-            return list(reader)
+        return read_rows(path, "utf-8-sig")
     except FileNotFoundError:
         print(f"error: file not found: {path}", file=sys.stderr)
         sys.exit(2)
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import subprocess
 from pathlib import Path
@@ -228,8 +229,9 @@ def run_aggregation_script():
         else:
             print(f"⚠ {name} aggregation script not found, skipping")
 
-def main():
-    run_aggregation_script()
+def main(aggregate=True):
+    if aggregate:
+        run_aggregation_script()
     
     categories = categorize_files()
     
@@ -248,4 +250,7 @@ def main():
         print(f"  {category}: {len(files)} files")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Generate the root index.html from docs/")
+    parser.add_argument("--no-aggregation", action="store_true",
+                        help="Skip re-running the team stats aggregation scripts (the pipeline runs them itself)")
+    main(aggregate=not parser.parse_args().no_aggregation)
@@ -8,17 +8,11 @@ import sys
 from collections import defaultdict
 from datetime import datetime, timezone
 
-SEASON_INDEX = 3
+from calc_playoff_probabilities import DEFAULT_ELO, GameModel
+from league_data import read_rows
+from stat_store import read_stats
 
-HOME_FIELD_ADVANTAGE = 0.02
-WIN_STREAK_THRESHOLD = 3
-WIN_STREAK_BONUS = 0.03
-DIVISIONAL_REGRESSION = 0.15
-ELO_WEIGHT = 0.50
-WIN_PCT_WEIGHT = 0.25
-SOS_WEIGHT = 0.15
-SOV_WEIGHT = 0.10
-DEFAULT_ELO = 1200.0
+SEASON_INDEX = 3
 
 DEF_POSITIONS = frozenset([
     'CB', 'DT', 'FS', 'LEDGE', 'MIKE', 'REDGE', 'SAM', 'SS', 'WILL',
@@ -28,9 +22,7 @@ ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 
 def read_csv(filename):
-    path = os.path.join(ROOT, filename)
-    with open(path, 'r', encoding='utf-8') as f:
-        return list(csv.DictReader(f))
+    return read_rows(os.path.join(ROOT, filename))
 
 
 def load_playoff_teams():
@@ -187,70 +179,23 @@ def compute_team_stats(all_info, games):
     return stats
 
 
-def calculate_sov_rating(defeated, rankings):
-    if not defeated:
-        return 0.5
-    ranks = [rankings.get(opp, 16) for opp in defeated]
-    avg = sum(ranks) / len(ranks)
-    return 1.0 - (avg - 1) / 31
-
-
-def get_streak_modifier(streak):
-    if streak >= WIN_STREAK_THRESHOLD:
-        return WIN_STREAK_BONUS
-    if streak <= -WIN_STREAK_THRESHOLD:
-        return -WIN_STREAK_BONUS
-    return 0.0
-
-
-def compute_win_prob(home, away, teams, elo_map, sos_map, rankings, all_info, team_stats):
-    home_elo = elo_map.get(home, DEFAULT_ELO)
-    away_elo = elo_map.get(away, DEFAULT_ELO)
-    home_elo_norm = max(0, min(1, (home_elo - 1000) / 400))
-    away_elo_norm = max(0, min(1, (away_elo - 1000) / 400))
-
-    home_win_pct = team_stats.get(home, {}).get('win_pct', 0.5)
-    away_win_pct = team_stats.get(away, {}).get('win_pct', 0.5)
-
-    home_sos = sos_map.get(home, 0.5)
-    away_sos = sos_map.get(away, 0.5)
-
-    home_defeated = team_stats.get(home, {}).get('defeated_opponents', [])
-    away_defeated = team_stats.get(away, {}).get('defeated_opponents', [])
-    home_sov = calculate_sov_rating(home_defeated, rankings)
-    away_sov = calculate_sov_rating(away_defeated, rankings)
-
-    home_rating = (
-        home_elo_norm * ELO_WEIGHT
-        + home_win_pct * WIN_PCT_WEIGHT
-        + home_sos * SOS_WEIGHT
-        + home_sov * SOV_WEIGHT
-    )
-    away_rating = (
-        away_elo_norm * ELO_WEIGHT
-        + away_win_pct * WIN_PCT_WEIGHT
-        + away_sos * SOS_WEIGHT
-        + away_sov * SOV_WEIGHT
-    )
-
-    if home_rating + away_rating > 0:
-        prob = home_rating / (home_rating + away_rating)
-    else:
-        prob = 0.5
-
-    prob += HOME_FIELD_ADVANTAGE
-
-    home_streak = all_info.get(home, {}).get('win_streak', 0)
-    away_streak = all_info.get(away, {}).get('win_streak', 0)
-    prob += get_streak_modifier(home_streak)
-    prob -= get_streak_modifier(away_streak)
+def build_game_model(elo_map, sos_map, rankings, all_info, team_stats):
+    """Compile the shared playoff-engine game model from the dashboard inputs."""
+    teams_info = {
+        team: {
+            'division': info['division'],
+            'conference': info['conference'],
+            'win_streak': info['win_streak'],
+            'past_sos': sos_map.get(team, 0.5),
+            'elo': elo_map.get(team, DEFAULT_ELO),
+        }
+        for team, info in all_info.items()
+    }
+    return GameModel(teams_info, team_stats, rankings)
 
-    home_div = all_info.get(home, {}).get('division', '')
-    away_div = all_info.get(away, {}).get('division', '')
-    if home_div == away_div and home_div:
-        prob = prob + (0.5 - prob) * DIVISIONAL_REGRESSION
 
-    return round(max(0.25, min(0.75, prob)), 4)
+def compute_win_prob(home, away, game_model):
+    return round(game_model.home_win_probability(home, away), 4)
 
 
 def load_playoff_games():
@@ -285,7 +230,7 @@ def match_playoff_game(playoff_games, team_a, team_b):
     return None
 
 
-def build_bracket(teams, elo_map, sos_map, rankings, all_info, team_stats, playoff_games):
+def build_bracket(teams, game_model, playoff_games):
     bracket = {}
     for conf in ['AFC', 'NFC']:
         conf_teams = {
@@ -305,9 +250,7 @@ def build_bracket(teams, elo_map, sos_map, rankings, all_info, team_stats, playo
             if not home or not away:
                 continue
 
-            prob = compute_win_prob(
-                home, away, teams, elo_map, sos_map, rankings, all_info, team_stats
-            )
+            prob = compute_win_prob(home, away, game_model)
 
             game = match_playoff_game(playoff_games, home, away)
             status = 'completed' if game and game['completed'] else 'scheduled'
@@ -381,9 +324,7 @@ def build_bracket(teams, elo_map, sos_map, rankings, all_info, team_stats, playo
             if bye:
                 d['byeTeam'] = bye
             if home and away:
-                d['homeWinPct'] = compute_win_prob(
-                    home, away, teams, elo_map, sos_map, rankings, all_info, team_stats
-                )
+                d['homeWinPct'] = compute_win_prob(home, away, game_model)
                 game = match_playoff_game(playoff_games, home, away)
                 if game and game['completed']:
                     d['status'] = 'completed'
@@ -436,9 +377,7 @@ def build_bracket(teams, elo_map, sos_map, rankings, all_info, team_stats, playo
             'winner': None,
         }
         if champ_home and champ_away:
-            champ['homeWinPct'] = compute_win_prob(
-                champ_home, champ_away, teams, elo_map, sos_map, rankings, all_info, team_stats
-            )
+            champ['homeWinPct'] = compute_win_prob(champ_home, champ_away, game_model)
             game = match_playoff_game(playoff_games, champ_home, champ_away)
             if game and game['completed']:
                 champ['status'] = 'completed'
@@ -479,9 +418,7 @@ def build_bracket(teams, elo_map, sos_map, rankings, all_info, team_stats, playo
         'winner': None,
     }
     if sb_home and sb_away:
-        super_bowl['homeWinPct'] = compute_win_prob(
-            sb_home, sb_away, teams, elo_map, sos_map, rankings, all_info, team_stats
-        )
+        super_bowl['homeWinPct'] = compute_win_prob(sb_home, sb_away, game_model)
         game = match_playoff_game(playoff_games, sb_home, sb_away)
         if game and game['completed']:
             super_bowl['status'] = 'completed'
@@ -507,21 +444,21 @@ def load_team_aggregated_stats(playoff_team_names):
         'defForcedFum': 0, 'defFumRec': 0,
     } for t in playoff_team_names}
 
-    for row in read_csv('MEGA_passing.csv'):
+    for row in read_stats('passing', team=playoff_team_names):
         team = row['team__displayName'].strip()
         if team not in agg:
             continue
         agg[team]['passTDs'] += int(row.get('passTotalTDs', 0) or 0)
         agg[team]['passINTs'] += int(row.get('passTotalInts', 0) or 0)
 
-    for row in read_csv('MEGA_rushing.csv'):
+    for row in read_stats('rushing', team=playoff_team_names):
         team = row['team__displayName'].strip()
         if team not in agg:
             continue
         agg[team]['rushTDs'] += int(row.get('rushTotalTDs', 0) or 0)
         agg[team]['rushFumbles'] += int(row.get('rushTotalFum', 0) or 0)
 
-    for row in read_csv('MEGA_defense.csv'):
+    for row in read_stats('defense', team=playoff_team_names):
         team = row['team__displayName'].strip()
         if team not in agg:
             continue
@@ -554,7 +491,7 @@ def load_top_players(playoff_team_names):
 
     best = {t: {} for t in playoff_team_names}
 
-    for row in read_csv('MEGA_passing.csv'):
+    for row in read_stats('passing', team=playoff_team_names):
         team = row['team__displayName'].strip()
         if team not in playoff_team_names:
             continue
@@ -573,7 +510,7 @@ def load_top_players(playoff_team_names):
                 'ovr': get_ovr(team, name),
             }
 
-    for row in read_csv('MEGA_rushing.csv'):
+    for row in read_stats('rushing', team=playoff_team_names):
         team = row['team__displayName'].strip()
         if team not in playoff_team_names:
             continue
@@ -592,7 +529,7 @@ def load_top_players(playoff_team_names):
                 'ovr': get_ovr(team, name),
             }
 
-    for row in read_csv('MEGA_receiving.csv'):
+    for row in read_stats('receiving', team=playoff_team_names):
         team = row['team__displayName'].strip()
         if team not in playoff_team_names:
             continue
@@ -615,7 +552,7 @@ def load_top_players(playoff_team_names):
     LB_POS = {'MIKE', 'SAM', 'WILL'}
     DL_POS = {'DT', 'LEDGE', 'REDGE'}
 
-    for row in read_csv('MEGA_defense.csv'):
+    for row in read_stats('defense', team=playoff_team_names):
         team = row['team__displayName'].strip()
         if team not in playoff_team_names:
             continue
@@ -763,9 +700,8 @@ def main():
             except (ValueError, TypeError):
                 pass
 
-    bracket, super_bowl = build_bracket(
-        teams, elo_map, sos_map, rankings, all_info, team_stats, playoff_games
-    )
+    game_model = build_game_model(elo_map, sos_map, rankings, all_info, team_stats)
+    bracket, super_bowl = build_bracket(teams, game_model, playoff_games)
 
     wc_count = sum(
         len(bracket[c]['wildcard']) for c in bracket
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+In-process cache of the league's CSV exports (MEGA_*.csv and friends).
+
+Each file is parsed once per process into a column-oriented ``Table``; later
+loads of the same path are served from memory as long as the file's size and
+modification time are unchanged. ``run_all.py`` runs its stages in a single
+process, so every stage shares these tables instead of re-parsing the CSVs.
+
+``read_rows`` is a drop-in replacement for ``list(csv.DictReader(f))``: each
+call returns fresh row dicts of strings, so callers may mutate them freely.
+``index_rows`` groups a table's rows by integer key columns, such as
+``GAME_KEYS`` for MEGA_games.csv and MEGA_rankings.csv. The index is built
+once per table, so selecting one season after another does not re-scan the
+file.
+
+The ``MEGA_*.csv`` exports are also kept on disk in a binary columnar form
+under ``output/cache/league_data/``, keyed by a SHA-256 of the CSV bytes.
+The first run that sees a given export converts it; later runs memory-map
+the binary file and decode columns only when they are used. Numeric
+columns are stored as packed int64/float64 buffers (see ``Table.array``)
+and only when every value round-trips to the original text, so rows read
+back from the cache are identical to the CSV.
+
+Binary layout: ``MAGIC``, a little-endian uint64 header length, a JSON
+header describing each column, then 8-byte aligned column segments whose
+offsets in the header are relative to the end of the header. Each
+column has an optional state byte per row (0 value, 1 blank, 2 missing)
+and either a packed numeric buffer or character offsets into a UTF-8 blob.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import fnmatch
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; packed columns fall back to array.array
+    np = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT, "output", "cache", "league_data")
+CACHED_FILES = "MEGA_*.csv"
+MAGIC = b"MEGACOL1"
+FORMAT_VERSION = 1
+
+GAME_KEYS = ("seasonIndex", "stageIndex", "weekIndex")
+
+_VALUE, _BLANK, _MISSING = 0, 1, 2
+_TYPECODES = {int: "q", float: "d"}
+_DTYPES = {int: "<i8", float: "<f8"}
+
+
+class Table:
+    """One CSV file held as a list of string values per column.
+
+    ``column(name)`` returns the values converted to the column's inferred
+    type (int, float or str); blank cells, and cells that do not parse, are
+    ``None`` in int/float columns.
+    """
+
+    def __init__(self, fieldnames: List[str], columns: Dict[str, List[Optional[str]]],
+                 extras: Optional[Dict[int, List[str]]] = None, nrows: Optional[int] = None):
+        self.fieldnames = fieldnames
+        self.columns = columns
+        self.extras = extras or {}
+        self._typed: Dict[str, List[Any]] = {}
+        self._kinds: Dict[str, type] = {}
+        self._indexes: Dict[Tuple[str, ...], RowIndex] = {}
+        if nrows is None:
+            nrows = len(columns[fieldnames[0]]) if fieldnames else 0
+        self.nrows = nrows
+
+    def __len__(self) -> int:
+        return self.nrows
+
+    def kind(self, name: str) -> type:
+        """Inferred type of a column: int, float or str."""
+        if name not in self._kinds:
+            self._kinds[name] = _infer_kind(self.columns[name])
+        return self._kinds[name]
+
+    def column(self, name: str) -> List[Any]:
+        """Values of one column converted to its inferred type."""
+        if name not in self._typed:
+            kind = self.kind(name)
+            values = self.columns[name]
+            self._typed[name] = values if kind is str else [_convert(v, kind) for v in values]
+        return self._typed[name]
+
+    def array(self, name: str):
+        """An int or float column as a packed buffer: a NumPy array when NumPy
+        is installed, otherwise ``array.array``. Blank cells are 0 in int
+        columns and NaN in float columns."""
+        kind = self.kind(name)
+        if kind is str:
+            raise TypeError(f"column {name!r} is not numeric")
+        fill = 0 if kind is int else float("nan")
+        values = array(_TYPECODES[kind], (fill if v is None else v for v in self.column(name)))
+        return np.frombuffer(values, dtype=values.typecode) if np is not None else values
+
+    def rows(self, positions: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Fresh ``csv.DictReader``-style rows (string values), optionally only
+        those at ``positions``."""
+        names = self.fieldnames
+        if positions is None:
+            rows = [dict(zip(names, values)) for values in zip(*(self.columns[n] for n in names))]
+            for i, extra in self.extras.items():
+                rows[i][None] = list(extra)
+            return rows
+        columns = [self.columns[n] for n in names]
+        rows = []
+        for i in positions:
+            row = dict(zip(names, [c[i] for c in columns]))
+            if i in self.extras:
+                row[None] = list(self.extras[i])
+            rows.append(row)
+        return rows
+
+    def index(self, *keys: str) -> RowIndex:
+        """The rows grouped by the integer values of ``keys``, built on first use."""
+        if keys not in self._indexes:
+            self._indexes[keys] = RowIndex(self, keys)
+        return self._indexes[keys]
+
+
+class RowIndex:
+    """Row positions of a ``Table`` grouped by the values of integer key columns.
+
+    Values that do not parse as integers are ``None``. ``select`` takes the
+    leading key values, so with ``GAME_KEYS`` ``select(3, 1)`` is season 3's
+    regular season, and ``values()`` lists the seasons present.
+    """
+
+    def __init__(self, table: Table, keys: Tuple[str, ...]):
+        self.table = table
+        self.keys = keys
+        columns = [table.column(k) if table.kind(k) is int else [_convert(v, int) for v in table.columns[k]]
+                   for k in keys]
+        self.groups: Dict[Tuple[Optional[int], ...], List[int]] = {}
+        for i, key in enumerate(zip(*columns)):
+            self.groups.setdefault(key, []).append(i)
+
+    def positions(self, *prefix: Optional[int]) -> List[int]:
+        """Positions of the rows whose leading keys equal ``prefix``, in file order."""
+        n = len(prefix)
+        if n == len(self.keys):
+            return list(self.groups.get(tuple(prefix), ()))
+        matched = [group for key, group in self.groups.items() if key[:n] == prefix]
+        return matched[0][:] if len(matched) == 1 else sorted(i for group in matched for i in group)
+
+    def select(self, *prefix: Optional[int]) -> List[Dict[str, Any]]:
+        """Fresh rows whose leading keys equal ``prefix``, in file order."""
+        return self.table.rows(self.positions(*prefix))
+
+    def values(self, *prefix: Optional[int]) -> List[int]:
+        """Sorted values of the key after ``prefix`` among the matching rows."""
+        n = len(prefix)
+        return sorted({key[n] for key in self.groups if key[:n] == prefix and key[n] is not None})
+
+
+class MappedTable(Table):
+    """A ``Table`` backed by a memory-mapped binary cache file.
+
+    Columns are decoded from the map on first use; ``array`` returns
+    zero-copy views of packed numeric columns when NumPy is available.
+    """
+
+    def __init__(self, buffer, header: Dict[str, Any], data_start: int):
+        self._buffer = buffer
+        self._start = data_start
+        self._specs = {spec["name"]: spec for spec in header["columns"]}
+        extras = {int(i): values for i, values in header["extras"].items()}
+        super().__init__(header["fieldnames"], _MappedColumns(self), extras, header["nrows"])
+        self._kinds = {spec["name"]: _KINDS[spec["kind"]] for spec in header["columns"]}
+
+    def _segment(self, span) -> memoryview:
+        offset = self._start + span[0]
+        return memoryview(self._buffer)[offset:offset + span[1]]
+
+    def _states(self, spec) -> Optional[bytes]:
+        return bytes(self._segment(spec["state"])) if spec["state"] else None
+
+    def _packed(self, spec):
+        kind = _KINDS[spec["storage"]]
+        offset, length = spec["values"]
+        if np is not None:
+            return np.frombuffer(self._buffer, dtype=_DTYPES[kind],
+                                 count=length // 8, offset=self._start + offset)
+        values = self._segment(spec["values"]).cast(_TYPECODES[kind])
+        if sys.byteorder != "little":
+            values = array(_TYPECODES[kind], values)
+            values.byteswap()
+        return values
+
+    def _decode(self, name: str) -> List[Optional[str]]:
+        spec = self._specs[name]
+        states = self._states(spec)
+        if spec["storage"] == "str":
+            text = bytes(self._segment(spec["values"])).decode("utf-8")
+            bounds = array("q")
+            bounds.frombytes(self._segment(spec["offsets"]))
+            if sys.byteorder != "little":
+                bounds.byteswap()
+            values = [text[a:b] for a, b in zip(bounds, bounds[1:])]
+        else:
+            fmt = str if spec["storage"] == "int" else repr
+            numbers = self._packed(spec).tolist()
+            labels = {v: fmt(v) for v in set(numbers)}
+            values = list(map(labels.__getitem__, numbers))
+        if states is not None:
+            values = [v if st == _VALUE else ("" if st == _BLANK else None)
+                      for v, st in zip(values, states)]
+        return values
+
+    def column(self, name: str) -> List[Any]:
+        spec = self._specs[name]
+        if name in self._typed or spec["storage"] == "str":
+            return super().column(name)
+        values = self._packed(spec).tolist()
+        states = self._states(spec)
+        if states is not None:
+            values = [v if st == _VALUE else None for v, st in zip(values, states)]
+        self._typed[name] = values
+        return values
+
+    def array(self, name: str):
+        spec = self._specs[name]
+        if np is None or spec["storage"] == "str" or spec["state"]:
+            return super().array(name)
+        return self._packed(spec)
+
+
+class _MappedColumns(dict):
+    """String columns of a ``MappedTable``, decoded on first access."""
+
+    def __init__(self, table: MappedTable):
+        super().__init__()
+        self._table = table
+
+    def __missing__(self, name: str) -> List[Optional[str]]:
+        if name not in self._table._specs:
+            raise KeyError(name)
+        values = self[name] = self._table._decode(name)
+        return values
+
+
+_KINDS = {"int": int, "float": float, "str": str}
+_TABLES: Dict[tuple, tuple] = {}
+
+
+def _infer_kind(values: List[Optional[str]]) -> type:
+    kind: type = int
+    for value in set(values):
+        if value is None or value == "":
+            continue
+        if kind is int:
+            try:
+                int(value)
+                continue
+            except ValueError:
+                kind = float
+        try:
+            float(value)
+        except ValueError:
+            return str
+    return kind
+
+
+def _convert(value: Optional[str], kind: type) -> Any:
+    if value is None or value == "":
+        return None
+    try:
+        return kind(value)
+    except ValueError:
+        return None
+
+
+def parse_csv(path: str, encoding: str = "utf-8") -> Table:
+    """Parse a CSV file into a ``Table`` with ``csv.DictReader`` semantics.
+
+    Blank lines are skipped, short rows are padded with ``None`` and any
+    surplus values are kept under the ``None`` key of that row.
+    """
+    with open(path, "r", newline="", encoding=encoding) as f:
+        return _parse_rows(csv.reader(f))
+
+
+def _parse_rows(reader) -> Table:
+    fieldnames = next(reader, [])
+    width = len(fieldnames)
+    cells: List[List[Optional[str]]] = [[] for _ in fieldnames]
+    extras: Dict[int, List[str]] = {}
+    index = 0
+    for row in reader:
+        if not row:
+            continue
+        if len(row) > width:
+            extras[index] = row[width:]
+        for cell, column in zip(row, cells):
+            column.append(cell)
+        for column in cells[len(row):]:
+            column.append(None)
+        index += 1
+    # Duplicate header names keep the last column, as DictReader does
+    columns = dict(zip(fieldnames, cells))
+    return Table(list(dict.fromkeys(fieldnames)), columns, extras, index)
+
+
+def _storage(values: List[Optional[str]], kind: type) -> str:
+    """How a column is stored: packed only if every value round-trips exactly."""
+    if kind is str:
+        return "str"
+    fmt = str if kind is int else repr
+    for value in set(values):
+        if value is None or value == "":
+            continue
+        number = kind(value)
+        if fmt(number) != value or (kind is int and not -2**63 <= number < 2**63):
+            return "str"
+        if kind is float and number == 0 and value.startswith("-"):
+            return "str"  # -0.0 == 0.0, so decoding could not tell them apart
+    return kind.__name__
+
+
+def write_binary(table: Table, path: str) -> None:
+    """Write ``table`` to ``path`` in the binary columnar cache format."""
+    segments: List[bytes] = []
+    specs: List[Dict[str, Any]] = []
+    position = 0
+
+    def add(data: bytes):
+        nonlocal position
+        span = [position, len(data)]
+        segments.append(data + b"\0" * (-len(data) % 8))
+        position += len(segments[-1])
+        return span
+
+    for name in table.fieldnames:
+        values = table.columns[name]
+        kind = table.kind(name)
+        storage = _storage(values, kind)
+        states = bytes(_VALUE if v else (_BLANK if v == "" else _MISSING) for v in values)
+        spec: Dict[str, Any] = {
+            "name": name, "kind": kind.__name__, "storage": storage,
+            "state": add(states) if any(states) else None,
+        }
+        if storage == "str":
+            bounds = array("q", [0])
+            for value in values:
+                bounds.append(bounds[-1] + len(value or ""))
+            if sys.byteorder != "little":
+                bounds.byteswap()
+            spec["values"] = add("".join(v or "" for v in values).encode("utf-8"))
+            spec["offsets"] = add(bounds.tobytes())
+        else:
+            numbers = {v: kind(v) for v in set(values) if v}
+            packed = array(_TYPECODES[kind], [numbers.get(v, 0) for v in values])
+            if sys.byteorder != "little":
+                packed.byteswap()
+            spec["values"] = add(packed.tobytes())
+        specs.append(spec)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "fieldnames": table.fieldnames,
+        "nrows": len(table),
+        "extras": {str(i): values for i, values in table.extras.items()},
+        "columns": specs,
+    }).encode("utf-8")
+    header += b" " * (-len(header) % 8)
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for segment in segments:
+            f.write(segment)
+    os.replace(tmp, path)
+
+
+def read_binary(path: str) -> MappedTable:
+    """Memory-map a binary cache file written by ``write_binary``."""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a league_data cache file")
+    (size,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+    start = len(MAGIC) + 8
+    header = json.loads(buffer[start:start + size])
+    if header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} has an unsupported cache version")
+    return MappedTable(buffer, header, start + size)
+
+
+def _load_cached(path: str, encoding: str) -> Table:
+    """Load an export through the on-disk binary cache, converting it on a miss."""
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    stem = os.path.basename(path)[:-len(".csv")]
+    # Without a BOM both UTF-8 spellings decode alike and can share a file
+    label = "utf-8" if encoding == "utf-8-sig" and not data.startswith(codecs.BOM_UTF8) else encoding
+    prefix = f"{stem}.{label}."
+    binary = os.path.join(CACHE_DIR, f"{prefix}{digest}.col")
+    if os.path.exists(binary):
+        try:
+            return read_binary(binary)
+        except (OSError, ValueError, KeyError, TypeError, struct.error):
+            pass
+    table = _parse_rows(csv.reader(io.StringIO(data.decode(encoding), newline="")))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_binary(table, binary)
+        # Keep only the conversion of the current export
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith(prefix) and name != os.path.basename(binary):
+                os.remove(os.path.join(CACHE_DIR, name))
+    except OSError:
+        pass
+    return table
+
+
+def load_table(path: str, encoding: str = "utf-8") -> Table:
+    """Return the parsed ``Table`` for ``path``, parsing it only when it changed.
+
+    ``MEGA_*.csv`` exports are read through the binary cache in ``CACHE_DIR``.
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), encoding)
+    cached = _TABLES.get(key)
+    if cached is not None and cached[0] == (stat.st_size, stat.st_mtime_ns):
+        return cached[1]
+    if fnmatch.fnmatch(os.path.basename(path), CACHED_FILES):
+        table = _load_cached(path, encoding)
+    else:
+        table = parse_csv(path, encoding)
+    _TABLES[key] = ((stat.st_size, stat.st_mtime_ns), table)
+    return table
+
+
+def read_rows(path: str, encoding: str = "utf-8") -> List[Dict[str, Any]]:
+    """Rows of ``path`` as ``csv.DictReader`` would return them, from the cache."""
+    return load_table(path, encoding).rows()
+
+
+def index_rows(path: str, *keys: str, encoding: str = "utf-8") -> RowIndex:
+    """``RowIndex`` of ``path`` by ``keys`` (default ``GAME_KEYS``), from the cache."""
+    return load_table(path, encoding).index(*(keys or GAME_KEYS))
+
+
+def season_indexes(spec: str, games_csv: str = "MEGA_games.csv") -> List[int]:
+    """Season indexes named by a ``--seasons`` value: ``all`` or a comma-separated list.
+
+    ``all`` is every season with regular-season games in ``games_csv``.
+    Raises ``ValueError`` for anything else.
+    """
+    if spec.strip().lower() == "all":
+        games = index_rows(games_csv, *GAME_KEYS)
+        return [si for si in games.values() if 1 in games.values(si)]
+    try:
+        return [int(v) for v in spec.split(",") if v.strip()]
+    except ValueError:
+        raise ValueError(f"--seasons expects 'all' or season indexes, got {spec!r}") from None
+
+
+def clear() -> None:
+    """Drop every table cached in this process (the binary cache is kept)."""
+    _TABLES.clear()
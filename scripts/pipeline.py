@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Dependency-aware stage runner used by the run_all* orchestrators.
+
+Every ``Stage`` declares the files it reads and the files it writes. A
+stage depends on whichever stages write one of its inputs, so the
+orchestrators only list their stages and the order falls out of the files.
+Stages whose dependencies are done run concurrently on a process pool; with
+``jobs=1`` they run one after another in this process, in declaration order
+where the dependencies allow it.
+
+Parallel stages print their output as one block when they finish, so logs
+from concurrent stages never interleave. After the run the critical path
+(the chain of dependent stages with the largest total time) is reported
+next to the wall time and the summed stage time. Each stage's wall time,
+CPU time and peak RSS are measured (see ``pipeline_profile.py``) and, given
+a profile path, appended to a history of recent runs; ``cprofile_dir``
+additionally dumps a cProfile of every stage that runs.
+
+Given a manifest path, runs are incremental in the style of make: after a
+stage succeeds its fingerprint (content hashes of its inputs, its arguments
+and the source of its script and the repo modules that script imports) is
+stored with the hashes of its outputs. Next time, a stage whose fingerprint
+is unchanged and whose outputs are still as it left them is skipped. Since
+the check is on content, a stage that rewrites identical output does not
+force its dependents to run either.
+"""
+
+from __future__ import annotations
+
+import ast
+import cProfile
+import dataclasses as dc
+import datetime as dt
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from pipeline_profile import UsageMeter, print_profile, record_run, write_hotspots
+from run_utils import ROOT, run_script, run_stage
+
+MANIFEST_PATH = os.path.join(ROOT, 'output', 'cache', 'pipeline_manifest.json')
+MODULE_DIRS = (os.path.join(ROOT, 'scripts'), os.path.join(ROOT, 'stats_scripts'))
+
+
+@dc.dataclass(frozen=True)
+class Stage:
+    name: str
+    script: str
+    description: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    args: Tuple[str, ...] = ()
+    optional: bool = False
+
+
+@dc.dataclass
+class StageResult:
+    stage: Stage
+    success: bool
+    duration: float = 0.0
+    skipped: bool = False
+    up_to_date: bool = False
+    cpu: float = 0.0
+    peak_rss_mb: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if self.up_to_date:
+            return 'up_to_date'
+        if self.skipped:
+            return 'not_run'
+        return 'ran' if self.success else 'failed'
+
+
+def build_graph(stages: Sequence[Stage]) -> Dict[str, Set[str]]:
+    """Map each stage name to the names of the stages it depends on.
+
+    Raises ``ValueError`` for duplicate stage names, for a file written by
+    two stages and for dependency cycles.
+    """
+    writers: Dict[str, str] = {}
+    names: Set[str] = set()
+    for stage in stages:
+        if stage.name in names:
+            raise ValueError(f"duplicate stage name {stage.name!r}")
+        names.add(stage.name)
+        for path in stage.outputs:
+            if path in writers:
+                raise ValueError(f"{path} is written by both {writers[path]!r} and {stage.name!r}")
+            writers[path] = stage.name
+
+    deps = {
+        stage.name: {writers[path] for path in stage.inputs if path in writers} - {stage.name}
+        for stage in stages
+    }
+    topological_order(stages, deps)
+    return deps
+
+
+def topological_order(stages: Sequence[Stage], deps: Dict[str, Set[str]]) -> List[Stage]:
+    """Stages ordered so each follows its dependencies, otherwise in declaration order."""
+    done: Set[str] = set()
+    order: List[Stage] = []
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if deps[stage.name] <= done]
+        if not ready:
+            cycle = ", ".join(stage.name for stage in pending)
+            raise ValueError(f"dependency cycle between stages: {cycle}")
+        stage = ready[0]
+        order.append(stage)
+        done.add(stage.name)
+        pending.remove(stage)
+    return order
+
+
+def critical_path(stages: Sequence[Stage], deps: Dict[str, Set[str]],
+                  durations: Dict[str, float]) -> Tuple[List[str], float]:
+    """The chain of dependent stages with the largest summed duration."""
+    finish: Dict[str, float] = {}
+    previous: Dict[str, Optional[str]] = {}
+    for stage in topological_order(stages, deps):
+        parent = max(deps[stage.name], key=lambda name: finish[name], default=None)
+        previous[stage.name] = parent
+        finish[stage.name] = durations.get(stage.name, 0.0) + (finish[parent] if parent else 0.0)
+    if not finish:
+        return [], 0.0
+    name: Optional[str] = max(finish, key=finish.get)
+    total = finish[name]
+    chain = []
+    while name is not None:
+        chain.append(name)
+        name = previous[name]
+    return chain[::-1], total
+
+
+def content_hash(path: str, memo: Optional[Dict[tuple, str]] = None) -> Optional[str]:
+    """SHA-256 of a file, or of every file under a directory; None if missing.
+
+    ``memo`` caches file hashes by (path, size, mtime) within one run.
+    """
+    if os.path.isdir(path):
+        digest = hashlib.sha256()
+        for folder, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                full = os.path.join(folder, name)
+                digest.update(f"{os.path.relpath(full, path)}\0{content_hash(full, memo)}\0".encode('utf-8'))
+        return digest.hexdigest()
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if memo is not None and key in memo:
+        return memo[key]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    if memo is not None:
+        memo[key] = digest.hexdigest()
+    return digest.hexdigest()
+
+
+def script_sources(script: str) -> List[str]:
+    """``script`` plus every repo module it imports, directly or indirectly."""
+    seen: List[str] = []
+    todo = [os.path.join(ROOT, script)]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.append(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), path)
+        names = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.add(node.module.split('.')[0])
+        for name in names:
+            for folder in (os.path.dirname(path),) + MODULE_DIRS:
+                candidate = os.path.join(folder, f"{name}.py")
+                if os.path.exists(candidate):
+                    todo.append(candidate)
+                    break
+    return sorted(seen)
+
+
+def fingerprint(stage: Stage, memo: Optional[Dict[tuple, str]] = None) -> Dict[str, object]:
+    """What a stage's result depends on: script sources, arguments and inputs."""
+    sources = hashlib.sha256()
+    for path in script_sources(stage.script):
+        sources.update(f"{os.path.relpath(path, ROOT)}\0{content_hash(path, memo)}\0".encode('utf-8'))
+    return {
+        'script': sources.hexdigest(),
+        'args': list(stage.args),
+        'inputs': {path: content_hash(os.path.join(ROOT, path), memo) for path in stage.inputs},
+    }
+
+
+def output_hashes(stage: Stage, memo: Optional[Dict[tuple, str]] = None) -> Dict[str, Optional[str]]:
+    return {path: content_hash(os.path.join(ROOT, path), memo) for path in stage.outputs}
+
+
+def load_manifest(path: str) -> Dict[str, dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: str, manifest: Dict[str, dict]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _execute(stage: Stage, isolated: bool, capture: bool,
+             cprofile_dir: Optional[str] = None) -> Tuple[bool, Dict[str, object], str]:
+    """Run one stage and return (success, resource usage, captured output)."""
+    args = list(stage.args)
+    prof_path = os.path.join(cprofile_dir, f"{stage.name}.prof") if cprofile_dir else None
+    if prof_path:
+        os.makedirs(cprofile_dir, exist_ok=True)
+    buffer = io.StringIO() if capture else None
+    meter = UsageMeter(children=isolated)
+    child: Dict[str, object] = {}
+    with redirect_stdout(buffer or sys.stdout), redirect_stderr(buffer or sys.stderr):
+        meter.start()
+        if isolated:
+            success = run_script(stage.script, stage.description, stage.optional, args, capture=capture,
+                                 interpreter_args=['-m', 'cProfile', '-o', prof_path] if prof_path else None,
+                                 usage=child)
+        elif prof_path:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                success = run_stage(stage.script, stage.description, stage.optional, args)
+            finally:
+                profiler.disable()
+            profiler.dump_stats(prof_path)
+        else:
+            success = run_stage(stage.script, stage.description, stage.optional, args)
+        usage = meter.stop(child.get('rusage'))
+        if prof_path and write_hotspots(prof_path):
+            print(f"cProfile: {os.path.relpath(prof_path, ROOT)} (top functions in .txt)")
+    return success, usage, buffer.getvalue() if buffer else ""
+
+
+def run_pipeline(stages: Sequence[Stage], jobs: Optional[int] = None, isolated: bool = False,
+                 manifest_path: Optional[str] = None, force: bool = False,
+                 profile_path: Optional[str] = None, cprofile_dir: Optional[str] = None) -> List[StageResult]:
+    """Run ``stages`` in dependency order, up to ``jobs`` at a time.
+
+    A stage is not started when one of its dependencies failed. With
+    ``manifest_path`` set, stages that are up to date are skipped unless
+    ``force`` is set. With ``profile_path`` set, the run's per-stage usage
+    is appended to that history file. Results are returned in declaration
+    order.
+    """
+    deps = build_graph(stages)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(stages)))
+    results: Dict[str, StageResult] = {}
+    manifest = load_manifest(manifest_path) if manifest_path else {}
+    fingerprints: Dict[str, Dict[str, object]] = {}
+    memo: Dict[tuple, str] = {}
+    started = dt.datetime.now().isoformat(timespec='seconds')
+    wall_start = time.perf_counter()
+
+    def ready(stage):
+        """Settle ``stage`` without running it if possible; True if it must run."""
+        if any(not results[name].success for name in deps[stage.name]):
+            print(f"\n✗ {stage.description} not run: a stage it depends on failed")
+            results[stage.name] = StageResult(stage, False, skipped=True)
+            return False
+        if not manifest_path:
+            return True
+        fingerprints[stage.name] = fingerprint(stage, memo)
+        entry = manifest.get(stage.name)
+        if (not force and entry is not None
+                and {key: entry.get(key) for key in fingerprints[stage.name]} == fingerprints[stage.name]
+                and entry.get('outputs') == output_hashes(stage, memo)):
+            print(f"\n↷ {stage.description} up to date, skipped")
+            results[stage.name] = StageResult(stage, True, up_to_date=True)
+            return False
+        return True
+
+    def finish(stage, success, usage):
+        results[stage.name] = StageResult(stage, success, usage['wall_seconds'],
+                                          cpu=usage['cpu_seconds'], peak_rss_mb=usage['peak_rss_mb'])
+        if not manifest_path:
+            return
+        outputs = output_hashes(stage, memo)
+        # Only a complete run is recorded; an optional stage that skipped
+        # itself leaves its outputs missing and is retried next time
+        if success and all(outputs.values()):
+            manifest[stage.name] = dict(fingerprints[stage.name], outputs=outputs)
+        else:
+            manifest.pop(stage.name, None)
+        save_manifest(manifest_path, manifest)
+
+    if jobs == 1:
+        for stage in topological_order(stages, deps):
+            if ready(stage):
+                success, usage, _ = _execute(stage, isolated, False, cprofile_dir)
+                finish(stage, success, usage)
+    else:
+        pending = list(stages)
+        running = {}
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            while pending or running:
+                for stage in list(pending):
+                    if not deps[stage.name] <= results.keys():
+                        continue
+                    pending.remove(stage)
+                    if ready(stage):
+                        running[pool.submit(_execute, stage, isolated, True, cprofile_dir)] = stage
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        success, usage, output = future.result()
+                    except Exception as e:
+                        usage = {'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'peak_rss_mb': None}
+                        success, output = False, f"\n✗ {stage.description} crashed its worker: {e}\n"
+                    sys.stdout.write(output)
+                    sys.stdout.flush()
+                    finish(stage, success, usage)
+
+    wall = time.perf_counter() - wall_start
+    durations = {name: result.duration for name, result in results.items()}
+    chain, chain_seconds = critical_path(stages, deps, durations)
+    by_name = {stage.name: stage for stage in stages}
+    print("\n" + "="*80)
+    if chain_seconds:
+        print(f"Critical path ({chain_seconds:.1f}s): " + " → ".join(by_name[name].description for name in chain))
+    print(f"Wall time {wall:.1f}s with {jobs} job(s); {sum(durations.values()):.1f}s of stage time in total")
+    fresh = sum(1 for result in results.values() if result.up_to_date)
+    if fresh:
+        print(f"{fresh} of {len(stages)} stage(s) were up to date and skipped (use --force to rerun them)")
+
+    ordered = [results[stage.name] for stage in stages]
+    stage_usage = [{
+        'name': r.stage.name,
+        'description': r.stage.description,
+        'status': r.status,
+        'wall_seconds': round(r.duration, 3),
+        'cpu_seconds': round(r.cpu, 3),
+        'peak_rss_mb': round(r.peak_rss_mb, 1) if r.peak_rss_mb is not None else None,
+    } for r in ordered]
+    print_profile(stage_usage)
+    if profile_path:
+        record_run(profile_path, {
+            'started': started,
+            'command': ' '.join([os.path.basename(sys.argv[0])] + sys.argv[1:]),
+            'jobs': jobs,
+            'isolated': isolated,
+            'wall_seconds': round(wall, 3),
+            'critical_path': chain if chain_seconds else [],
+            'stages': stage_usage,
+        })
+        print(f"Profile history: {os.path.relpath(profile_path, ROOT)}")
+    return ordered
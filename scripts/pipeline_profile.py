@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Resource accounting for pipeline stages.
+
+``UsageMeter`` measures the wall time, CPU time and peak resident memory of
+one stage. A stage run in-process is measured on this process (plus any
+child processes it waited for): its peak RSS is exact on Linux, where the
+kernel's high-water mark can be reset before each stage, and elsewhere
+falls back to ``ru_maxrss``, which only ever grows, so it reads as the peak
+of the process so far. A stage run with ``--isolated`` is measured on its
+own interpreter, from the rusage ``os.wait4`` returns for that one child.
+
+``record_run`` appends a run to ``output/pipeline_profile.json``, keeping the
+last ``PROFILE_HISTORY`` runs, and ``print_profile`` prints the stages
+slowest first.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import pstats
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from run_utils import ROOT
+
+PROFILE_PATH = os.path.join(ROOT, 'output', 'pipeline_profile.json')
+CPROFILE_DIR = os.path.join(ROOT, 'output', 'profiles')
+PROFILE_HISTORY = 20
+HOTSPOTS = 30
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _maxrss_mb(maxrss: int) -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+
+def _current_peak_rss_mb(reset: bool) -> Optional[float]:
+    if reset:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    if resource is None:
+        return None
+    return _maxrss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _children_rusage():
+    return resource.getrusage(resource.RUSAGE_CHILDREN) if resource is not None else None
+
+
+class UsageMeter:
+    """Wall time, CPU time and peak RSS between ``start`` and ``stop``.
+
+    With ``children`` the stage runs in a child process: pass that child's
+    own rusage (from ``os.wait4``) to ``stop``, and its CPU time and peak
+    RSS are reported whatever other stages ran or finished meanwhile.
+    """
+
+    def __init__(self, children: bool = False):
+        self.children = children
+
+    def start(self) -> None:
+        self._reset = not self.children and _reset_peak_rss()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._child = _children_rusage()
+
+    def stop(self, child=None) -> Dict[str, Any]:
+        usage = {
+            'wall_seconds': time.perf_counter() - self._wall,
+            'cpu_seconds': time.process_time() - self._cpu,
+            'peak_rss_mb': None,
+        }
+        if self.children:
+            if child is not None:
+                usage['cpu_seconds'] += child.ru_utime + child.ru_stime
+                usage['peak_rss_mb'] = _maxrss_mb(child.ru_maxrss) if child.ru_maxrss else None
+            return usage
+        # Subprocesses an in-process stage started and waited for itself
+        after = _children_rusage()
+        if after is not None:
+            usage['cpu_seconds'] += (after.ru_utime + after.ru_stime) - (self._child.ru_utime + self._child.ru_stime)
+        usage['peak_rss_mb'] = _current_peak_rss_mb(self._reset)
+        return usage
+
+
+def write_hotspots(prof_path: str) -> Optional[str]:
+    """Write the top cumulative-time functions of a cProfile dump next to it."""
+    if not os.path.exists(prof_path):
+        return None
+    text_path = os.path.splitext(prof_path)[0] + '.txt'
+    with open(text_path, 'w', encoding='utf-8') as f:
+        pstats.Stats(prof_path, stream=f).sort_stats('cumulative').print_stats(HOTSPOTS)
+    return text_path
+
+
+def record_run(path: str, run: Dict[str, Any], history: int = PROFILE_HISTORY) -> None:
+    """Append ``run`` to the profile history at ``path``, keeping the last ``history`` runs."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            runs = json.load(f).get('runs', [])
+    except (OSError, ValueError, AttributeError):
+        runs = []
+    runs = (runs + [run])[-history:]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'runs': runs}, f, indent=2)
+
+
+def print_profile(stages: List[Dict[str, Any]]) -> None:
+    """Print the stages that ran, slowest first."""
+    ran = sorted((s for s in stages if s['status'] in ('ran', 'failed')),
+                 key=lambda s: s['wall_seconds'], reverse=True)
+    if not ran:
+        return
+    print("\nStage profile (slowest first):")
+    print(f"  {'wall':>7}  {'cpu':>7}  {'peak RSS':>9}  stage")
+    for s in ran:
+        rss = f"{s['peak_rss_mb']:.0f} MB" if s['peak_rss_mb'] is not None else '-'
+        flag = '  ✗' if s['status'] == 'failed' else ''
+        print(f"  {s['wall_seconds']:>6.2f}s  {s['cpu_seconds']:>6.2f}s  {rss:>9}  {s['description']}{flag}")
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Stage declarations shared by the run_all* orchestrators.
+
+Inputs and outputs are paths relative to the repo root. ``pipeline.py``
+derives the run order from them, so a stage's lists must name every file it
+reads that another stage writes.
+"""
+
+import dataclasses as dc
+
+from league_data import season_indexes
+from pipeline import Stage
+
+STAT_CSVS = (
+    'MEGA_passing.csv', 'MEGA_rushing.csv', 'MEGA_receiving.csv',
+    'MEGA_defense.csv', 'MEGA_punting.csv', 'MEGA_kicking.csv',
+)
+RANKED_SOS_CSV = 'output/ranked_sos_by_conference.csv'
+PLAYOFF_JSON = 'output/playoff_probabilities.json'
+SCENARIOS_JSON = 'output/team_scenarios.json'
+STINTS_CSV = 'output/player_team_stints.csv'
+TEAM_STATS_CSV = 'output/team_aggregated_stats.csv'
+
+PLAYER_TEAM_STINTS = Stage(
+    'player_team_stints', 'stats_scripts/build_player_team_stints.py',
+    'Player/Team Stints Summary (Trade-Aware)',
+    inputs=STAT_CSVS + ('MEGA_teams.csv',),
+    outputs=(STINTS_CSV,),
+)
+TEAM_STATS = Stage(
+    'team_stats', 'stats_scripts/aggregate_team_stats.py',
+    'Team Statistics Aggregation',
+    inputs=STAT_CSVS + ('MEGA_teams.csv', STINTS_CSV),
+    outputs=(TEAM_STATS_CSV,),
+)
+# Skips itself (and is retried next run) until the stat store holds a
+# complete rolling window, rather than writing an all-zero table.
+TEAM_ROLLING_STATS = Stage(
+    'team_rolling_stats', 'stats_scripts/aggregate_team_stats.py',
+    'Rolling-Window Team Stats (last 3 weeks of exports)',
+    inputs=('MEGA_passing.csv', 'MEGA_rushing.csv', 'MEGA_receiving.csv', 'MEGA_defense.csv', 'MEGA_teams.csv'),
+    outputs=('output/team_rolling_stats.csv',),
+    args=('--rolling',),
+    optional=True,
+)
+PLAYER_USAGE = Stage(
+    'player_usage', 'stats_scripts/aggregate_player_usage.py',
+    'Player Usage Distribution Analysis',
+    inputs=(STINTS_CSV, 'MEGA_teams.csv', TEAM_STATS_CSV),
+    outputs=('output/team_player_usage.csv',),
+)
+RANKINGS_STATS = Stage(
+    'rankings_stats', 'stats_scripts/aggregate_rankings_stats.py',
+    'Team Rankings & Stats Aggregation',
+    inputs=('MEGA_rankings.csv', 'MEGA_teams.csv', 'MEGA_elo.csv', TEAM_STATS_CSV),
+    outputs=('output/team_rankings_stats.csv',),
+)
+TRADE_STATS = Stage(
+    'trade_stats', 'scripts/verify_trade_stats.py',
+    'Trade Stats Verification (Multi-Team Invariants)',
+    inputs=('MEGA_passing.csv', 'MEGA_rushing.csv', 'MEGA_receiving.csv', TEAM_STATS_CSV, STINTS_CSV),
+    outputs=('output/traded_players_report.csv',),
+)
+
+
+def sos_elo(seasons=None):
+    """SoS (ELO) for ``seasons`` (season indexes, as in MEGA_games.csv) in one run; every season by default."""
+    args = ('--seasons', ','.join(str(si) for si in seasons)) if seasons else ('--seasons', 'all')
+    seasons = [si + 1 for si in (seasons or season_indexes('all'))]
+    return Stage(
+        'sos_elo', 'scripts/calc_sos_elo.py',
+        f"SoS (ELO) Calculation (Seasons {', '.join(str(s) for s in seasons)})",
+        inputs=('MEGA_games.csv', 'MEGA_teams.csv', 'MEGA_elo.csv'),
+        outputs=tuple(
+            path
+            for season in seasons
+            for path in (
+                f'output/sos/season{season}_elo.csv',
+                f'output/sos/season{season}_elo.json',
+                f'output/schedules/season{season}/all_schedules.json',
+            )
+        ),
+        args=args,
+    )
+
+
+def ranked_sos(seasons, out_csv=None, description='Strength of Schedule Calculation'):
+    """Rankings-based SoS for one season index or a list of them (0-based, as in MEGA_games.csv).
+
+    Each season is written to its default path, except that ``out_csv`` takes
+    the last one; a list runs as a single ``--seasons`` invocation.
+    """
+    seasons = [seasons] if isinstance(seasons, int) else list(seasons)
+    if len(seasons) == 1:
+        args = ('--season-index', str(seasons[0]))
+    else:
+        args = ('--seasons', ','.join(str(si) for si in seasons))
+    outputs = [f'output/ranked_sos_by_conference_season{si + 1}.csv' for si in seasons]
+    if out_csv:
+        args += ('--out-csv', out_csv)
+        outputs[-1] = out_csv
+    return Stage(
+        'ranked_sos_season' + '_'.join(str(si + 1) for si in seasons), 'scripts/calc_sos_by_rankings.py',
+        description,
+        inputs=('MEGA_rankings.csv', 'MEGA_games.csv', 'MEGA_teams.csv'),
+        outputs=tuple(outputs),
+        args=args,
+    )
+
+
+PLAYOFF_SCENARIOS = Stage(
+    'playoff_scenarios', 'scripts/generate_all_team_scenarios.py',
+    'Team-by-Team Playoff Scenario Analysis (includes playoff probabilities)',
+    inputs=('MEGA_elo.csv', 'MEGA_rankings.csv', 'MEGA_teams.csv', 'MEGA_games.csv', RANKED_SOS_CSV),
+    outputs=(SCENARIOS_JSON, PLAYOFF_JSON),
+)
+PLAYOFF_SCENARIOS_MARKDOWN = dc.replace(
+    PLAYOFF_SCENARIOS,
+    outputs=PLAYOFF_SCENARIOS.outputs + ('docs/team_scenarios',),
+    args=('--markdown',),
+)
+PLAYOFF_RACE_TABLE = Stage(
+    'playoff_race_table', 'scripts/playoff_race_table.py',
+    'Playoff Race Table (AFC/NFC Double-Column)',
+    inputs=('MEGA_rankings.csv', 'MEGA_elo.csv', 'MEGA_teams.csv', 'MEGA_games.csv', RANKED_SOS_CSV, PLAYOFF_JSON),
+    outputs=('docs/playoff_race_table.html',),
+)
+PLAYOFF_RACE_HTML = Stage(
+    'playoff_race_html', 'scripts/playoff_race_html.py',
+    'Playoff Race HTML Report (with embedded table)',
+    inputs=('MEGA_teams.csv', 'MEGA_games.csv', RANKED_SOS_CSV, PLAYOFF_JSON),
+    outputs=('docs/playoff_race.html',),
+)
+TEAM_SCENARIO_HTML = Stage(
+    'team_scenario_html', 'scripts/generate_team_scenario_html.py',
+    'Team Scenario HTML Viewer',
+    inputs=(SCENARIOS_JSON,),
+    outputs=('docs/team_scenarios.html',),
+)
+DRAFT_RACE = Stage(
+    'draft_race', 'scripts/top_pick_race_analysis.py',
+    'Draft Pick Race Analysis & Visualizations',
+    inputs=('MEGA_teams.csv', RANKED_SOS_CSV),
+    outputs=('output/draft_race/draft_race_report.md',),
+    optional=True,
+)
+# The index lists docs/, so it waits for every page the pipeline writes there
+# and also hashes the whole directory, which covers pages added or removed by
+# hand or by other scripts. The aggregations it would otherwise re-run are
+# stages of their own.
+INDEX = Stage(
+    'index', 'scripts/generate_index.py',
+    'Index Page Generation',
+    inputs=('docs/playoff_race_table.html', 'docs/playoff_race.html',
+            'docs/team_scenarios.html', 'docs/team_scenarios', 'docs'),
+    outputs=('index.html',),
+    args=('--no-aggregation',),
+)
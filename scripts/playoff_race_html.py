@@ -5,39 +5,32 @@ import os
 import json
 from collections import defaultdict
 
+from league_data import read_rows
+
 def read_standings(season_index=3):
     teams_div = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            div = row.get('divisionName', '').strip()
-            conf = row.get('conferenceName', '').strip()
-            teams_div[team] = {'division': div, 'conference': conf}
-    
     team_rankings = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            team_rankings[team] = {
-                'rank': int(row['rank']) if row.get('rank') else 99
-            }
+    for row in read_rows('MEGA_teams.csv'):
+        team = row['displayName'].strip()
+        div = row.get('divisionName', '').strip()
+        conf = row.get('conferenceName', '').strip()
+        teams_div[team] = {'division': div, 'conference': conf}
+        team_rankings[team] = {
+            'rank': int(row['rank']) if row.get('rank') else 99
+        }
     
     remaining_opponents = defaultdict(list)
-    with open('MEGA_games.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            status = row.get('status', '').strip()
-            row_season_index = int(row.get('seasonIndex', -1))
-            stage_index = int(row.get('stageIndex', -1))
-            if status == '1' and row_season_index == season_index and stage_index == 1:
-                home = row['homeTeam'].strip()
-                away = row['awayTeam'].strip()
-                week_index = int(row.get('weekIndex', 0))
-                week = week_index + 1
-                remaining_opponents[home].append({'opponent': away, 'week': week})
-                remaining_opponents[away].append({'opponent': home, 'week': week})
+    for row in read_rows('MEGA_games.csv'):
+        status = row.get('status', '').strip()
+        row_season_index = int(row.get('seasonIndex', -1))
+        stage_index = int(row.get('stageIndex', -1))
+        if status == '1' and row_season_index == season_index and stage_index == 1:
+            home = row['homeTeam'].strip()
+            away = row['awayTeam'].strip()
+            week_index = int(row.get('weekIndex', 0))
+            week = week_index + 1
+            remaining_opponents[home].append({'opponent': away, 'week': week})
+            remaining_opponents[away].append({'opponent': home, 'week': week})
 
     with open('output/ranked_sos_by_conference.csv', 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -3,10 +3,11 @@ import argparse
 import csv
 import os
 import json
-import random
 from collections import defaultdict
 from datetime import datetime
 
+from league_data import GAME_KEYS, index_rows, load_table, read_rows, season_indexes
+
 NUM_TEAMS = 32
 
 SB_WEIGHT_WIN_PCT = 0.50
@@ -27,93 +28,76 @@ HOME_BONUS_DIV_LEADER = 0.03
 GAME_WIN_PROB_MIN = 0.30
 GAME_WIN_PROB_MAX = 0.75
 
-SB_PROB_MAX = 45.0
-
 
 def load_power_rankings(season_index=3):
     rankings = {}
     max_week = {}
-    with open('MEGA_rankings.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if int(row.get('seasonIndex', 0)) != season_index:
-                continue
-            team = row['team'].strip()
-            week = int(row.get('weekIndex', 0))
-            rank = int(row.get('rank', 16))
-            if team not in max_week or week > max_week[team]:
-                max_week[team] = week
-                rankings[team] = rank
+    for row in index_rows('MEGA_rankings.csv', *GAME_KEYS).select(season_index):
+        team = row['team'].strip()
+        week = int(row.get('weekIndex', 0))
+        rank = int(row.get('rank', 16))
+        if team not in max_week or week > max_week[team]:
+            max_week[team] = week
+            rankings[team] = rank
     return rankings
 
 def load_elo_data():
     """Load team ELO ratings from MEGA_elo.csv."""
     elo_map = {}
-    with open('MEGA_elo.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        week_col = next((c for c in (reader.fieldnames or []) if c and c.startswith('Week ')), None)
-        for row in reader:
-            team = row.get('Team', '').strip()
-            elo_str = row.get(week_col, '') if week_col else ''
-            if team and elo_str:
-                try:
-                    elo_map[team] = float(elo_str)
-                except ValueError:
-                    elo_map[team] = 1200.0
+    table = load_table('MEGA_elo.csv')
+    week_col = next((c for c in table.fieldnames if c and c.startswith('Week ')), None)
+    for row in table.rows():
+        team = row.get('Team', '').strip()
+        elo_str = row.get(week_col, '') if week_col else ''
+        if team and elo_str:
+            try:
+                elo_map[team] = float(elo_str)
+            except ValueError:
+                elo_map[team] = 1200.0
     for team in elo_map:
         if elo_map[team] == 0:
             elo_map[team] = 1200.0
     return elo_map
 
-def read_standings(season_index=3):
+def read_standings(season_index=3, sos_csv='output/ranked_sos_by_conference.csv'):
     power_rankings = load_power_rankings(season_index=season_index)
     elo_ratings = load_elo_data()
     
     teams_div = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            div = row.get('divisionName', '').strip()
-            conf = row.get('conferenceName', '').strip()
-            logo_id = row.get('logoId', '').strip()
-            logo_url = f'https://cdn.neonsportz.com/teamlogos/256/{logo_id}.png' if logo_id else ''
-            teams_div[team] = {'division': div, 'conference': conf, 'logo_url': logo_url}
-    
     team_rankings = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            streak_val = row.get('winLossStreak', '0')
-            try:
-                streak = int(streak_val)
-                if streak > 127:
-                    streak = streak - 256
-            except (ValueError, TypeError):
-                streak = 0
-            team_rankings[team] = {
-                'rank': int(row['rank']) if row.get('rank') else 99,
-                'ovrRating': int(row['ovrRating']) if row.get('ovrRating') else 85,
-                'winLossStreak': streak
-            }
+    for row in read_rows('MEGA_teams.csv'):
+        team = row['displayName'].strip()
+        div = row.get('divisionName', '').strip()
+        conf = row.get('conferenceName', '').strip()
+        logo_id = row.get('logoId', '').strip()
+        logo_url = f'https://cdn.neonsportz.com/teamlogos/256/{logo_id}.png' if logo_id else ''
+        teams_div[team] = {'division': div, 'conference': conf, 'logo_url': logo_url}
+        
+        streak_val = row.get('winLossStreak', '0')
+        try:
+            streak = int(streak_val)
+            if streak > 127:
+                streak = streak - 256
+        except (ValueError, TypeError):
+            streak = 0
+        team_rankings[team] = {
+            'rank': int(row['rank']) if row.get('rank') else 99,
+            'ovrRating': int(row['ovrRating']) if row.get('ovrRating') else 85,
+            'winLossStreak': streak
+        }
     
     remaining_opponents = defaultdict(list)
-    with open('MEGA_games.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            status = row.get('status', '').strip()
-            row_season_index = int(row.get('seasonIndex', -1))
-            stage_index = int(row.get('stageIndex', -1))
-            if status == '1' and row_season_index == season_index and stage_index == 1:
-                home = row['homeTeam'].strip()
-                away = row['awayTeam'].strip()
-                week_index = int(row.get('weekIndex', 0))
-                week = week_index + 1
-                remaining_opponents[home].append({'opponent': away, 'week': week})
-                remaining_opponents[away].append({'opponent': home, 'week': week})
+    for row in index_rows('MEGA_games.csv', *GAME_KEYS).select(season_index, 1):
+        status = row.get('status', '').strip()
+        if status == '1':
+            home = row['homeTeam'].strip()
+            away = row['awayTeam'].strip()
+            week_index = int(row.get('weekIndex', 0))
+            week = week_index + 1
+            remaining_opponents[home].append({'opponent': away, 'week': week})
+            remaining_opponents[away].append({'opponent': home, 'week': week})
 
-    with open('output/ranked_sos_by_conference.csv', 'r', encoding='utf-8') as f:
+    with open(sos_csv, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         standings = list(reader)
 
@@ -181,90 +165,6 @@ def get_division_leader_prob(team_name, div_teams, probabilities):
 def get_round1_bye_prob(team_name, all_div_leaders, probabilities):
     return probabilities.get(team_name, {}).get('bye_probability', 0)
 
-def calculate_superbowl_prob_elo(playoff_prob, team_elo, conf_playoff_elos, is_top_seed, 
-                                  bye_prob, div_prob):
-    """
-    Calculate Super Bowl probability using ELO-based Monte Carlo tournament simulation.
-    
-    Uses standard ELO win probability formula:
-    P(win) = 1 / (1 + 10^((opponent_elo - team_elo) / 400))
-    
-    Monte Carlo simulation:
-    - Simulates 1000 playoff tournaments
-    - Each round uses ELO-based win probabilities
-    - Higher seeds face weaker opponents (seeding advantage)
-    - Home field advantage applied as ELO boost
-    - Tracks how often team wins Super Bowl
-    
-    Returns probability of winning Super Bowl (0-45%).
-    """
-    if playoff_prob == 0:
-        return 0.0
-    
-    if not conf_playoff_elos or team_elo == 0:
-        return 0.1
-    
-    num_simulations = 1000
-    sb_wins = 0
-    
-    conf_playoff_elos_sorted = sorted(conf_playoff_elos, reverse=True)
-    n_playoff_teams = len(conf_playoff_elos_sorted)
-    
-    home_field_elo_boost = 0
-    if is_top_seed:
-        home_field_elo_boost = 75
-        has_bye = True
-    elif bye_prob > 30:
-        home_field_elo_boost = 75
-        has_bye = True
-    elif div_prob > 50:
-        home_field_elo_boost = 40
-        has_bye = False
-    else:
-        home_field_elo_boost = 0
-        has_bye = False
-    
-    for _ in range(num_simulations):
-        team_alive = True
-        current_round = 1 if not has_bye else 2
-        
-        while team_alive and current_round <= 4:
-            if current_round == 1:
-                lower_half_start = min(3, n_playoff_teams - 1)
-                lower_half_end = min(6, n_playoff_teams - 1)
-                opponent_elo = conf_playoff_elos_sorted[random.randint(lower_half_start, lower_half_end)]
-                team_boost = home_field_elo_boost if div_prob > 50 else 0
-            elif current_round == 2:
-                mid_start = min(2, n_playoff_teams - 1)
-                mid_end = min(5, n_playoff_teams - 1)
-                opponent_elo = conf_playoff_elos_sorted[random.randint(mid_start, mid_end)]
-                team_boost = home_field_elo_boost
-            elif current_round == 3:
-                top_teams = min(4, n_playoff_teams)
-                opponent_elo = sum(conf_playoff_elos_sorted[:top_teams]) / top_teams
-                team_boost = home_field_elo_boost
-            else:
-                opponent_elo = sum(conf_playoff_elos) / len(conf_playoff_elos)
-                team_boost = 0
-            
-            adjusted_team_elo = team_elo + team_boost
-            elo_diff = opponent_elo - adjusted_team_elo
-            win_prob = 1.0 / (1.0 + 10 ** (elo_diff / 400.0))
-            
-            if random.random() < win_prob:
-                current_round += 1
-            else:
-                team_alive = False
-        
-        if team_alive:
-            sb_wins += 1
-    
-    sb_prob_raw = (sb_wins / num_simulations) * 100
-    
-    final_prob = (playoff_prob / 100) * sb_prob_raw
-    
-    return round(max(0.1, min(final_prob, SB_PROB_MAX)), 1)
-
 def get_playoff_tooltip(playoff_prob, team_name, team_data):
     wins = team_data['W']
     losses = team_data['L']
@@ -337,8 +237,8 @@ def get_bye_tooltip(bye_prob, team_name, all_div_leaders, probabilities):
         Только команда с лучшим рекордом в конференции (посев #1) получает бай в первом раунде плей-офф.
     </div>'''
 
-def get_superbowl_tooltip(sb_prob, playoff_prob, div_prob, bye_prob, team_elo, 
-                          playoff_field_size, is_top_seed):
+def get_superbowl_tooltip(sb_prob, prob_data, team_elo):
+    playoff_prob = prob_data.get('playoff_probability', 0)
     if playoff_prob == 0:
         return f'''<div class="prob-tooltip">
             <strong>Вероятность Суперкубка: 0%</strong><br><br>
@@ -354,30 +254,20 @@ def get_superbowl_tooltip(sb_prob, playoff_prob, div_prob, bye_prob, team_elo,
     else:
         tier_desc = "Аутсайдер"
     
-    seed_text = ""
-    if is_top_seed:
-        seed_text = "Топ-сид (бай + домашние игры)"
-    elif bye_prob > 30:
-        seed_text = "Претендент на бай"
-    elif div_prob > 50:
-        seed_text = "Лидер дивизиона"
-    
     return f'''<div class="prob-tooltip">
         <strong>Вероятность Суперкубка: {sb_prob:.1f}%</strong><br><br>
         {tier_desc}<br>
         ELO рейтинг: {team_elo:.0f}<br><br>
-        <b>Метод Монте-Карло (1000 симуляций):</b><br>
-        • Рейтинг команды: {team_elo:.0f}<br>
-        • Соперники в плей-офф: {playoff_field_size} команд<br>
-        • Каждый раунд симулируется по ELO<br>
-        • Учитываются преимущества посева<br>
-        • Высокие сиды играют с более слабыми соперниками<br><br>
-        <b>Статус:</b><br>
+        <b>Метод Монте-Карло ({prob_data.get('simulations', 0):,} симуляций):</b><br>
+        • Сетка плей-офф разыгрывается в каждой симуляции сезона<br>
+        • Посев 1 отдыхает, 2-7, 3-6, 4-5 в уайлд-кард раунде<br>
+        • Высший посев играет дома, Суперкубок на нейтральном поле<br><br>
+        <b>Раунды:</b><br>
         • Плей-офф: {playoff_prob:.0f}%<br>
-        • Победа в див.: {div_prob:.0f}%<br>
-        • Бай 1-го раунда: {bye_prob:.0f}%<br>
-        {f'• {seed_text}<br>' if seed_text else ''}<br>
-        <i>ELO formula: P = 1 / (1 + 10^((opp_elo - team_elo) / 400))</i>
+        • Дивизионный раунд: {prob_data.get('divisional_round_probability', 0):.0f}%<br>
+        • Финал конференции: {prob_data.get('conference_championship_probability', 0):.0f}%<br>
+        • Выход в Суперкубок: {prob_data.get('superbowl_appearance_probability', 0):.0f}%<br>
+        • Победа в Суперкубке: {sb_prob:.1f}%
     </div>'''
 
 def get_rank_class(rank):
@@ -785,26 +675,6 @@ def create_html_table(afc_divs, nfc_divs, probabilities):
             if divs[div_name]:
                 all_div_leaders.append(divs[div_name][0])
         
-        all_conf_teams = []
-        for div_name in divs:
-            all_conf_teams.extend(divs[div_name])
-        
-        conf_playoff_elos = []
-        for team_data in all_conf_teams:
-            team_name = team_data['team']
-            playoff_prob = probabilities.get(team_name, {}).get('playoff_probability', 0)
-            if playoff_prob > 0:
-                conf_playoff_elos.append(team_data.get('elo', 1200.0))
-        
-        top_bye_team = None
-        max_bye_prob = 0
-        for team_data in all_conf_teams:
-            team_name = team_data['team']
-            bye_prob = get_round1_bye_prob(team_name, all_div_leaders, probabilities)
-            if bye_prob > max_bye_prob:
-                max_bye_prob = bye_prob
-                top_bye_team = team_name
-        
         html.append(f'        <div class="conference-section">')
         html.append(f'            <div class="conference-header">{conf_name}</div>')
         html.append('            <table>')
@@ -834,17 +704,13 @@ def create_html_table(afc_divs, nfc_divs, probabilities):
                 div_prob = get_division_leader_prob(team_name, teams, probabilities)
                 bye_prob = get_round1_bye_prob(team_name, all_div_leaders, probabilities)
                 quality_of_wins = team_data.get('past_ranked_sos_avg', 0.5)
-                is_top_seed = (team_name == top_bye_team)
                 win_pct = team_data.get('win_pct', 0.5)
                 past_sos = quality_of_wins
                 win_streak = team_data.get('win_streak', 0)
                 power_rank = team_data.get('power_rank', 16)
                 team_elo = team_data.get('elo', 1200.0)
                 
-                sb_prob = calculate_superbowl_prob_elo(
-                    playoff_prob, team_elo, conf_playoff_elos, is_top_seed,
-                    bye_prob, div_prob
-                )
+                sb_prob = prob_data.get('superbowl_win_probability', 0)
                 
                 sos = team_data['remaining_sos']
                 logo_url = team_data.get('logo_url', '')
@@ -892,10 +758,7 @@ def create_html_table(afc_divs, nfc_divs, probabilities):
                 playoff_tooltip = get_playoff_tooltip(playoff_prob, team_name, team_data)
                 div_tooltip = get_division_tooltip(div_prob, team_name, teams, probabilities)
                 bye_tooltip = get_bye_tooltip(bye_prob, team_name, all_div_leaders, probabilities)
-                sb_tooltip = get_superbowl_tooltip(
-                    sb_prob, playoff_prob, div_prob, bye_prob, team_elo, 
-                    len(conf_playoff_elos), is_top_seed
-                )
+                sb_tooltip = get_superbowl_tooltip(sb_prob, prob_data, team_elo)
                 
                 record_display = f'{team_data["W"]}-{team_data["L"]}-{team_data["T"]}' if team_data["T"] > 0 else f'{team_data["W"]}-{team_data["L"]}'
                 
@@ -983,34 +846,54 @@ def create_html_table(afc_divs, nfc_divs, probabilities):
     
     return '\n'.join(html)
 
-def main(season_index=3):
+def main(season_index=3, batch=False):
+    """Write docs/playoff_race_table.html, or with ``batch`` the season's own
+    docs/playoff_race_table_seasonN.html from the --seasons outputs of
+    calc_sos_by_rankings.py and calc_playoff_probabilities.py (N = seasonIndex + 1).
+    """
     os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    suffix = f'_season{season_index + 1}' if batch else ''
+    output_html = f'docs/playoff_race_table{suffix}.html'
     
     print("Loading playoff probabilities...")
-    with open('output/playoff_probabilities.json', 'r', encoding='utf-8') as f:
+    with open(f'output/playoff_probabilities{suffix}.json', 'r', encoding='utf-8') as f:
         probabilities = json.load(f)
     
     print("Reading standings data...")
-    afc_divs, nfc_divs, teams_div = read_standings(season_index=season_index)
+    afc_divs, nfc_divs, teams_div = read_standings(season_index=season_index,
+                                                   sos_csv=f'output/ranked_sos_by_conference{suffix}.csv')
     
     print("Generating NYT-style table...")
     html_output = create_html_table(afc_divs, nfc_divs, probabilities)
     
     os.makedirs('docs', exist_ok=True)
     
-    with open('docs/playoff_race_table.html', 'w', encoding='utf-8') as f:
+    with open(output_html, 'w', encoding='utf-8') as f:
         f.write(html_output)
     
     print("\n" + "="*80)
     print("PLAYOFF RACE TABLE GENERATED!")
     print("="*80)
     print("\nGenerated file:")
-    print("  ✓ docs/playoff_race_table.html")
+    print(f"  ✓ {output_html}")
     print("\nOpen this file in your browser to view the NYT-style playoff race table!")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Generate playoff race table HTML')
-    parser.add_argument('--season-index', type=int, default=3,
-                        help='Season index to filter games and rankings (default: 3)')
+    which = parser.add_mutually_exclusive_group()
+    which.add_argument('--season-index', type=int, default=3,
+                       help='Season index to filter games and rankings (default: 3)')
+    which.add_argument('--seasons',
+                       help="'all', or comma-separated season indexes, to render in one run from the --seasons "
+                            "outputs of calc_playoff_probabilities.py (docs/playoff_race_table_seasonN.html)")
     args = parser.parse_args()
-    main(season_index=args.season_index)
+    if args.seasons is None:
+        main(season_index=args.season_index)
+    else:
+        os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        try:
+            seasons = season_indexes(args.seasons)
+        except ValueError as e:
+            parser.error(str(e))
+        for season_index in seasons:
+            main(season_index=season_index, batch=True)
@@ -23,6 +23,8 @@ import sys
 from html import escape
 from typing import Iterable
 
+from league_data import read_rows
+
 
 ###############################################################################
 # Basic CSV utilities
@@ -36,9 +38,7 @@ def read_csv(path: str) -> list[dict]:
     """
 
     try:
-        with open(path, newline="", encoding="utf-8-sig") as fh:
-            reader = csv.DictReader(fh)
-            return list(reader)
+        return read_rows(path, "utf-8-sig")
     except FileNotFoundError:
         print(f"error: file not found: {path}", file=sys.stderr)
         sys.exit(2)
@@ -1,40 +1,46 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
 
-from run_utils import run_script
+from pipeline import MANIFEST_PATH, run_pipeline
+from pipeline_profile import CPROFILE_DIR, PROFILE_PATH
+from pipeline_stages import (
+    DRAFT_RACE, INDEX, PLAYER_TEAM_STINTS, PLAYER_USAGE, PLAYOFF_RACE_HTML,
+    PLAYOFF_RACE_TABLE, PLAYOFF_SCENARIOS, RANKED_SOS_CSV, RANKINGS_STATS,
+    TEAM_SCENARIO_HTML, TEAM_ROLLING_STATS, TEAM_STATS, TRADE_STATS, ranked_sos, sos_elo,
+)
 
 
-def main():
+def main(isolated=False, jobs=None, force=False, profile=False):
     os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
     print("\n" + "="*80)
     print("MEGA League Complete Analysis - Full Run")
     print("="*80)
     
-    scripts = [
-        ('stats_scripts/aggregate_team_stats.py', 'Team Statistics Aggregation', False, None),
-        ('stats_scripts/aggregate_player_usage.py', 'Player Usage Distribution Analysis', False, None),
-        ('stats_scripts/aggregate_rankings_stats.py', 'Team Rankings & Stats Aggregation', False, None),
-        ('stats_scripts/build_player_team_stints.py', 'Player/Team Stints Summary (Trade-Aware)', False, None),
-        ('scripts/calc_sos_elo.py', 'Season 2 SoS (ELO) Calculation', False, ['--season-index', '2', '--start-row', '287']),
-        ('scripts/calc_sos_elo.py', 'Season 3 SoS (ELO) Calculation', False, ['--season-index', '3', '--start-row', '571']),
-        ('scripts/calc_sos_elo.py', 'Season 4 SoS (ELO) Calculation', False, ['--season-index', '4', '--start-row', '872']),
-        ('scripts/calc_sos_by_rankings.py', 'Strength of Schedule Calculation (Season 3)', False, ['--season-index', '2']),
-        ('scripts/calc_sos_by_rankings.py', 'Strength of Schedule Calculation (Season 4)', False, ['--season-index', '3', '--out-csv', 'output/ranked_sos_by_conference.csv']),
-        ('scripts/generate_all_team_scenarios.py', 'Team-by-Team Playoff Scenario Analysis (includes playoff probabilities)', False, None),
-        ('scripts/playoff_race_table.py', 'Playoff Race Table (AFC/NFC Double-Column)', False, None),
-        ('scripts/playoff_race_html.py', 'Playoff Race HTML Report (with embedded table)', False, None),
-        ('scripts/generate_team_scenario_html.py', 'Team Scenario HTML Viewer', False, None),
-        ('scripts/top_pick_race_analysis.py', 'Draft Pick Race Analysis & Visualizations', True, None),
-        ('scripts/generate_index.py', 'Index Page Generation', False, None),
-        ('scripts/verify_trade_stats.py', 'Trade Stats Verification (Multi-Team Invariants)', False, None),
+    stages = [
+        PLAYER_TEAM_STINTS,
+        TEAM_STATS,
+        TEAM_ROLLING_STATS,
+        PLAYER_USAGE,
+        RANKINGS_STATS,
+        sos_elo(),
+        ranked_sos([2, 3], RANKED_SOS_CSV, description='Strength of Schedule Calculation (Seasons 3-4)'),
+        PLAYOFF_SCENARIOS,
+        PLAYOFF_RACE_TABLE,
+        PLAYOFF_RACE_HTML,
+        TEAM_SCENARIO_HTML,
+        DRAFT_RACE,
+        INDEX,
+        TRADE_STATS,
     ]
     
-    results = []
-    for script, description, optional, extra_args in scripts:
-        success = run_script(script, description, optional, extra_args)
-        results.append((description, success))
+    # Independent stages run concurrently; each worker runs its stages
+    # in-process so they share the league_data CSV cache
+    stage_results = run_pipeline(stages, jobs=jobs, isolated=isolated, manifest_path=MANIFEST_PATH, force=force,
+                                 profile_path=PROFILE_PATH, cprofile_dir=CPROFILE_DIR if profile else None)
+    results = [(r.stage.description, r.success) for r in stage_results]
     
     print("\n" + "="*80)
     print("SUMMARY")
@@ -60,12 +66,8 @@ def main():
         print("  • scripts/verify_trade_stats.py - Trade stats invariants verified via console")
         print("\n🏈 Playoff Analysis:")
         print("  • output/ranked_sos_by_conference_season3.csv - Strength of schedule data (Season 3)")
-        print("  • output/sos/season2_elo.csv - Season 2 SoS (ELO) table")
-        print("  • output/sos/season2_elo.json - Season 2 SoS (ELO) JSON")
-        print("  • output/sos/season3_elo.csv - Season 3 SoS (ELO) table")
-        print("  • output/sos/season3_elo.json - Season 3 SoS (ELO) JSON")
-        print("  • output/sos/season4_elo.csv - Season 4 SoS (ELO) table")
-        print("  • output/sos/season4_elo.json - Season 4 SoS (ELO) JSON")
+        print("  • output/sos/season{N}_elo.csv - SoS (ELO) table for every season N")
+        print("  • output/sos/season{N}_elo.json - SoS (ELO) JSON for every season N")
         print("  • output/playoff_probabilities.json - Playoff probabilities data")
         print("  • docs/playoff_race_table.html - Interactive playoff race table")
         print("  • docs/playoff_race.html - Full playoff analysis report (with embedded table)")
@@ -85,4 +87,14 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Run the full MEGA League analysis pipeline')
+    parser.add_argument('--isolated', action='store_true',
+                        help='Run every stage in its own Python process instead of in-process')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Stages to run at once (default: CPU count; 1 runs them in order in this process)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rerun every stage, even those whose inputs have not changed since the last run')
+    parser.add_argument('--profile', action='store_true',
+                        help='Also dump cProfile stats for every stage that runs into output/profiles/')
+    args = parser.parse_args()
+    main(isolated=args.isolated, jobs=args.jobs, force=args.force, profile=args.profile)
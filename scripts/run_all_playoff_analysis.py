@@ -1,29 +1,34 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
 
-from run_utils import run_script
+from pipeline import MANIFEST_PATH, run_pipeline
+from pipeline_profile import CPROFILE_DIR, PROFILE_PATH
+from pipeline_stages import (
+    DRAFT_RACE, PLAYOFF_RACE_HTML, PLAYOFF_RACE_TABLE, PLAYOFF_SCENARIOS_MARKDOWN,
+    RANKED_SOS_CSV, TEAM_SCENARIO_HTML, ranked_sos,
+)
 
-def main():
+def main(isolated=False, jobs=None, force=False, profile=False):
     os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
     print("\n" + "="*80)
     print("MEGA League Playoff & Draft Analysis - Full Run")
     print("="*80)
     
-    scripts = [
-        ('scripts/calc_sos_by_rankings.py', 'Strength of Schedule Calculation', False, ['--season-index', '3', '--out-csv', 'output/ranked_sos_by_conference.csv']),
-        ('scripts/generate_all_team_scenarios.py', 'Team-by-Team Playoff Scenario Analysis (includes playoff probabilities)', False, ['--markdown']),
-        ('scripts/playoff_race_table.py', 'Playoff Race Table (AFC/NFC Double-Column)', False, None),
-        ('scripts/playoff_race_html.py', 'Playoff Race HTML Report (with embedded table)', False, None),
-        ('scripts/generate_team_scenario_html.py', 'Team Scenario HTML Viewer', False, None),
-        ('scripts/top_pick_race_analysis.py', 'Draft Pick Race Analysis & Visualizations', True, None),
+    stages = [
+        ranked_sos(3, RANKED_SOS_CSV),
+        PLAYOFF_SCENARIOS_MARKDOWN,
+        PLAYOFF_RACE_TABLE,
+        PLAYOFF_RACE_HTML,
+        TEAM_SCENARIO_HTML,
+        DRAFT_RACE,
     ]
     
-    results = []
-    for script, description, optional, extra_args in scripts:
-        success = run_script(script, description, optional, extra_args)
-        results.append((description, success))
+    stage_results = run_pipeline(stages, jobs=jobs, isolated=isolated, manifest_path=MANIFEST_PATH, force=force,
+                                 profile_path=PROFILE_PATH, cprofile_dir=CPROFILE_DIR if profile else None)
+    results = [(r.stage.description, r.success) for r in stage_results]
     
     print("\n" + "="*80)
     print("SUMMARY")
@@ -57,4 +62,14 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Run the playoff and draft pick race analysis')
+    parser.add_argument('--isolated', action='store_true',
+                        help='Run every stage in its own Python process instead of in-process')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Stages to run at once (default: CPU count; 1 runs them in order in this process)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rerun every stage, even those whose inputs have not changed since the last run')
+    parser.add_argument('--profile', action='store_true',
+                        help='Also dump cProfile stats for every stage that runs into output/profiles/')
+    args = parser.parse_args()
+    main(isolated=args.isolated, jobs=args.jobs, force=args.force, profile=args.profile)
@@ -1,30 +1,35 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
 
-from run_utils import run_script
+from pipeline import MANIFEST_PATH, run_pipeline
+from pipeline_profile import CPROFILE_DIR, PROFILE_PATH
+from pipeline_stages import (
+    INDEX, PLAYER_TEAM_STINTS, PLAYER_USAGE, RANKINGS_STATS, TEAM_ROLLING_STATS, TEAM_STATS, TRADE_STATS,
+)
 
 
-def main():
+def main(isolated=False, jobs=None, force=False, profile=False):
     os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     
     print("\n" + "="*80)
     print("MEGA League Stats Analysis - Full Run")
     print("="*80)
     
-    scripts = [
-        ('stats_scripts/aggregate_team_stats.py', 'Team Statistics Aggregation'),
-        ('stats_scripts/aggregate_player_usage.py', 'Player Usage Distribution Analysis'),
-        ('stats_scripts/aggregate_rankings_stats.py', 'Team Rankings and Stats Aggregation'),
-        ('stats_scripts/build_player_team_stints.py', 'Player/Team Stints Summary (Trade-Aware)'),
-        ('scripts/generate_index.py', 'Index Page Generation'),
-        ('scripts/verify_trade_stats.py', 'Trade Stats Verification (Multi-Team Invariants)'),
+    stages = [
+        PLAYER_TEAM_STINTS,
+        TEAM_STATS,
+        TEAM_ROLLING_STATS,
+        PLAYER_USAGE,
+        RANKINGS_STATS,
+        INDEX,
+        TRADE_STATS,
     ]
     
-    results = []
-    for script, description in scripts:
-        success = run_script(script, description)
-        results.append((description, success))
+    stage_results = run_pipeline(stages, jobs=jobs, isolated=isolated, manifest_path=MANIFEST_PATH, force=force,
+                                 profile_path=PROFILE_PATH, cprofile_dir=CPROFILE_DIR if profile else None)
+    results = [(r.stage.description, r.success) for r in stage_results]
     
     print("\n" + "="*80)
     print("SUMMARY")
@@ -42,6 +47,7 @@ def main():
         print("="*80)
         print("\nGenerated files:")
         print("  • output/team_aggregated_stats.csv - Team statistics (trade-aware, 80+ metrics)")
+        print("  • output/team_rolling_stats.csv - Team totals over the last 3 weeks of exports (once the stat store has them)")
         print("  • output/team_player_usage.csv - Player usage distribution (trade-aware, 40+ metrics)")
         print("  • output/team_rankings_stats.csv - Rankings and statistics combined")
         print("  • output/player_team_stints.csv - Player/team season stints (per-team splits for multi-team players)")
@@ -54,4 +60,14 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description='Run the stats-only analysis pipeline')
+    parser.add_argument('--isolated', action='store_true',
+                        help='Run every stage in its own Python process instead of in-process')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='Stages to run at once (default: CPU count; 1 runs them in order in this process)')
+    parser.add_argument('--force', action='store_true',
+                        help='Rerun every stage, even those whose inputs have not changed since the last run')
+    parser.add_argument('--profile', action='store_true',
+                        help='Also dump cProfile stats for every stage that runs into output/profiles/')
+    args = parser.parse_args()
+    main(isolated=args.isolated, jobs=args.jobs, force=args.force, profile=args.profile)
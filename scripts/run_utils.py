@@ -2,37 +2,75 @@
 import sys
 import subprocess
 import os
+import logging
+import runpy
+import traceback
 
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-def run_script(script_name, description, optional=False, extra_args=None):
-    """Run a Python script and print its status"""
+
+def _print_header(description, optional):
     print("\n" + "="*80)
     print(f"Running: {description}")
     if optional:
         print("(Optional)")
     print("="*80)
 
+
+def _report(description, optional, returncode):
+    if returncode == 0:
+        print(f"✓ {description} completed successfully")
+        return True
+    if optional:
+        print(f"⚠ {description} skipped (missing dependencies)")
+        return True
+    print(f"✗ {description} failed with exit code {returncode}")
+    return False
+
+
+def _wait(proc):
+    """Wait for ``proc`` and return (exit code, its own rusage or None).
+
+    ``os.wait4`` reports the resources of that one child, unlike
+    ``RUSAGE_CHILDREN``, which accumulates over every child waited for.
+    """
+    if not hasattr(os, 'wait4'):  # Windows
+        return proc.wait(), None
+    _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    return proc.returncode, rusage
+
+
+def run_script(script_name, description, optional=False, extra_args=None, capture=False,
+               interpreter_args=None, usage=None):
+    """Run a Python script in a fresh interpreter and print its status
+
+    With ``capture`` the script's output is read back and printed through
+    ``sys.stdout`` rather than written straight to the terminal.
+    ``interpreter_args`` go before the script, e.g. ``['-m', 'cProfile', ...]``.
+    ``usage``, if given, is a dict that receives the child's own rusage under
+    ``'rusage'`` (None where ``os.wait4`` is unavailable).
+    """
+    _print_header(description, optional)
+
     try:
-        cmd = [sys.executable, script_name]
+        cmd = [sys.executable] + list(interpreter_args or []) + [script_name]
         if extra_args:
             cmd.extend(extra_args)
-        result = subprocess.run(
+        with subprocess.Popen(
             cmd,
-            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-            capture_output=False,
+            cwd=ROOT,
+            stdout=subprocess.PIPE if capture else None,
+            stderr=subprocess.STDOUT if capture else None,
             text=True
-        )
-
-        if result.returncode == 0:
-            print(f"✓ {description} completed successfully")
-            return True
-        else:
-            if optional:
-                print(f"⚠ {description} skipped (missing dependencies)")
-                return True
-            else:
-                print(f"✗ {description} failed with exit code {result.returncode}")
-                return False
+        ) as proc:
+            output = proc.stdout.read() if capture else ""
+            returncode, rusage = _wait(proc)
+        if usage is not None:
+            usage['rusage'] = rusage
+        if capture:
+            print(output, end="")
+        return _report(description, optional, returncode)
 
     except Exception as e:
         if optional:
@@ -41,3 +79,50 @@ def run_script(script_name, description, optional=False, extra_args=None):
         else:
             print(f"✗ Error running {description}: {str(e)}")
             return False
+
+
+def run_stage(script_name, description, optional=False, extra_args=None):
+    """Run a Python script inside this process, as ``__main__``, and print its status.
+
+    Stages share every module already imported here, including the
+    ``league_data`` table cache, so each CSV is parsed once per pipeline run
+    and no interpreter is started per stage. ``sys.argv``, ``sys.path``, the
+    working directory and the root logging handlers are restored afterwards.
+    """
+    _print_header(description, optional)
+
+    path = os.path.join(ROOT, script_name)
+    saved_argv, saved_path, saved_cwd = sys.argv, list(sys.path), os.getcwd()
+    # Stages call logging.basicConfig; drop their handlers afterwards so the
+    # next stage sets up logging against its own stderr
+    saved_handlers, saved_level = list(logging.root.handlers), logging.root.level
+    sys.argv = [path] + list(extra_args or [])
+    sys.path.insert(0, os.path.dirname(path))
+    os.chdir(ROOT)
+    try:
+        runpy.run_path(path, run_name="__main__")
+        returncode = 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            returncode = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except ImportError as e:
+        if optional:
+            print(f"⚠ {description} skipped: {str(e)}")
+            return True
+        traceback.print_exc()
+        returncode = 1
+    except Exception:
+        traceback.print_exc()
+        returncode = 1
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        os.chdir(saved_cwd)
+        logging.root.handlers[:] = saved_handlers
+        logging.root.setLevel(saved_level)
+        sys.stdout.flush()
+
+    return _report(description, optional, returncode)
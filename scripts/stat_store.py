@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Season-partitioned store of the MEGA stat exports, under ``output/store/``.
+
+The stat exports (MEGA_passing.csv, MEGA_rushing.csv, ...) hold season-to-date
+totals per player and team, with no season column: they belong to the season
+in MEGA_teams.csv. Whenever an export changes, its rows are written to
+
+    output/store/<kind>/season<N>.col       league_data's binary columnar format
+    output/store/<kind>/season<N>.idx.json  row positions per team and rosterId
+
+A later export of the same season replaces that partition; partitions of
+earlier seasons are kept, so the store holds the history the exports
+themselves overwrite. That history exists nowhere else, so ``output/store/``
+is committed with the rest of ``output/`` (commit it after each new export).
+``<kind>/manifest.json`` records which export the latest partition came from
+(its sha256), so an unchanged export is not converted again; the export's
+size and mtime, which only hold for one working copy, are kept in the
+ignored ``output/cache/stat_store/<kind>.json`` to skip even the hashing.
+
+Each new export is also diffed against the partition it replaces, by
+(rosterId, team), and the per-player increments go to an append-only weekly
+fact table, one immutable segment per export:
+
+    output/store/<kind>/weekly/season<N>_weeks<A>-<B>_<id>.col
+
+holding what each player added in weeks A..B of season N (B is the export's
+weekIndex in MEGA_teams.csv, A the week after the previous export's; <id>
+identifies the export, which is diffed only once per week). An export that
+is unchanged when the league reaches a later week adds an empty segment, so
+the weeks stay covered. The first export seen in a season has no previous
+snapshot, so its segment spans the season so far (A = 0). ``weekly_table(kind, weeks=3)`` joins the
+segments inside a rolling window without opening the rest of the history.
+
+``read_stats(kind, season=..., team=..., roster_ids=...)`` opens only the
+partition of the requested season (the current export's by default) and,
+with a team or roster filter, only builds the rows its index points at.
+``stats_table`` returns a whole partition as a ``league_data`` table for
+column-oriented consumers.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import league_data
+from league_data import MappedTable, Table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_SUBDIR = os.path.join("output", "store")
+STAMP_SUBDIR = os.path.join("output", "cache", "stat_store")
+KINDS = ("passing", "rushing", "receiving", "defense", "punting", "kicking")
+# Identity columns carried into the weekly facts; every other numeric column
+# is an additive season-to-date counter unless its name marks an average or a
+# season high.
+FACT_KEYS = ("team__displayName", "player__rosterId", "player__fullName", "player__position")
+NOT_ADDITIVE = ("Avg", "Longest")
+WEEKLY_SUBDIR = "weekly"
+
+# Open partitions by path: [(size, mtime_ns), table, index path, index loaded on first filter].
+_PARTITIONS: Dict[str, List[Any]] = {}
+
+
+def export_path(kind: str, root: str = ROOT) -> str:
+    """Path of the MEGA export behind ``kind``."""
+    if kind not in KINDS:
+        raise ValueError(f"unknown stat kind {kind!r} (expected one of {', '.join(KINDS)})")
+    return os.path.join(root, f"MEGA_{kind}.csv")
+
+
+def store_dir(kind: str, root: str = ROOT) -> str:
+    return os.path.join(root, STORE_SUBDIR, kind)
+
+
+def export_week(root: str = ROOT) -> Tuple[int, int, int]:
+    """(seasonIndex, stageIndex, weekIndex) of the current exports: the
+    latest one in MEGA_teams.csv."""
+    teams = league_data.load_table(os.path.join(root, "MEGA_teams.csv"))
+    keys = [k for k in league_data.GAME_KEYS if k in teams.fieldnames]
+    if "seasonIndex" not in keys:
+        return (0, 0, 0)
+    columns = [teams.column(k) if k in keys else [0] * len(teams) for k in league_data.GAME_KEYS]
+    weeks = [w for w in zip(*columns) if all(isinstance(v, int) for v in w)]
+    return max(weeks) if weeks else (0, 0, 0)
+
+
+def current_season(root: str = ROOT) -> int:
+    """Season of the current exports: the latest seasonIndex in MEGA_teams.csv."""
+    return export_week(root)[0]
+
+
+def canonical_team(name: Any) -> str:
+    """Team display name without surrounding spaces or a leading "<index>:"
+    (the rule of stats_common.normalize_team_display)."""
+    text = str(name or "").strip()
+    prefix, sep, rest = text.partition(":")
+    return rest.strip() if sep and prefix.isdigit() else text
+
+
+def _partition_paths(kind: str, season: int, root: str) -> Tuple[str, str]:
+    base = os.path.join(store_dir(kind, root), f"season{season}")
+    return base + ".col", base + ".idx.json"
+
+
+def _write_json(data: Any, path: str) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def build_index(table: Table) -> Dict[str, Dict[str, List[int]]]:
+    """Row positions of ``table`` per canonical team and per rosterId."""
+    index: Dict[str, Dict[str, List[int]]] = {"team": {}, "rosterId": {}}
+    for key, field, label in (("team", "team__displayName", canonical_team),
+                              ("rosterId", "player__rosterId", lambda v: str(v or "").strip())):
+        if field not in table.fieldnames:
+            continue
+        groups = index[key]
+        for i, value in enumerate(table.columns[field]):
+            groups.setdefault(label(value), []).append(i)
+    return index
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def refresh(kind: str, root: str = ROOT) -> int:
+    """Partition the current export of ``kind`` if it changed, first appending
+    its increments over the partition it replaces; return its season."""
+    path = export_path(kind, root)
+    stat = os.stat(path)
+    manifest_path = os.path.join(store_dir(kind, root), "manifest.json")
+    manifest = _read_json(manifest_path)
+    stamp_path = os.path.join(root, STAMP_SUBDIR, f"{kind}.json")
+    stamp = _read_json(stamp_path)
+    season, stage, week = export_week(root)
+    stored = manifest.get("season") is not None and all(
+        os.path.exists(p) for p in _partition_paths(kind, manifest["season"], root))
+    # An export that has not changed is still current unless the league moved
+    # to a later week of the same season (then it adds an empty segment).
+    current = stored and (manifest["season"] != season or manifest.get("week") == week)
+    if (current and stamp.get("sha256") == manifest.get("sha256")
+            and (stamp.get("size"), stamp.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns)):
+        return manifest["season"]
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+    stamp = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+    if current and digest == manifest.get("sha256"):
+        # Unchanged (touched, or a fresh checkout): only the local stamp is new.
+        _write_json(stamp, stamp_path)
+        return manifest["season"]
+
+    table = league_data.load_table(path)
+    os.makedirs(store_dir(kind, root), exist_ok=True)
+    binary, index = _partition_paths(kind, season, root)
+    # The partition about to be replaced is the previous snapshot; its
+    # increments are written before it goes (see _append_weekly).
+    if not _has_segment(kind, root, season, week, digest[:12]):
+        previous = league_data.read_binary(binary) if stored and manifest["season"] == season else None
+        first = min(manifest.get("week", -1) + 1, week) if previous is not None else 0
+        _append_weekly(kind, root, diff_snapshots(previous, table, (season, stage, week, first)),
+                       f"season{season}_weeks{first}-{week}_{digest[:12]}")
+    league_data.write_binary(table, binary)
+    _write_json(build_index(table), index)
+    _write_json({"season": season, "week": week, "rows": len(table), "sha256": digest}, manifest_path)
+    _write_json(stamp, stamp_path)
+    return season
+
+
+def additive_fields(table: Table) -> List[str]:
+    """Numeric season-to-date counters of ``table`` (gamesPlayed, *Total*, ...)."""
+    return [name for name in table.fieldnames
+            if name not in FACT_KEYS and not name.startswith(("team__", "player__"))
+            and not any(word in name for word in NOT_ADDITIVE)
+            and table.kind(name) in (int, float)]
+
+
+def _delta_text(value: Any) -> str:
+    return str(value) if isinstance(value, int) else repr(round(value, 4))
+
+
+def diff_snapshots(previous: Optional[Table], current: Table,
+                   week: Tuple[int, int, int, int]) -> Table:
+    """Per-player increments from ``previous`` to ``current`` as a fact table.
+
+    Rows are matched by (rosterId, canonical team) through a dict built over
+    ``previous`` (a hash join); a player with no earlier row contributes the
+    whole line, and players whose counters did not move are left out.
+    ``week`` is (seasonIndex, stageIndex, weekIndex, firstWeekIndex).
+    """
+    fields = additive_fields(current)
+    keys = [k for k in FACT_KEYS if k in current.fieldnames]
+    stamp = [str(v) for v in week]
+    facts: Dict[str, List[Optional[str]]] = {
+        name: [] for name in ("seasonIndex", "stageIndex", "weekIndex", "firstWeekIndex", *keys, *fields)
+    }
+
+    def counters(table: Table) -> List[List[Any]]:
+        n = len(table)
+        return [[v or 0 for v in table.column(f)] if f in table.fieldnames else [0] * n for f in fields]
+
+    def row_keys(table: Table) -> List[Tuple[str, str]]:
+        if "player__rosterId" not in table.fieldnames or "team__displayName" not in table.fieldnames:
+            return []
+        return [(str(r or "").strip(), canonical_team(t))
+                for r, t in zip(table.columns["player__rosterId"], table.columns["team__displayName"])]
+
+    before: Dict[Tuple[str, str], int] = {}
+    old = None
+    if previous is not None and len(previous):
+        before = {key: i for i, key in enumerate(row_keys(previous))}
+        old = counters(previous)
+    new = counters(current)
+    identity = [current.columns[k] for k in keys]
+    for i, key in enumerate(row_keys(current)):
+        j = before.get(key)
+        deltas = [column[i] - old[c][j] for c, column in enumerate(new)] if j is not None else [
+            column[i] for column in new]
+        if not any(deltas):
+            continue
+        for name, value in zip(("seasonIndex", "stageIndex", "weekIndex", "firstWeekIndex"), stamp):
+            facts[name].append(value)
+        for name, column in zip(keys, identity):
+            facts[name].append(column[i])
+        for name, value in zip(fields, deltas):
+            facts[name].append(_delta_text(value))
+    return Table(list(facts), facts)
+
+
+def _weekly_dir(kind: str, root: str) -> str:
+    return os.path.join(store_dir(kind, root), WEEKLY_SUBDIR)
+
+
+def _has_segment(kind: str, root: str, season: int, week: int, export_id: str) -> bool:
+    """Whether this export (``export_id``, a sha256 prefix) was already diffed
+    as of ``week`` of ``season``."""
+    directory = _weekly_dir(kind, root)
+    prefix, suffix = f"season{season}_weeks", f"-{week}_{export_id}.col"
+    return os.path.isdir(directory) and any(
+        n.startswith(prefix) and n.endswith(suffix) for n in os.listdir(directory))
+
+
+def _append_weekly(kind: str, root: str, facts: Table, name: str) -> None:
+    """Add one segment to the weekly fact table; an existing segment is never
+    replaced, so a second process handling the same export changes nothing."""
+    directory = _weekly_dir(kind, root)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name + ".col")
+    if os.path.exists(path):
+        return
+    tmp = f"{path}.{os.getpid()}.part"
+    league_data.write_binary(facts, tmp)
+    try:
+        os.link(tmp, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(tmp)
+
+
+def weekly_segments(kind: str, season: Optional[int] = None,
+                    root: str = ROOT) -> List[Tuple[int, int, str]]:
+    """(firstWeekIndex, weekIndex, path) of every fact segment of ``season``
+    (the current export's by default), in week order."""
+    if season is None:
+        season = refresh(kind, root)
+    directory = _weekly_dir(kind, root)
+    prefix = f"season{season}_weeks"
+    found = []
+    for name in os.listdir(directory) if os.path.isdir(directory) else ():
+        if name.startswith(prefix) and name.endswith(".col"):
+            first, _, last = name[len(prefix):].split("_", 1)[0].partition("-")
+            found.append((int(first), int(last), os.path.join(directory, name)))
+    return sorted(found)
+
+
+def weekly_table(kind: str, weeks: Optional[int] = None, season: Optional[int] = None,
+                 root: str = ROOT) -> Tuple[Table, Tuple[int, int]]:
+    """Weekly facts of ``kind`` as one table, plus the (first, last) weeks covered.
+
+    With ``weeks``, only segments lying wholly inside the last ``weeks`` weeks
+    up to the latest export are read; without it, the whole season is.
+    Summing a player's facts gives the production over the covered weeks.
+    """
+    segments = weekly_segments(kind, season, root)
+    if not segments:
+        return Table([], {}), (0, -1)
+    last = segments[-1][1]
+    start = last - weeks + 1 if weeks else 0
+    chosen = [(a, b, path) for a, b, path in segments if a >= start and b <= last]
+    tables = [league_data.read_binary(path) for _, _, path in chosen]
+    fieldnames = list(dict.fromkeys(f for t in tables for f in t.fieldnames))
+    columns: Dict[str, List[Optional[str]]] = {}
+    for name in fieldnames:
+        columns[name] = [v for t in tables
+                         for v in (t.columns[name] if name in t.fieldnames else [""] * len(t))]
+    covered = (min(a for a, _, _ in chosen), last) if chosen else (last + 1, last)
+    return Table(fieldnames, columns), covered
+
+
+def seasons(kind: str, root: str = ROOT) -> List[int]:
+    """Seasons with a stored partition of ``kind``, after refreshing the current one."""
+    refresh(kind, root)
+    found = []
+    for name in os.listdir(store_dir(kind, root)):
+        if name.startswith("season") and name.endswith(".col"):
+            found.append(int(name[len("season"):-len(".col")]))
+    return sorted(found)
+
+
+def _open(kind: str, season: Optional[int], root: str) -> List[Any]:
+    """[(size, mtime_ns), table, index path, index or None] for one partition."""
+    if season is None:
+        season = refresh(kind, root)
+    binary, index_path = _partition_paths(kind, season, root)
+    if not os.path.exists(binary) and season == current_season(root):
+        refresh(kind, root)
+    stat = os.stat(binary)
+    key = os.path.abspath(binary)
+    cached = _PARTITIONS.get(key)
+    if cached is None or cached[0] != (stat.st_size, stat.st_mtime_ns):
+        cached = _PARTITIONS[key] = [(stat.st_size, stat.st_mtime_ns), league_data.read_binary(binary),
+                                     index_path, None]
+    return cached
+
+
+def stats_table(kind: str, season: Optional[int] = None, root: str = ROOT) -> MappedTable:
+    """One whole partition as a table; ``season`` defaults to the current export's."""
+    return _open(kind, season, root)[1]
+
+
+def read_stats(kind: str, season: Optional[int] = None,
+               team: Union[str, Iterable[str], None] = None,
+               roster_ids: Optional[Iterable[Any]] = None,
+               root: str = ROOT) -> List[Dict[str, Any]]:
+    """Rows of one stat partition as ``csv.DictReader`` would return them.
+
+    ``season`` defaults to the season of the current export. ``team`` (one
+    name or several) and ``roster_ids`` narrow the rows through the
+    partition's index; rows keep their export order.
+    """
+    partition = _open(kind, season, root)
+    table = partition[1]
+    if team is None and roster_ids is None:
+        return table.rows()
+    if partition[3] is None:
+        with open(partition[2], encoding="utf-8") as f:
+            partition[3] = json.load(f)
+    index = partition[3]
+    positions: Optional[set] = None
+    if team is not None:
+        names = [team] if isinstance(team, str) else team
+        positions = {i for name in names for i in index["team"].get(canonical_team(name), ())}
+    if roster_ids is not None:
+        rostered = {i for rid in roster_ids for i in index["rosterId"].get(str(rid).strip(), ())}
+        positions = rostered if positions is None else positions & rostered
+    return table.rows(sorted(positions))
+
+
+def clear() -> None:
+    """Drop the partitions held in this process (the files are kept)."""
+    _PARTITIONS.clear()
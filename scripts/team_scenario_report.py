@@ -11,6 +11,8 @@ from calc_playoff_probabilities import (
     calculate_team_stats,
     simulate_remaining_games,
     determine_playoff_teams,
+    GameModel,
+    LeagueState,
     TIE_PROBABILITY
 )
 
@@ -23,7 +25,9 @@ def get_remaining_games_for_team(team_name, games):
             remaining.append(game)
     return remaining
 
-def calculate_game_probabilities(team_name, teams_info, stats, remaining_games):
+def calculate_game_probabilities(team_name, teams_info, stats, remaining_games, game_model):
+    """Per-game odds for ``team_name`` from ``game_model``, the same per-game
+    table the simulations use (build it with the power rankings)."""
     game_probs = []
     
     for game in remaining_games:
@@ -34,20 +38,7 @@ def calculate_game_probabilities(team_name, teams_info, stats, remaining_games):
         is_home = (home == team_name)
         opponent = away if is_home else home
         
-        home_win_pct = stats[home]['win_pct']
-        away_win_pct = stats[away]['win_pct']
-        home_past_sos = teams_info[home]['past_sos']
-        away_past_sos = teams_info[away]['past_sos']
-        
-        home_rating = (home_win_pct * 0.7) + (home_past_sos * 0.3)
-        away_rating = (away_win_pct * 0.7) + (away_past_sos * 0.3)
-        
-        if home_rating + away_rating > 0:
-            home_prob = home_rating / (home_rating + away_rating)
-        else:
-            home_prob = 0.5
-        
-        home_prob = max(0.25, min(0.75, home_prob))
+        home_prob = game_model.home_win_probability(home, away)
         
         team_win_prob = home_prob if is_home else (1 - home_prob)
         team_win_prob = team_win_prob * (1 - TIE_PROBABILITY)
@@ -65,8 +56,11 @@ def calculate_game_probabilities(team_name, teams_info, stats, remaining_games):
     
     return game_probs
 
-def run_team_scenarios(team_name, teams_info, stats, sos_data, games, rankings, num_simulations=10000):
+def run_team_scenarios(team_name, teams_info, stats, sos_data, games, rankings, num_simulations=10000, game_model=None):
     conf = teams_info[team_name]['conference']
+    if game_model is None:
+        game_model = GameModel(teams_info, stats, rankings, games)
+    state = LeagueState(teams_info, stats)
     
     scenario_outcomes = []
     final_records = Counter()
@@ -77,8 +71,8 @@ def run_team_scenarios(team_name, teams_info, stats, sos_data, games, rankings,
     remaining_for_team = get_remaining_games_for_team(team_name, games)
     
     for sim in range(num_simulations):
-        simulated_games = simulate_remaining_games(teams_info, stats, sos_data, games, rankings)
-        playoff_teams, division_winners, bye_teams = determine_playoff_teams(teams_info, stats, simulated_games)
+        simulated_games = simulate_remaining_games(teams_info, stats, sos_data, games, rankings, game_model)
+        playoff_teams, division_winners, bye_teams = determine_playoff_teams(teams_info, stats, simulated_games, state)
         
         team_results = {
             'W': stats[team_name]['W'],
@@ -153,15 +147,17 @@ def format_prob(value, include_emoji=False):
         emoji = "🟡 " if include_emoji else ""
         return f"{emoji}<span class='prob-medium'>{value:.1f}%</span>"
 
-def generate_markdown_report(team_name, teams_info, stats, sos_data, games, rankings, num_simulations=10000):
+def generate_markdown_report(team_name, teams_info, stats, sos_data, games, rankings, num_simulations=10000, game_model=None):
     conf = teams_info[team_name]['conference']
     div = teams_info[team_name]['division']
     current_record = f"{stats[team_name]['W']}-{stats[team_name]['L']}-{stats[team_name]['T']}"
+    if game_model is None:
+        game_model = GameModel(teams_info, stats, rankings, games)
     
     remaining_games = get_remaining_games_for_team(team_name, games)
-    game_probs = calculate_game_probabilities(team_name, teams_info, stats, remaining_games)
+    game_probs = calculate_game_probabilities(team_name, teams_info, stats, remaining_games, game_model)
     
-    results = run_team_scenarios(team_name, teams_info, stats, sos_data, games, rankings, num_simulations)
+    results = run_team_scenarios(team_name, teams_info, stats, sos_data, games, rankings, num_simulations, game_model)
     
     sorted_by_frequency = sorted(results['final_records'].items(), key=lambda x: -x[1])
     most_likely_record, most_likely_count = sorted_by_frequency[0]
@@ -307,8 +303,9 @@ def print_team_report(team_name, teams_info, stats, sos_data, games, rankings, n
     print(f"Win %: {stats[team_name]['win_pct']:.3f}")
     print(f"\nRunning {num_simulations:,} simulations...\n")
     
+    game_model = GameModel(teams_info, stats, rankings, games)
     remaining_games = get_remaining_games_for_team(team_name, games)
-    game_probs = calculate_game_probabilities(team_name, teams_info, stats, remaining_games)
+    game_probs = calculate_game_probabilities(team_name, teams_info, stats, remaining_games, game_model)
     
     print("-" * 80)
     print("REMAINING GAMES & WIN PROBABILITIES")
@@ -327,7 +324,7 @@ def print_team_report(team_name, teams_info, stats, sos_data, games, rankings, n
     print("RUNNING SIMULATIONS...")
     print("-" * 80)
     
-    results = run_team_scenarios(team_name, teams_info, stats, sos_data, games, rankings, num_simulations)
+    results = run_team_scenarios(team_name, teams_info, stats, sos_data, games, rankings, num_simulations, game_model)
     
     sorted_by_frequency = sorted(results['final_records'].items(), key=lambda x: -x[1])
     most_likely_record, most_likely_count = sorted_by_frequency[0]
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import league_data  # noqa: E402
+
+
+CSV_TEXT = (
+    "id,name,ovr,height,salary,notes\n"
+    "1,Lamar Jackson,98,74,1.5,\"[{'a': 1}, {'b': 2}]\"\n"
+    "2,Trey McBride,,76,-0.0,\n"
+    "\n"
+    "3,Zoë Émile,95,007,2.25\n"
+    "4,Extra Columns,90,70,1e5,x,surplus,values\n"
+)
+
+
+class BinaryCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = os.path.join(self.tmp, "cache")
+        league_data.clear()
+        self.path = os.path.join(self.tmp, "MEGA_sample.csv")
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write(CSV_TEXT)
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            self.expected = list(csv.DictReader(f))
+
+    def tearDown(self):
+        league_data.CACHE_DIR = self.saved_cache_dir
+        league_data.clear()
+        shutil.rmtree(self.tmp)
+
+    def test_warm_load_matches_csv_rows_and_types(self):
+        cold = league_data.load_table(self.path)
+        league_data.clear()
+        warm = league_data.load_table(self.path)
+
+        self.assertIsInstance(warm, league_data.MappedTable)
+        self.assertEqual(warm.rows(), self.expected)
+        for name in cold.fieldnames:
+            self.assertIs(warm.kind(name), cold.kind(name))
+            self.assertEqual(warm.column(name), cold.column(name))
+        self.assertEqual(warm.column("ovr"), [98, None, 95, 90])
+        self.assertEqual(list(warm.array("id")), [1, 2, 3, 4])
+
+    def test_changed_export_replaces_its_cache_file(self):
+        league_data.load_table(self.path)
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            f.write("5,New Rookie,70,72,0.5,\n")
+        league_data.clear()
+
+        rows = league_data.read_rows(self.path)
+
+        self.assertEqual(rows[-1]["name"], "New Rookie")
+        self.assertEqual(len(os.listdir(league_data.CACHE_DIR)), 1)
+
+
+class RowIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = os.path.join(self.tmp, "cache")
+        league_data.clear()
+        self.path = os.path.join(self.tmp, "MEGA_games.csv")
+        with open(self.path, "w", encoding="utf-8", newline="") as f:
+            f.write(
+                "gameId,seasonIndex,stageIndex,weekIndex\n"
+                "a,1,1,0\n"
+                "b,0,1,0\n"
+                "c,1,0,2\n"
+                "d,1,1,1\n"
+                "e,1,1,0\n"
+                "f,,1,0\n"
+            )
+
+    def tearDown(self):
+        league_data.CACHE_DIR = self.saved_cache_dir
+        league_data.clear()
+        shutil.rmtree(self.tmp)
+
+    def test_select_keeps_file_order_across_groups(self):
+        index = league_data.index_rows(self.path)
+
+        self.assertEqual([r["gameId"] for r in index.select(1)], ["a", "c", "d", "e"])
+        self.assertEqual([r["gameId"] for r in index.select(1, 1)], ["a", "d", "e"])
+        self.assertEqual([r["gameId"] for r in index.select(1, 1, 0)], ["a", "e"])
+        self.assertEqual(index.values(), [0, 1])
+        self.assertEqual(index.values(1), [0, 1])
+        self.assertIs(league_data.index_rows(self.path), index)
+
+    def test_changed_file_rebuilds_the_index(self):
+        league_data.index_rows(self.path)
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            f.write("g,2,1,0\n")
+
+        self.assertEqual(league_data.index_rows(self.path).values(), [0, 1, 2])
+
+    def test_season_indexes(self):
+        with open(self.path, "a", encoding="utf-8", newline="") as f:
+            f.write("g,2,0,0\n")
+
+        self.assertEqual(league_data.season_indexes("all", self.path), [0, 1])
+        self.assertEqual(league_data.season_indexes("2, 3", self.path), [2, 3])
+        with self.assertRaises(ValueError):
+            league_data.season_indexes("latest", self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
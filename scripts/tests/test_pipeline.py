@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import pipeline_stages  # noqa: E402
+from pipeline import Stage, build_graph, critical_path, run_pipeline  # noqa: E402
+
+
+def stage(name, inputs=(), outputs=(), script='unused.py'):
+    return Stage(name, script, name, inputs=inputs, outputs=outputs)
+
+
+class GraphTests(unittest.TestCase):
+    def test_dependencies_follow_files_not_declaration_order(self):
+        stages = [
+            stage('team_stats', inputs=('stints.csv',), outputs=('team.csv',)),
+            stage('stints', inputs=('MEGA_passing.csv',), outputs=('stints.csv',)),
+            stage('usage', inputs=('stints.csv', 'team.csv'), outputs=('usage.csv',)),
+            stage('sos', inputs=('MEGA_games.csv',), outputs=('sos.csv',)),
+        ]
+
+        deps = build_graph(stages)
+
+        self.assertEqual(deps, {
+            'team_stats': {'stints'},
+            'stints': set(),
+            'usage': {'stints', 'team_stats'},
+            'sos': set(),
+        })
+        chain, seconds = critical_path(stages, deps, {'stints': 1.0, 'team_stats': 2.0, 'usage': 0.5, 'sos': 3.0})
+        self.assertEqual(chain, ['stints', 'team_stats', 'usage'])
+        self.assertAlmostEqual(seconds, 3.5)
+
+    def test_cycles_and_shared_outputs_are_rejected(self):
+        with self.assertRaises(ValueError):
+            build_graph([stage('a', inputs=('b.csv',), outputs=('a.csv',)),
+                         stage('b', inputs=('a.csv',), outputs=('b.csv',))])
+        with self.assertRaises(ValueError):
+            build_graph([stage('a', outputs=('x.csv',)), stage('b', outputs=('x.csv',))])
+
+
+class RunTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def script(self, name, body):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(body)
+        return path
+
+    def test_failed_stage_stops_its_dependents_only(self):
+        out = os.path.join(self.tmp, 'ok.txt')
+        stages = [
+            Stage('fails', self.script('fails.py', 'raise SystemExit(3)\n'), 'fails', outputs=('bad.csv',)),
+            Stage('after_fail', self.script('after.py', ''), 'after_fail', inputs=('bad.csv',)),
+            Stage('writes', self.script('writes.py', f'open({out!r}, "w").write("done")\n'), 'writes'),
+        ]
+
+        for jobs in (1, 2):
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                results = run_pipeline(stages, jobs=jobs)
+            self.assertEqual([r.success for r in results], [False, False, True])
+            self.assertTrue(results[1].skipped)
+            with open(out, encoding='utf-8') as f:
+                self.assertEqual(f.read(), 'done')
+            os.remove(out)
+
+    def test_unchanged_stages_are_skipped_until_an_input_changes(self):
+        source = os.path.join(self.tmp, 'MEGA_games.csv')
+        copy = os.path.join(self.tmp, 'copy.csv')
+        manifest = os.path.join(self.tmp, 'manifest.json')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('week\n1\n')
+        stages = [Stage('copy', self.script('copy.py', f'import shutil; shutil.copy({source!r}, {copy!r})\n'),
+                        'copy', inputs=(source,), outputs=(copy,))]
+
+        def run(**kwargs):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return run_pipeline(stages, jobs=1, manifest_path=manifest, **kwargs)[0].up_to_date
+
+        self.assertFalse(run())
+        self.assertTrue(run())
+        self.assertFalse(run(force=True))
+        with open(source, 'a', encoding='utf-8') as f:
+            f.write('2\n')
+        self.assertFalse(run())
+        os.remove(copy)
+        self.assertFalse(run())
+        self.assertTrue(run())
+
+    def test_a_new_file_in_an_input_directory_reruns_the_stage(self):
+        docs = os.path.join(self.tmp, 'docs')
+        index = os.path.join(self.tmp, 'index.html')
+        manifest = os.path.join(self.tmp, 'manifest.json')
+        os.makedirs(docs)
+        with open(os.path.join(docs, 'a.html'), 'w', encoding='utf-8') as f:
+            f.write('a')
+        lister = self.script('index.py', f'import os; open({index!r}, "w").write(" ".join(sorted(os.listdir({docs!r}))))\n')
+        stages = [Stage('index', lister, 'index', inputs=(docs,), outputs=(index,))]
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return run_pipeline(stages, jobs=1, manifest_path=manifest)[0].up_to_date
+
+        self.assertFalse(run())
+        self.assertTrue(run())
+        with open(os.path.join(docs, 'b.html'), 'w', encoding='utf-8') as f:
+            f.write('b')
+        self.assertFalse(run())
+        os.remove(os.path.join(docs, 'b.html'))
+        self.assertFalse(run())
+        with open(index, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'a.html')
+        self.assertIn('docs', pipeline_stages.INDEX.inputs)
+
+    def test_profile_history_records_each_stage(self):
+        profile = os.path.join(self.tmp, 'profile.json')
+        stages = [Stage('sleep', self.script('sleep.py', 'import time; time.sleep(0.05)\n'), 'sleep')]
+
+        for _ in range(3):
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_pipeline(stages, jobs=1, profile_path=profile)
+
+        with open(profile, encoding='utf-8') as f:
+            runs = json.load(f)['runs']
+        self.assertEqual(len(runs), 3)
+        usage = runs[-1]['stages'][0]
+        self.assertEqual(usage['status'], 'ran')
+        self.assertGreaterEqual(usage['wall_seconds'], 0.05)
+        self.assertIn('cpu_seconds', usage)
+        self.assertIn('peak_rss_mb', usage)
+
+    @unittest.skipUnless(hasattr(os, 'wait4'), 'needs os.wait4')
+    def test_isolated_stages_report_their_own_peak_memory(self):
+        done = os.path.join(self.tmp, 'big.txt')
+        stages = [
+            Stage('big', self.script('big.py', f'b = bytearray(200 << 20); open({done!r}, "w").write("x")\n'),
+                  'big', outputs=(done,)),
+            Stage('small', self.script('small.py', 'pass\n'), 'small', inputs=(done,)),
+        ]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            big, small = run_pipeline(stages, jobs=1, isolated=True)
+
+        self.assertGreater(big.peak_rss_mb, 200)
+        self.assertLess(small.peak_rss_mb, 100)
+        self.assertGreater(big.cpu, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATS_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "stats_scripts")
+if STATS_DIR not in sys.path:
+    sys.path.insert(0, STATS_DIR)
+
+import build_player_team_stints as stints  # noqa: E402
+import league_data  # noqa: E402
+
+
+TEAMS = (
+    "displayName,abbrName,seasonIndex,offPassYds,offRushYds\n"
+    "Bears,CHI,3,300,0\n"
+    "Browns,CLE,3,,\n"
+)
+PASSING = (
+    "team__displayName,team__abbrName,player__rosterId,player__fullName,player__position,"
+    "gamesPlayed,passTotalAtt,passTotalYds\n"
+    "Bears,CHI,1,Starter,QB,4,40,200\n"
+    "11:Browns,CLE,2,Traded,QB,2,10,60\n"
+    "Bears,CHI,2,,,1,10,120\n"
+    "Bears,CHI,1,Starter,QB,1,5,50\n"
+)
+RUSHING = (
+    "team__displayName,team__abbrName,player__rosterId,player__fullName,player__position,"
+    "gamesPlayed,rushTotalAtt,rushTotalYds\n"
+    "Lions,DET,3,Runner,HB,3,12,48\n"
+    "Bears,CHI,2,Traded,QB,1,2,5\n"
+)
+
+
+class StintBuilderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = os.path.join(self.tmp, "cache")
+        league_data.clear()
+        files = {"MEGA_teams.csv": TEAMS, "MEGA_passing.csv": PASSING, "MEGA_rushing.csv": RUSHING,
+                 "MEGA_receiving.csv": "team__displayName\n", "MEGA_defense.csv": "team__displayName\n"}
+        for name, text in files.items():
+            with open(os.path.join(self.tmp, name), "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+
+    def tearDown(self):
+        league_data.CACHE_DIR = self.saved_cache_dir
+        league_data.clear()
+        shutil.rmtree(self.tmp)
+
+    def build(self):
+        stints.build_player_team_stints(Path(self.tmp))
+        with open(os.path.join(self.tmp, "output", "player_team_stints.csv"), newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            self.assertEqual(reader.fieldnames, stints.FIELDNAMES)
+            return {(r["team"], r["player__rosterId"]): r for r in reader}
+
+    def test_rows_merge_per_team_and_player(self):
+        rows = self.build()
+
+        self.assertEqual(list(rows), [("Bears", "1"), ("Browns", "2"), ("Bears", "2"), ("Lions", "3")])
+        starter = rows[("Bears", "1")]
+        self.assertEqual((starter["seasonIndex"], starter["team_abbrev"]), ("3", "CHI"))
+        self.assertEqual((starter["gamesPlayed_passing"], starter["passTotalAtt_raw"]), ("5.0", "45.0"))
+        # Teams missing from MEGA_teams keep the stat row's abbreviation and no season.
+        self.assertEqual((rows[("Lions", "3")]["seasonIndex"], rows[("Lions", "3")]["team_abbrev"]), ("", "DET"))
+        # Identity fields blank in a stint's first row are filled from later rows.
+        self.assertEqual(rows[("Bears", "2")]["player__fullName"], "Traded")
+
+    def test_traded_players_are_scaled_to_the_team_total(self):
+        rows = self.build()
+
+        self.assertEqual(rows[("Bears", "1")]["multi_team_season"], "False")
+        traded = rows[("Bears", "2")]
+        self.assertEqual(traded["multi_team_season"], "True")
+        # Bears passed for 300 yards; the starter's 250 leave 50 for the traded QB.
+        k = 50.0 / 120.0
+        self.assertEqual(traded["passTotalYds_raw"], "120.0")
+        self.assertEqual(traded["passTotalYds"], repr(120.0 * k))
+        self.assertEqual(traded["passTotalAtt"], repr(10.0 * k))
+        # Browns have no offensive totals to reconcile against.
+        self.assertEqual(rows[("Browns", "2")]["passTotalYds"], "60.0")
+
+
+if __name__ == "__main__":
+    unittest.main()
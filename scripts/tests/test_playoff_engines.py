@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+import itertools
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import calc_playoff_probabilities as cpp  # noqa: E402
+import generate_all_team_scenarios as gats  # noqa: E402
+
+
+def build_league(remaining_weeks=2, seed=7):
+    """Synthetic 32-team league: double round-robin inside each division plus
+    a few cross-division weeks, with the last ``remaining_weeks`` unplayed."""
+    rng = random.Random(seed)
+    teams_info = {}
+    for conf in ('AFC', 'NFC'):
+        for div in ('East', 'North', 'South', 'West'):
+            for n in range(4):
+                teams_info[f"{conf}-{div}-{n}"] = {
+                    'conference': conf,
+                    'division': f"{conf} {div}",
+                    'win_streak': rng.choice([-3, 0, 0, 3]),
+                    'past_sos': 0.5,
+                    'elo': 1100 + rng.random() * 300,
+                }
+
+    teams = list(teams_info)
+    weeks = []
+    for offset in (1, 2, 3, 1, 2, 3):
+        pairs = []
+        for start in range(0, 32, 4):
+            block = teams[start:start + 4]
+            a, b = block[0], block[offset]
+            rest = [t for t in block if t not in (a, b)]
+            pairs.extend([(a, b), (rest[0], rest[1])])
+        weeks.append(pairs)
+    for shift in (4, 8, 12, 16):
+        weeks.append([(teams[i], teams[(i + shift) % 32]) for i in range(0, 32, 2)])
+
+    games = []
+    last_played = len(weeks) - remaining_weeks
+    for week, pairs in enumerate(weeks):
+        for home, away in pairs:
+            completed = week < last_played
+            home_score = rng.randint(7, 35) if completed else 0
+            away_score = rng.randint(7, 35) if completed else 0
+            games.append({
+                'home': home, 'away': away,
+                'home_score': home_score, 'away_score': away_score,
+                'week': week, 'status': 2 if completed else 1, 'completed': completed,
+            })
+    return teams_info, games
+
+
+class LeagueStateTests(unittest.TestCase):
+    def setUp(self):
+        self.teams_info, self.games = build_league()
+        self.stats = cpp.calculate_team_stats(self.teams_info, self.games)
+        self.state = cpp.LeagueState(self.teams_info, self.stats)
+
+    def test_matches_completed_game_stats(self):
+        for team, i in self.state.index.items():
+            self.assertEqual(self.state.win_pct[i], self.stats[team]['win_pct'])
+            self.assertEqual(self.state.conference_pct[i], self.stats[team]['conference_pct'])
+            self.assertAlmostEqual(self.state.strength_of_victory(i), self.stats[team]['strength_of_victory'])
+            self.assertAlmostEqual(self.state.strength_of_schedule(i), self.stats[team]['strength_of_schedule'])
+
+    def test_reset_discards_simulated_games(self):
+        home, away = 0, 1
+        self.state.record_game(home, away, 1)
+        self.state.finalize()
+        self.assertEqual(self.state.counts['W'][home], self.stats[self.state.teams[home]]['W'] + 1)
+
+        self.state.reset()
+        self.state.finalize()
+        self.assertEqual(self.state.counts['W'][home], self.stats[self.state.teams[home]]['W'])
+        self.assertEqual(self.state.h2h_w, self.state._base_h2h_w)
+
+    def test_head_to_head_sweep_wins_tiebreak(self):
+        a, b = 0, 1
+        self.state.reset()
+        self.state.h2h_w[a * self.state.n + b] += 5
+        self.assertEqual(cpp.compare_head_to_head([a, b], self.state), a)
+
+
+class SeasonModelCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.teams_info, self.games = build_league(remaining_weeks=3)
+
+    def assert_matches_fresh_compile(self, stats, game_model):
+        expected = cpp.calculate_team_stats(self.teams_info, self.games)
+        fresh_model = cpp.GameModel(self.teams_info, expected, {}, self.games)
+        for team in self.teams_info:
+            for key in ('W', 'L', 'T', 'conference_W', 'division_L', 'points_for'):
+                self.assertEqual(stats[team][key], expected[team][key])
+            self.assertEqual(dict(stats[team]['head_to_head']), dict(expected[team]['head_to_head']))
+            self.assertAlmostEqual(stats[team]['strength_of_victory'], expected[team]['strength_of_victory'])
+        self.assertEqual(
+            [(e['home'], e['away']) for e in game_model.remaining],
+            [(e['home'], e['away']) for e in fresh_model.remaining],
+        )
+        for cached, fresh in zip(game_model.remaining, fresh_model.remaining):
+            self.assertAlmostEqual(cached['home_prob'], fresh['home_prob'])
+
+    def test_reuses_and_extends_the_cached_compile(self):
+        load = lambda: cpp.load_season_model(self.teams_info, self.games, {}, cache_dir=self.cache_dir)
+        self.assert_matches_fresh_compile(*load())
+        self.assert_matches_fresh_compile(*load())
+
+        # Report one more week of results: applied as deltas to the cached counts
+        for game in self.games:
+            if not game['completed'] and game['week'] == 7:
+                game.update(completed=True, status=2, home_score=24, away_score=17)
+        self.assert_matches_fresh_compile(*load())
+
+        # A corrected score is not a pure delta and forces a rebuild
+        first = next(g for g in self.games if g['completed'])
+        first['home_score'], first['away_score'] = first['away_score'], first['home_score'] + 1
+        self.assert_matches_fresh_compile(*load())
+
+
+class NumpyEngineTests(unittest.TestCase):
+    def setUp(self):
+        if cpp.np is None:
+            self.skipTest("NumPy not installed")
+        self.teams_info, self.games = build_league()
+        self.stats = cpp.calculate_team_stats(self.teams_info, self.games)
+
+    def test_counts_respect_playoff_format(self):
+        n = 500
+        counts = cpp.run_numpy_simulations(self.teams_info, self.stats, self.games, {}, n, seed=3, batch_size=128)
+
+        for conf in ('AFC', 'NFC'):
+            conf_counts = [c for t, c in counts.items() if self.teams_info[t]['conference'] == conf]
+            self.assertEqual(sum(c['playoff'] for c in conf_counts), 7 * n)
+            self.assertEqual(sum(c['division'] for c in conf_counts), 4 * n)
+            self.assertEqual(sum(c['bye'] for c in conf_counts), n)
+            self.assertEqual(sum(c['divisional'] for c in conf_counts), 4 * n)
+            self.assertEqual(sum(c['superbowl'] for c in conf_counts), n)
+        self.assertEqual(sum(c['champion'] for c in counts.values()), n)
+
+    def test_seed_is_reproducible(self):
+        first = cpp.run_numpy_simulations(self.teams_info, self.stats, self.games, {}, 300, seed=11)
+        random.seed(5)
+        second = cpp.run_numpy_simulations(self.teams_info, self.stats, self.games, {}, 300, seed=11)
+        self.assertEqual(first, second)
+
+    def test_batched_tiebreakers_match_seed_conference(self):
+        model = cpp.GameModel(self.teams_info, self.stats, {}, self.games)
+        state = cpp.LeagueState(self.teams_info, self.stats)
+        pairs = [(state.index[e['home']], state.index[e['away']]) for e in model.remaining]
+        rng = cpp.np.random.default_rng(2)
+        outcome = rng.integers(0, 3, (200, len(pairs)))
+        table = cpp.BatchLeagueTable(state, cpp.np.array([h for h, _ in pairs]), cpp.np.array([a for _, a in pairs]),
+                                     outcome, rng)
+
+        compared = 0
+        for conf, members in state.conf_members.items():
+            divisions = [cpp.np.isin(cpp.np.arange(state.n), div) for div in state.div_members[conf].values()]
+            leaders = cpp.np.concatenate([table.rank(div, 1, is_division=True) for div in divisions], axis=1)
+            leader_mask = cpp.np.zeros(outcome.shape[:1] + (state.n,), dtype=bool)
+            leader_mask[table.rows[:, None], leaders] = True
+            seeds = cpp.np.concatenate([table.rank(leader_mask, 4),
+                                        table.rank(cpp.np.isin(cpp.np.arange(state.n), members) & ~leader_mask, 3)],
+                                       axis=1)
+            for row, codes in enumerate(outcome.tolist()):
+                state.reset()
+                for (home, away), code in zip(pairs, codes):
+                    state.record_game(home, away, code)
+                state.finalize()
+                playoff, div_winners, _ = cpp.seed_conference(conf, state, ordered=True)
+                if state.coin_flips:
+                    continue
+                compared += 1
+                self.assertEqual(seeds[row].tolist(), playoff)
+                self.assertEqual(sorted(leaders[row].tolist()), sorted(div_winners))
+        self.assertGreater(compared, 100)
+
+    def test_completed_season_matches_tiebreakers(self):
+        teams_info, games = build_league(remaining_weeks=0)
+        stats = cpp.calculate_team_stats(teams_info, games)
+        counts = cpp.run_numpy_simulations(teams_info, stats, games, {}, 50, seed=1)
+        random.seed(0)
+        playoff_teams, division_winners, bye_teams = cpp.determine_playoff_teams(teams_info, stats, [])
+
+        for conf in ('AFC', 'NFC'):
+            for team in division_winners[conf]:
+                self.assertEqual(counts[team]['division'], 50)
+            for team in bye_teams[conf]:
+                self.assertEqual(counts[team]['bye'], 50)
+
+
+class ExactEnumerationTests(unittest.TestCase):
+    def setUp(self):
+        self.teams_info, self.games = build_league(remaining_weeks=0)
+        # Reopen a few intra-conference games and one cross-conference game
+        for k in (0, 1, 2, 10, 11, 12, len(self.games) - 1):
+            self.games[k].update(completed=False, status=1, home_score=0, away_score=0)
+        self.stats = cpp.calculate_team_stats(self.teams_info, self.games)
+
+    def brute_force(self, probabilities=cpp.outcome_probabilities):
+        model = cpp.GameModel(self.teams_info, self.stats, {}, self.games)
+        state = cpp.LeagueState(self.teams_info, self.stats)
+        pairs = [(state.index[e['home']], state.index[e['away']]) for e in model.remaining]
+        probs = {team: {'playoff': 0.0, 'division': 0.0, 'bye': 0.0} for team in self.teams_info}
+        for codes, weight in cpp._weighted_outcomes(model.remaining, probabilities):
+            state.reset()
+            for (home, away), code in zip(pairs, codes):
+                state.record_game(home, away, code)
+            state.finalize()
+            for conf in state.conf_members:
+                for seeds, flip_weight in cpp.seed_conference_outcomes(conf, state):
+                    for key, group in zip(('playoff', 'division', 'bye'), seeds):
+                        for i in group:
+                            probs[state.teams[i]][key] += weight * flip_weight
+        return probs
+
+    def test_matches_enumerating_every_game(self):
+        exact = cpp.run_exact_enumeration(self.teams_info, self.stats, self.games, {})
+        expected = self.brute_force()
+        for team in self.teams_info:
+            for key in ('playoff', 'division', 'bye'):
+                self.assertAlmostEqual(exact[team][key], expected[team][key], places=9)
+
+    def test_decisive_enumeration_is_within_the_tie_chance(self):
+        decisive = cpp.run_exact_enumeration(self.teams_info, self.stats, self.games, {}, ties=False)
+        folded = self.brute_force(cpp.decisive_probabilities)
+        with_ties = self.brute_force()
+        margin = cpp.tie_chance(cpp.GameModel(self.teams_info, self.stats, {}, self.games).remaining)
+        self.assertAlmostEqual(margin, 1 - (1 - cpp.TIE_PROBABILITY) ** 7)
+        for team in self.teams_info:
+            for key in ('playoff', 'division', 'bye'):
+                self.assertAlmostEqual(decisive[team][key], folded[team][key], places=9)
+                self.assertLessEqual(abs(decisive[team][key] - with_ties[team][key]), margin)
+
+    def test_coin_flips_are_enumerated_with_their_odds(self):
+        model = cpp.GameModel(self.teams_info, self.stats, {}, self.games)
+        state = cpp.LeagueState(self.teams_info, self.stats)
+        pairs = [(state.index[e['home']], state.index[e['away']]) for e in model.remaining]
+        flipped = 0
+        for codes, _ in cpp._weighted_outcomes(model.remaining):
+            state.reset()
+            for (home, away), code in zip(pairs, codes):
+                state.record_game(home, away, code)
+            state.finalize()
+            for conf in state.conf_members:
+                before = random.getstate()
+                outcomes = cpp.seed_conference_outcomes(conf, state)
+                self.assertEqual(random.getstate(), before)
+                self.assertIsNone(state.flip_script)
+                self.assertAlmostEqual(sum(weight for _, weight in outcomes), 1.0)
+                if len(outcomes) > 1:
+                    flipped += 1
+                    self.assertGreater(len({repr(seeds) for seeds, _ in outcomes}), 1)
+        self.assertGreater(flipped, 0)
+
+    def test_too_many_outcomes_returns_none(self):
+        self.assertIsNone(cpp.run_exact_enumeration(self.teams_info, self.stats, self.games, {}, max_outcomes=10))
+
+
+class BracketTests(unittest.TestCase):
+    def setUp(self):
+        self.teams_info, self.games = build_league()
+        self.stats = cpp.calculate_team_stats(self.teams_info, self.games)
+
+    def test_each_round_halves_the_field(self):
+        random.seed(4)
+        n = 400
+        counts = cpp.run_playoff_simulations(self.teams_info, self.stats, {}, self.games, {}, n)
+
+        totals = {key: sum(c[key] for c in counts.values()) for key in ('playoff',) + cpp.BRACKET_ROUNDS}
+        self.assertEqual(totals, {'playoff': 14 * n, 'divisional': 8 * n, 'conference': 4 * n,
+                                  'superbowl': 2 * n, 'champion': n})
+        for c in counts.values():
+            self.assertGreaterEqual(c['playoff'], c['divisional'])
+            self.assertGreaterEqual(c['divisional'], c['bye'])
+            self.assertGreaterEqual(c['divisional'], c['conference'])
+            self.assertGreaterEqual(c['conference'], c['superbowl'])
+            self.assertGreaterEqual(c['superbowl'], c['champion'])
+
+    def test_distribution_matches_simulated_brackets(self):
+        state = cpp.LeagueState(self.teams_info, self.stats)
+        home_probs = cpp.GameModel(self.teams_info, self.stats, {}).bracket_probabilities(state.teams)
+        seeds = [3, 9, 0, 14, 6, 11, 5]
+        exact = cpp.bracket_distribution(seeds, home_probs, state.n)
+
+        random.seed(8)
+        n = 20000
+        simulated = {key: [0] * state.n for key in exact}
+        for _ in range(n):
+            reached = cpp.simulate_bracket([seeds], home_probs, state.n)
+            for key in simulated:
+                for i in reached[key]:
+                    simulated[key][i] += 1
+        for key, probs in exact.items():
+            self.assertAlmostEqual(sum(probs.values()), {'divisional': 4, 'conference': 2, 'superbowl': 1}[key])
+            for i in seeds:
+                self.assertAlmostEqual(probs[i], simulated[key][i] / n, delta=0.02)
+
+
+class ShardedSimulationTests(unittest.TestCase):
+    def setUp(self):
+        self.teams_info, self.games = build_league()
+        self.stats = cpp.calculate_team_stats(self.teams_info, self.games)
+
+    def run_shards(self, seed, num_simulations):
+        return gats.run_sharded_simulations(
+            self.teams_info, self.stats, {}, self.games, {}, num_simulations, seed
+        )
+
+    def test_plan_shards_covers_every_simulation(self):
+        self.assertEqual(gats.plan_shards(2500, shard_size=1000), [1000, 1000, 500])
+        self.assertEqual(gats.plan_shards(0), [])
+
+    def test_shard_seeds_are_stable_and_distinct(self):
+        seeds = [gats.derive_shard_seed(42, i) for i in range(5)]
+        self.assertEqual(seeds, [gats.derive_shard_seed(42, i) for i in range(5)])
+        self.assertEqual(len(set(seeds)), 5)
+
+    def test_same_seed_gives_same_tallies(self):
+        first = self.run_shards(9, 1200)
+        second = self.run_shards(9, 1200)
+        for team in self.teams_info:
+            self.assertEqual(first[team]['final_records'], second[team]['final_records'])
+            self.assertEqual(first[team]['total_playoffs'], second[team]['total_playoffs'])
+            self.assertEqual(
+                first[team]['example_outcomes_by_record'],
+                second[team]['example_outcomes_by_record'],
+            )
+        self.assertEqual(sum(first[t]['total_bye'] for t in self.teams_info), 2 * 1200)
+
+    def test_adaptive_run_is_a_prefix_of_the_fixed_plan(self):
+        adaptive = gats.run_sharded_simulations(
+            self.teams_info, self.stats, {}, self.games, {}, 20000, 5, ci_width=10.0
+        )
+        used = gats.simulations_run(adaptive)
+        self.assertLess(used, 20000)
+        self.assertEqual(used % gats.SHARD_SIZE, 0)
+
+        fixed = self.run_shards(5, used)
+        self.assertEqual(gats.playoff_counts(adaptive), gats.playoff_counts(fixed))
+
+
+class ConfidenceIntervalTests(unittest.TestCase):
+    def test_wilson_interval_brackets_the_estimate(self):
+        low, high = cpp.wilson_interval(30, 100)
+        self.assertLess(low, 0.3)
+        self.assertGreater(high, 0.3)
+        self.assertAlmostEqual(low, 0.2189, places=3)
+        self.assertAlmostEqual(high, 0.3958, places=3)
+
+    def test_interval_stays_inside_unit_range(self):
+        self.assertEqual(cpp.wilson_interval(0, 50)[0], 0.0)
+        self.assertEqual(cpp.wilson_interval(50, 50)[1], 1.0)
+
+    def test_certain_teams_do_not_block_convergence(self):
+        counts = {'A': {'playoff': 500, 'division': 500, 'bye': 500}}
+        unsettled = {'clinched': False, 'eliminated': False, 'clinched_division': False, 'clinched_bye': False}
+        self.assertFalse(cpp.intervals_converged(counts, 1000, 2.0))
+        self.assertTrue(cpp.intervals_converged(counts, 1000, 2.0, {'A': dict(unsettled, eliminated=True)}))
+        self.assertFalse(cpp.intervals_converged(counts, 1000, 2.0, {'A': dict(unsettled, clinched=True)}))
+        self.assertTrue(cpp.intervals_converged(
+            counts, 1000, 2.0, {'A': dict(unsettled, clinched=True, clinched_division=True, clinched_bye=True)}
+        ))
+
+
+class CertaintySolverTests(unittest.TestCase):
+    def test_flags_hold_in_every_ending(self):
+        teams_info, games = build_league(remaining_weeks=0, seed=3)
+        for k in random.Random(3).sample(range(len(games)), 6):
+            games[k].update(completed=False, status=1, home_score=0, away_score=0)
+        stats = cpp.calculate_team_stats(teams_info, games)
+        flags = cpp.solve_certainties(teams_info, stats, games)
+        self.assertTrue(any(f['clinched'] for f in flags.values()))
+        self.assertTrue(any(f['eliminated'] for f in flags.values()))
+
+        state = cpp.LeagueState(teams_info, stats)
+        pairs = [(state.index[g['home']], state.index[g['away']]) for g in games if not g['completed']]
+        for outcomes in itertools.product((0, 1, 2), repeat=len(pairs)):
+            state.reset()
+            for (home, away), outcome in zip(pairs, outcomes):
+                state.record_game(home, away, outcome)
+            state.finalize()
+            for conf in ('AFC', 'NFC'):
+                playoff, div_winners, bye_teams = cpp.seed_conference(conf, state)
+                for i in state.conf_members[conf]:
+                    team_flags = flags[state.teams[i]]
+                    if team_flags['clinched']:
+                        self.assertIn(i, playoff)
+                    if team_flags['eliminated']:
+                        self.assertNotIn(i, playoff)
+                    if team_flags['clinched_division']:
+                        self.assertIn(i, div_winners)
+                    if team_flags['clinched_bye']:
+                        self.assertIn(i, bye_teams)
+
+    def test_open_season_has_no_certainties(self):
+        teams_info, games = build_league(remaining_weeks=6)
+        stats = cpp.calculate_team_stats(teams_info, games)
+        flags = cpp.solve_certainties(teams_info, stats, games)
+        self.assertFalse(any(any(f.values()) for f in flags.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import league_data  # noqa: E402
+import stat_store  # noqa: E402
+
+
+PASSING = (
+    "team__displayName,player__rosterId,player__fullName,passTotalYds\n"
+    "Bears,1,Starter,200\n"
+    "11:Browns,2,Traded,60\n"
+    "Bears,2,Traded,120\n"
+    "Lions,3,Backup,15\n"
+)
+
+
+class StatStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = os.path.join(self.tmp, "cache")
+        league_data.clear()
+        stat_store.clear()
+        self.write("MEGA_teams.csv", "displayName,seasonIndex\nBears,3\nBrowns,3\n")
+        self.write("MEGA_passing.csv", PASSING)
+
+    def tearDown(self):
+        league_data.CACHE_DIR = self.saved_cache_dir
+        league_data.clear()
+        stat_store.clear()
+        shutil.rmtree(self.tmp)
+
+    def write(self, name, text):
+        with open(os.path.join(self.tmp, name), "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+
+    def read(self, **filters):
+        return [(r["team__displayName"], r["player__rosterId"])
+                for r in stat_store.read_stats("passing", root=self.tmp, **filters)]
+
+    def test_filters_use_the_partition_index(self):
+        self.assertEqual(len(self.read()), 4)
+        self.assertEqual(self.read(team="Browns"), [("11:Browns", "2")])
+        self.assertEqual(self.read(team=["Lions", "Bears"]), [("Bears", "1"), ("Bears", "2"), ("Lions", "3")])
+        self.assertEqual(self.read(roster_ids=[2]), [("11:Browns", "2"), ("Bears", "2")])
+        self.assertEqual(self.read(team="Bears", roster_ids=["2", "3"]), [("Bears", "2")])
+        self.assertEqual(self.read(team="Jets"), [])
+        with self.assertRaises(ValueError):
+            stat_store.read_stats("returns", root=self.tmp)
+
+    def test_unchanged_export_is_not_converted_again(self):
+        self.read()
+        binary = os.path.join(self.tmp, "output", "store", "passing", "season3.col")
+        before = os.stat(binary).st_mtime_ns
+        os.utime(os.path.join(self.tmp, "MEGA_passing.csv"))
+        stat_store.clear()
+
+        self.assertEqual(len(self.read()), 4)
+        self.assertEqual(os.stat(binary).st_mtime_ns, before)
+
+        # A fresh checkout has the committed store but no local stamps.
+        shutil.rmtree(os.path.join(self.tmp, "output", "cache"))
+        stat_store.clear()
+
+        self.assertEqual(len(self.read()), 4)
+        self.assertEqual(os.stat(binary).st_mtime_ns, before)
+
+    def test_earlier_seasons_are_kept(self):
+        self.read()
+        self.write("MEGA_teams.csv", "displayName,seasonIndex\nBears,4\nBrowns,4\n")
+        self.write("MEGA_passing.csv", PASSING.splitlines(True)[0] + "Bears,7,Rookie,90\n")
+
+        self.assertEqual(stat_store.seasons("passing", root=self.tmp), [3, 4])
+        self.assertEqual(self.read(), [("Bears", "7")])
+        self.assertEqual(self.read(season=3, team="Lions"), [("Lions", "3")])
+
+
+class WeeklyDeltaTests(unittest.TestCase):
+    HEADER = "team__displayName,player__rosterId,player__fullName,gamesPlayed,passTotalYds,passerAvgRating\n"
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = os.path.join(self.tmp, "cache")
+        league_data.clear()
+        stat_store.clear()
+
+    def tearDown(self):
+        league_data.CACHE_DIR = self.saved_cache_dir
+        league_data.clear()
+        stat_store.clear()
+        shutil.rmtree(self.tmp)
+
+    def export(self, week, rows):
+        files = {"MEGA_teams.csv": f"displayName,seasonIndex,stageIndex,weekIndex\nBears,3,1,{week}\n",
+                 "MEGA_passing.csv": self.HEADER + "".join(r + "\n" for r in rows)}
+        for name, text in files.items():
+            with open(os.path.join(self.tmp, name), "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+        league_data.clear()
+        stat_store.refresh("passing", self.tmp)
+
+    def facts(self, weeks=None):
+        table, covered = stat_store.weekly_table("passing", weeks, root=self.tmp)
+        return [(r["weekIndex"], r["player__rosterId"], r["passTotalYds"]) for r in table.rows()], covered
+
+    def test_increments_are_joined_by_roster_id_and_team(self):
+        self.export(4, ["Bears,1,Starter,5,1000,90.5", "Bears,2,Backup,1,10,40.0"])
+        self.export(5, ["Bears,2,Backup,1,10,40.0", "Bears,1,Starter,6,1210,92.0",
+                        "11:Browns,2,Backup,1,35,70.0", "Bears,3,Rookie,1,12,60.0"])
+
+        facts, covered = self.facts(weeks=1)
+        # The unchanged backup is left out; the traded one is a new (player, team).
+        self.assertEqual(facts, [("5", "1", "210"), ("5", "2", "35"), ("5", "3", "12")])
+        self.assertEqual(covered, (5, 5))
+        table, _ = stat_store.weekly_table("passing", 1, root=self.tmp)
+        self.assertNotIn("passerAvgRating", table.fieldnames)
+        self.assertEqual(table.rows()[0]["gamesPlayed"], "1")
+
+    def test_rolling_window_skips_segments_reaching_before_it(self):
+        self.export(4, ["Bears,1,Starter,5,1000,90.5"])
+        self.export(5, ["Bears,1,Starter,6,1210,92.0"])
+        self.export(7, ["Bears,1,Starter,8,1500,92.0"])
+
+        self.assertEqual(self.facts(weeks=3), ([("5", "1", "210"), ("7", "1", "290")], (5, 7)))
+        # Weeks 6-7 came in one export, so a one-week window has nothing whole.
+        self.assertEqual(self.facts(weeks=1), ([], (8, 7)))
+        self.assertEqual(len(self.facts()[0]), 3)
+
+    def test_an_unchanged_export_still_covers_the_new_week(self):
+        self.export(4, ["Bears,1,Starter,5,1000,90.5"])
+        self.export(5, ["Bears,1,Starter,5,1000,90.5"])
+
+        self.assertEqual(self.facts(weeks=1), ([], (5, 5)))
+
+    def test_rereading_an_export_appends_nothing(self):
+        self.export(4, ["Bears,1,Starter,5,1000,90.5"])
+        self.export(5, ["Bears,1,Starter,6,1210,92.0"])
+        os.remove(os.path.join(self.tmp, "output", "store", "passing", "manifest.json"))
+        stat_store.refresh("passing", self.tmp)
+
+        self.assertEqual(len(stat_store.weekly_segments("passing", root=self.tmp)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
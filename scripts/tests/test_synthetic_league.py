@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "fixtures"))
+
+import generate_synthetic_league as gen  # noqa: E402
+
+
+def read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+class SyntheticLeagueTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.src = gen.Source()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def generate(self, name, seed=0):
+        out = os.path.join(self.tmp, name)
+        gen.generate_league(self.src, out, "SYN1", seasons=6, players=800, current_week=10, seed=seed)
+        return out
+
+    def test_files_keep_the_export_schemas(self):
+        out = self.generate("a")
+
+        for name in ("MEGA_games.csv", "MEGA_rankings.csv", "MEGA_players.csv", "MEGA_teams.csv") + gen.STAT_FILES:
+            fields, _ = read(os.path.join(out, name))
+            real_fields, _ = read(os.path.join(gen.ROOT, name))
+            self.assertEqual(fields, real_fields, name)
+
+        _, games = read(os.path.join(out, "MEGA_games.csv"))
+        self.assertEqual(sorted({g["seasonIndex"] for g in games}, key=int), [str(s) for s in range(6)])
+        unplayed = {int(g["weekIndex"]) for g in games
+                    if g["seasonIndex"] == "5" and g["stageIndex"] == "1" and g["status"] == "1"}
+        self.assertEqual(min(unplayed), 10)
+
+        _, players = read(os.path.join(out, "MEGA_players.csv"))
+        roster_ids = {p["rosterId"] for p in players}
+        self.assertEqual(len(roster_ids), 800)
+        for name in gen.STAT_FILES:
+            _, rows = read(os.path.join(out, name))
+            self.assertTrue(rows, name)
+            self.assertLessEqual({r["player__rosterId"] for r in rows}, roster_ids)
+
+    def test_rankings_records_match_the_games(self):
+        out = self.generate("a")
+        _, games = read(os.path.join(out, "MEGA_games.csv"))
+        _, rankings = read(os.path.join(out, "MEGA_rankings.csv"))
+
+        last = max(int(r["weekIndex"]) for r in rankings if r["seasonIndex"] == "5")
+        wins = {}
+        for g in games:
+            if (g["seasonIndex"] == "5" and g["stageIndex"] == "1" and g["status"] != "1"
+                    and int(g["homeScore"]) != int(g["awayScore"])):
+                winner = g["homeTeam"] if int(g["homeScore"]) > int(g["awayScore"]) else g["awayTeam"]
+                wins[winner] = wins.get(winner, 0) + 1
+        for r in rankings:
+            if r["seasonIndex"] == "5" and int(r["weekIndex"]) == last:
+                self.assertEqual(int(r["totalWins"]), wins.get(r["team"], 0), r["team"])
+
+    def test_same_seed_gives_the_same_files(self):
+        a, b = self.generate("a"), self.generate("b")
+        c = self.generate("c", seed=1)
+
+        for name in ("MEGA_games.csv", "MEGA_players.csv", "MEGA_defense.csv"):
+            self.assertEqual(read(os.path.join(a, name)), read(os.path.join(b, name)))
+        self.assertNotEqual(read(os.path.join(a, "MEGA_players.csv")), read(os.path.join(c, "MEGA_players.csv")))
+
+
+if __name__ == "__main__":
+    unittest.main()
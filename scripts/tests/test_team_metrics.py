@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+import csv
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATS_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "stats_scripts")
+if STATS_DIR not in sys.path:
+    sys.path.insert(0, STATS_DIR)
+
+import aggregate_team_stats as agg  # noqa: E402
+import league_data  # noqa: E402
+import stat_store  # noqa: E402
+import stats_common  # noqa: E402
+from stats_common import group_by_team  # noqa: E402
+
+
+def stint(team, **stats):
+    row = {"team": team}
+    row.update({k: str(v) for k, v in stats.items()})
+    return row
+
+
+class GroupByTeamTests(unittest.TestCase):
+    def test_buckets_by_canonical_name_in_file_order(self):
+        rows = [
+            {"team__displayName": "11:Browns", "id": "a"},
+            {"team__displayName": "Bears", "id": "b"},
+            {"team__displayName": " Browns ", "id": "c"},
+            {"team__displayName": "", "id": "d"},
+        ]
+
+        buckets = group_by_team(rows, "team__displayName")
+
+        self.assertEqual(sorted(buckets), ["Bears", "Browns"])
+        self.assertEqual([r["id"] for r in buckets["Browns"]], ["a", "c"])
+
+
+def table(rows):
+    fieldnames = sorted({k for r in rows for k in r})
+    return league_data.Table(fieldnames, {f: [r.get(f, "") for r in rows] for f in fieldnames})
+
+
+class MetricTableTests(unittest.TestCase):
+    TEAMS = ["Bears", "Browns"]
+
+    def evaluate(self, stints, defense=()):
+        sources = {name: stats_common.GroupedColumns(table([]), "team__displayName", self.TEAMS)
+                   for name in ("passing", "punting", "kicking")}
+        sources["stints"] = stats_common.GroupedColumns(table(stints), "team", self.TEAMS)
+        sources["defense"] = stats_common.GroupedColumns(table(list(defense)), "team__displayName", self.TEAMS)
+        columns = {"wins": [2.0, 0.0], "losses": [1.0, 0.0], "ties": [0.0, 0.0]}
+        return agg.evaluate_metrics(agg.TEAM_METRICS, sources, columns)
+
+    def test_sums_ratios_and_per_game(self):
+        columns = self.evaluate([
+            stint("Bears", passTotalAtt=30, passTotalComp=20, passTotalSacks=2, recTotalCatches=4, recTotalDrops=1),
+            stint("Browns", passTotalAtt=7),
+            stint("Bears", passTotalAtt=10, passTotalComp=5, recTotalCatches=2, recTotalDrops=2),
+        ])
+
+        self.assertEqual(columns["pass_att"], [40.0, 7.0])
+        self.assertEqual(columns["pass_comp_pct"][0], 25.0 / 40.0 * 100)
+        self.assertEqual(columns["sack_rate"][0], 2.0 / 42.0 * 100)
+        self.assertEqual(columns["pass_att_per_game"], [40.0 / 3.0, 7.0])
+        # Only the first receiver has 5 catchable targets.
+        self.assertEqual(columns["drop_rate"], [1.0 / 5.0 * 100, 0])
+        self.assertNotIn("_qualified_drops", columns)
+
+    def test_empty_groups_keep_integer_zeros(self):
+        columns = self.evaluate([stint("Bears", passTotalAtt="")])
+
+        self.assertEqual(columns["pass_att"], [0.0, 0])
+        self.assertIs(type(columns["pass_att"][1]), int)
+        self.assertIs(type(columns["pass_yds_per_att"][0]), int)
+        self.assertEqual(columns["qb_rating"], [0.0, 0.0])
+
+    def test_numpy_and_plain_reductions_match_row_sums(self):
+        defense = [
+            {"team__displayName": "Bears" if i % 3 else "Browns",
+             "defTotalSacks": str(i % 7 / 2), "defTotalTackles": "" if i % 5 == 0 else str(i)}
+            for i in range(50)
+        ]
+        stints = [stint("Bears", recTotalYds=0.1 * i, recTotalCatches=i % 9) for i in range(40)]
+        expected = {
+            "def_sacks": [sum(float(d["defTotalSacks"]) for d in defense if d["team__displayName"] == t)
+                          for t in self.TEAMS],
+            "rec_yds": [sum(0.1 * i for i in range(40)), 0],
+        }
+
+        results = [self.evaluate(stints, defense)]
+        saved_np = stats_common.np
+        stats_common.np = None
+        try:
+            results.append(self.evaluate(stints, defense))
+        finally:
+            stats_common.np = saved_np
+
+        for columns in results:
+            self.assertEqual(columns["def_sacks"], expected["def_sacks"])
+            self.assertEqual(columns["rec_yds"], expected["rec_yds"])
+        self.assertEqual(results[0], results[1])
+
+
+class RollingTeamStatsTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.saved_cache_dir = league_data.CACHE_DIR
+        league_data.CACHE_DIR = os.path.join(self.tmp, "cache")
+        self.output = Path(self.tmp) / "output" / "team_rolling_stats.csv"
+
+    def tearDown(self):
+        league_data.CACHE_DIR = self.saved_cache_dir
+        league_data.clear()
+        stat_store.clear()
+        shutil.rmtree(self.tmp)
+
+    def export(self, week, passing_yards, season=3):
+        files = {
+            "MEGA_teams.csv": "displayName,seasonIndex,stageIndex,weekIndex\n"
+                              f"Bears,{season},1,{week}\nBrowns,{season},1,{week}\n",
+            "MEGA_passing.csv": "team__displayName,player__rosterId,passTotalAtt,passTotalYds\n"
+                                f"Bears,1,{passing_yards // 10},{passing_yards}\n",
+        }
+        for kind in ("rushing", "receiving", "defense"):
+            files[f"MEGA_{kind}.csv"] = "team__displayName,player__rosterId\n"
+        for name, text in files.items():
+            with open(os.path.join(self.tmp, name), "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+        league_data.clear()
+        stat_store.clear()
+        return agg.aggregate_rolling_team_stats(Path(self.tmp), weeks=2)
+
+    def test_nothing_is_written_without_a_complete_window(self):
+        self.assertIsNone(self.export(4, 1000))
+        self.assertFalse(self.output.exists())
+
+        self.assertIsNotNone(self.export(5, 1200))
+        self.assertIsNotNone(self.export(6, 1500))
+        with open(self.output, newline="", encoding="utf-8") as f:
+            rows = {r["team"]: r for r in csv.DictReader(f)}
+        self.assertEqual((rows["Bears"]["first_week"], rows["Bears"]["last_week"]), ("5", "6"))
+        self.assertEqual((rows["Bears"]["pass_yds"], rows["Browns"]["pass_yds"]), ("500.0", "0"))
+
+        # A new season starts over: its first export spans weeks 0..N.
+        self.export(2, 300, season=4)
+        self.assertFalse(self.output.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
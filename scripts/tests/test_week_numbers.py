@@ -8,6 +8,7 @@ SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if SCRIPTS_DIR not in sys.path:
     sys.path.insert(0, SCRIPTS_DIR)
 
+from calc_playoff_probabilities import GameModel  # noqa: E402
 from team_scenario_report import calculate_game_probabilities  # noqa: E402
 
 
@@ -34,7 +35,7 @@ class WeekNumberTests(unittest.TestCase):
         ]
 
         game_probs = calculate_game_probabilities(
-            team_name, teams_info, stats, remaining_games
+            team_name, teams_info, stats, remaining_games, GameModel(teams_info, stats, {})
         )
 
         self.assertEqual(len(game_probs), 1)
@@ -3,15 +3,15 @@ import csv
 import os
 from collections import defaultdict
 
+from league_data import read_rows
+
 def read_standings():
     teams_div = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            div = row.get('divisionName', '').strip()
-            conf = row.get('conferenceName', '').strip()
-            teams_div[team] = {'division': div, 'conference': conf}
+    for row in read_rows('MEGA_teams.csv'):
+        team = row['displayName'].strip()
+        div = row.get('divisionName', '').strip()
+        conf = row.get('conferenceName', '').strip()
+        teams_div[team] = {'division': div, 'conference': conf}
 
     with open('output/ranked_sos_by_conference.csv', 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
@@ -1,42 +1,45 @@
 #!/usr/bin/env python3
-import csv
+import base64
 import json
+import struct
 from collections import defaultdict
 
+import calc_playoff_probabilities as playoff_model
+from league_data import read_rows
+
+# Simulations behind the live odds panel, run in a Web Worker in the page
+ODDS_SIMULATIONS = 2000
+
 def load_teams_data():
     teams_info = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            logo_id = row.get('logoId', '').strip()
-            logo_url = f'https://cdn.neonsportz.com/teamlogos/256/{logo_id}.png' if logo_id else ''
-            teams_info[team] = {
-                'division': row.get('divisionName', '').strip(),
-                'conference': row.get('conferenceName', '').strip(),
-                'logo_url': logo_url
-            }
+    for row in read_rows('MEGA_teams.csv'):
+        team = row['displayName'].strip()
+        logo_id = row.get('logoId', '').strip()
+        logo_url = f'https://cdn.neonsportz.com/teamlogos/256/{logo_id}.png' if logo_id else ''
+        teams_info[team] = {
+            'division': row.get('divisionName', '').strip(),
+            'conference': row.get('conferenceName', '').strip(),
+            'logo_url': logo_url
+        }
     return teams_info
 
 def load_games():
     games = []
-    with open('MEGA_games.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            status = int(row['status']) if row['status'] else 1
-            week = int(row['weekIndex']) if row['weekIndex'] else 0
-            home_score = int(row['homeScore']) if row['homeScore'] else 0
-            away_score = int(row['awayScore']) if row['awayScore'] else 0
-            games.append({
-                'id': row['id'],
-                'home': row['homeTeam'].strip(),
-                'away': row['awayTeam'].strip(),
-                'home_score': home_score,
-                'away_score': away_score,
-                'week': week,
-                'status': status,
-                'completed': status in [2, 3, 4]
-            })
+    for row in read_rows('MEGA_games.csv'):
+        status = int(row['status']) if row['status'] else 1
+        week = int(row['weekIndex']) if row['weekIndex'] else 0
+        home_score = int(row['homeScore']) if row['homeScore'] else 0
+        away_score = int(row['awayScore']) if row['awayScore'] else 0
+        games.append({
+            'id': row['id'],
+            'home': row['homeTeam'].strip(),
+            'away': row['awayTeam'].strip(),
+            'home_score': home_score,
+            'away_score': away_score,
+            'week': week,
+            'status': status,
+            'completed': status in [2, 3, 4]
+        })
     return games
 
 def calculate_team_stats(teams_info, games):
@@ -160,6 +163,27 @@ def calculate_team_stats(teams_info, games):
     
     return stats
 
+def game_thresholds(week18_games):
+    """Outcome thresholds for ``week18_games`` from the playoff probability model.
+    
+    Returns a base64 little-endian Float32Array holding ``[tie, home]`` per
+    game, in ``week18_games`` order: a uniform draw below ``tie`` is a tie,
+    below ``home`` a home win, anything else an away win, exactly as in
+    ``calc_playoff_probabilities.GameModel``. Games the model does not know
+    fall back to a coin flip.
+    """
+    teams_info, games, _ = playoff_model.load_data()
+    rankings = playoff_model.load_rankings_data()
+    _, model = playoff_model.load_season_model(teams_info, games, rankings)
+    by_game = {
+        (e['game']['week'], e['home'], e['away']): (e['tie_threshold'], e['home_threshold'])
+        for e in model.remaining
+    }
+    values = []
+    for g in week18_games:
+        values.extend(by_game.get((g['week'], g['home'], g['away']), (0.0, 0.5)))
+    return base64.b64encode(struct.pack(f'<{len(values)}f', *values)).decode('ascii')
+
 def generate_html():
     teams_info = load_teams_data()
     games = load_games()
@@ -168,6 +192,7 @@ def generate_html():
     week18_games = [g for g in games if g['week'] == 17 and not g['completed']]
     
     current_stats = calculate_team_stats(teams_info, completed_games)
+    thresholds_b64 = game_thresholds(week18_games)
     
     week18_games_json = json.dumps([{
         'id': g['id'],
@@ -184,19 +209,17 @@ def generate_html():
     } for g in completed_games])
     
     current_standings = {}
-    with open('MEGA_teams.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            team = row['displayName'].strip()
-            w = int(row['totalWins']) if row['totalWins'] else 0
-            l = int(row['totalLosses']) if row['totalLosses'] else 0
-            t = int(row['totalTies']) if row['totalTies'] else 0
-            current_standings[team] = {
-                'W': w,
-                'L': l,
-                'T': t,
-                'win_pct': (w + 0.5 * t) / (w + l + t) if (w + l + t) > 0 else 0
-            }
+    for row in read_rows('MEGA_teams.csv'):
+        team = row['displayName'].strip()
+        w = int(row['totalWins']) if row['totalWins'] else 0
+        l = int(row['totalLosses']) if row['totalLosses'] else 0
+        t = int(row['totalTies']) if row['totalTies'] else 0
+        current_standings[team] = {
+            'W': w,
+            'L': l,
+            'T': t,
+            'win_pct': (w + 0.5 * t) / (w + l + t) if (w + l + t) > 0 else 0
+        }
     
     standings_json = json.dumps(current_standings)
     
@@ -459,6 +482,35 @@ def generate_html():
                 grid-template-columns: 1fr;
             }}
         }}
+        .odds-status {{
+            color: #64748b;
+            font-size: 0.9em;
+            margin-bottom: 15px;
+        }}
+        .odds-table {{
+            width: 100%;
+            border-collapse: collapse;
+            font-size: 0.9em;
+        }}
+        .odds-table th, .odds-table td {{
+            padding: 6px 8px;
+            text-align: right;
+            border-bottom: 1px solid #e2e8f0;
+        }}
+        .odds-table th:first-child, .odds-table td:first-child {{
+            text-align: left;
+        }}
+        .odds-table th {{
+            color: #64748b;
+            font-weight: 600;
+        }}
+        .odds-table td.locked {{
+            color: #059669;
+            font-weight: bold;
+        }}
+        .odds-table td.out {{
+            color: #94a3b8;
+        }}
         .hidden {{
             display: none;
         }}
@@ -486,7 +538,22 @@ def generate_html():
             <button class="btn btn-secondary" onclick="randomizeGames()">Randomize All Games</button>
             <button class="btn btn-secondary" onclick="resetGames()">Reset Selections</button>
         </div>
-        
+
+        <div id="odds" class="results-section hidden">
+            <h2>Live Playoff Odds</h2>
+            <div id="odds-status" class="odds-status"></div>
+            <div class="conference-results">
+                <div class="conference">
+                    <h3>AFC</h3>
+                    <div id="afc-odds"></div>
+                </div>
+                <div class="conference">
+                    <h3>NFC</h3>
+                    <div id="nfc-odds"></div>
+                </div>
+            </div>
+        </div>
+
         <div id="results" class="results-section hidden">
             <h2>Playoff Seeding Results</h2>
             <div class="conference-results">
@@ -507,8 +574,13 @@ def generate_html():
         const teamsInfo = {teams_info_json};
         const completedGames = {completed_games_json};
         const currentStandings = {standings_json};
+        // [tie, home] outcome thresholds per Week 18 game, base64 Float32Array
+        const gameThresholds = '{thresholds_b64}';
+        const ODDS_SIMULATIONS = {ODDS_SIMULATIONS};
+        const TIE = 'TIE';
         
         let gameSelections = {{}};
+        let oddsWorker = null;
         
         function initializeGames() {{
             const afcGames = document.getElementById('afc-games');
@@ -560,6 +632,7 @@ def generate_html():
                     btn.classList.add('selected');
                 }}
             }});
+            requestOdds();
         }}
         
         function randomizeGames() {{
@@ -575,6 +648,7 @@ def generate_html():
                 btn.classList.remove('selected');
             }});
             document.getElementById('results').classList.add('hidden');
+            requestOdds();
         }}
         
         function simulatePlayoffs() {{
@@ -591,7 +665,7 @@ def generate_html():
             document.getElementById('results').classList.remove('hidden');
         }}
         
-        function calculateFinalStats() {{
+        function calculateBaseStats() {{
             const stats = {{}};
             
             for (let team in teamsInfo) {{
@@ -624,9 +698,18 @@ def generate_html():
                 processGame(stats, game.home, game.away, game.home_score, game.away_score);
             }});
             
+            return stats;
+        }}
+        
+        // Pass the result of calculateBaseStats() as base to skip replaying the completed games
+        function calculateFinalStats(selections = gameSelections, base = null) {{
+            const stats = base ? structuredClone(base) : calculateBaseStats();
+            
             week18Games.forEach(game => {{
-                const winner = gameSelections[game.id];
-                if (winner) {{
+                const winner = selections[game.id];
+                if (winner === TIE) {{
+                    processGame(stats, game.home, game.away, 20, 20, true);
+                }} else if (winner) {{
                     const isHomeWin = winner === game.home;
                     const home_score = isHomeWin ? 24 : 17;
                     const away_score = isHomeWin ? 17 : 24;
@@ -665,9 +748,12 @@ def generate_html():
                 if (home_score > away_score) {{
                     stats[home].W++;
                     stats[away].L++;
-                }} else {{
+                }} else if (away_score > home_score) {{
                     stats[away].W++;
                     stats[home].L++;
+                }} else {{
+                    stats[home].T++;
+                    stats[away].T++;
                 }}
             }}
             
@@ -1468,7 +1554,152 @@ def generate_html():
             }});
         }}
         
+        // Monte Carlo odds. The worker is built from the seeding functions
+        // above, so simulated seasons are seeded exactly like a manual pick.
+        const ODDS_WORKER_FUNCTIONS = [
+            calculateBaseStats, calculateFinalStats, processGame,
+            breakTwoTeamDivisionTie, breakMultiTeamDivisionTie,
+            breakTwoTeamWildcardTie, breakMultiTeamWildcardTie,
+            applyDivisionTiebreaker, applyWildcardTiebreaker,
+            getSeedingTiebreaker, determinePlayoffSeeding
+        ];
+        
+        function oddsWorkerMain() {{
+            const BATCH = 200;
+            let thresholds = null;
+            let base = null;
+            let teams = [];
+            let current = 0;
+            
+            self.onmessage = ({{ data }}) => {{
+                if (data.type === 'init') {{
+                    self.teamsInfo = data.teamsInfo;
+                    self.completedGames = data.completedGames;
+                    self.currentStandings = data.currentStandings;
+                    self.week18Games = data.week18Games;
+                    thresholds = new Float32Array(data.thresholds);
+                    teams = Object.keys(teamsInfo);
+                    base = calculateBaseStats();
+                    return;
+                }}
+                
+                // A new run supersedes the one in progress, which stops at its next batch
+                const run = data.run;
+                current = run;
+                const picks = data.picks;
+                const index = {{}};
+                teams.forEach((team, i) => {{ index[team] = i; }});
+                const open = week18Games.filter(g => !picks[g.id]).length;
+                const total = open > 0 ? data.simulations : 1;
+                // counts[team * 7 + seed - 1]: simulations in which team got that seed
+                const counts = new Uint32Array(teams.length * 7);
+                let done = 0;
+                
+                const batch = () => {{
+                    if (run !== current) return;
+                    const end = Math.min(total, done + BATCH);
+                    for (; done < end; done++) {{
+                        const selections = {{}};
+                        week18Games.forEach((game, i) => {{
+                            let pick = picks[game.id];
+                            if (!pick) {{
+                                const draw = Math.random();
+                                pick = draw < thresholds[2 * i] ? TIE : draw < thresholds[2 * i + 1] ? game.home : game.away;
+                            }}
+                            selections[game.id] = pick;
+                        }});
+                        const {{ playoffs }} = determinePlayoffSeeding(calculateFinalStats(selections, base));
+                        for (const conf in playoffs) {{
+                            playoffs[conf].forEach((seed, k) => {{ counts[index[seed.team] * 7 + k]++; }});
+                        }}
+                    }}
+                    self.postMessage({{ run, teams, counts, simulations: done, total, open }});
+                    if (done < total) setTimeout(batch, 0);
+                }};
+                // Start on a fresh task so picks clicked in quick succession skip straight to the last one
+                setTimeout(batch, 0);
+            }};
+        }}
+        
+        function decodeThresholds(b64) {{
+            const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+            return bytes.buffer;
+        }}
+        
+        let oddsRun = 0;
+        
+        function startOddsWorker() {{
+            if (!window.Worker || !window.Blob || week18Games.length === 0) return;
+            const source = [
+                `const TIE = ${{JSON.stringify(TIE)}};`,
+                ...ODDS_WORKER_FUNCTIONS.map(fn => fn.toString()),
+                `(${{oddsWorkerMain.toString()}})();`
+            ].join('\\n');
+            try {{
+                oddsWorker = new Worker(URL.createObjectURL(new Blob([source], {{ type: 'text/javascript' }})));
+            }} catch (e) {{
+                console.warn('Live odds unavailable:', e);
+                return;
+            }}
+            const thresholds = decodeThresholds(gameThresholds);
+            oddsWorker.postMessage({{
+                type: 'init',
+                teamsInfo, completedGames, currentStandings, week18Games,
+                thresholds
+            }}, [thresholds]);
+            oddsWorker.onmessage = ({{ data }}) => {{
+                if (data.run === oddsRun) displayOdds(data);
+            }};
+            document.getElementById('odds').classList.remove('hidden');
+            requestOdds();
+        }}
+        
+        function requestOdds() {{
+            if (!oddsWorker) return;
+            oddsRun++;
+            oddsWorker.postMessage({{ type: 'run', run: oddsRun, picks: {{ ...gameSelections }}, simulations: ODDS_SIMULATIONS }});
+        }}
+        
+        function formatOdds(count, total) {{
+            if (count === total) return {{ text: '✓', cls: 'locked' }};
+            if (count === 0) return {{ text: '—', cls: 'out' }};
+            const pct = 100 * count / total;
+            return {{ text: pct < 0.1 ? '<0.1%' : pct > 99.9 ? '>99.9%' : `${{pct.toFixed(1)}}%`, cls: '' }};
+        }}
+        
+        function displayOdds({{ teams, counts, simulations, total, open }}) {{
+            const locked = week18Games.length - open;
+            document.getElementById('odds-status').textContent = open === 0
+                ? `All ${{week18Games.length}} games picked — seeding is fixed.`
+                : `${{simulations.toLocaleString()}} of ${{total.toLocaleString()}} simulations · ${{locked}} of ${{week18Games.length}} games picked, the rest drawn from the playoff model's win probabilities`;
+            
+            ['AFC', 'NFC'].forEach(conf => {{
+                const rows = [];
+                teams.forEach((team, i) => {{
+                    if (teamsInfo[team].conference !== conf) return;
+                    const seeds = counts.subarray(i * 7, i * 7 + 7);
+                    const sum = (from, to) => seeds.slice(from, to).reduce((a, b) => a + b, 0);
+                    rows.push({{ team, playoffs: sum(0, 7), division: sum(0, 4), bye: seeds[0] }});
+                }});
+                rows.sort((a, b) => b.playoffs - a.playoffs || b.division - a.division || b.bye - a.bye);
+                
+                const cell = count => {{
+                    const {{ text, cls }} = formatOdds(count, simulations);
+                    return `<td class="${{cls}}">${{text}}</td>`;
+                }};
+                document.getElementById(`${{conf.toLowerCase()}}-odds`).innerHTML = `
+                    <table class="odds-table">
+                        <thead><tr><th>Team</th><th>Playoffs</th><th>Division</th><th>#1 Seed</th></tr></thead>
+                        <tbody>
+                            ${{rows.map(r => `<tr><td>${{r.team}}</td>${{cell(r.playoffs)}}${{cell(r.division)}}${{cell(r.bye)}}</tr>`).join('')}}
+                        </tbody>
+                    </table>
+                `;
+            }});
+        }}
+        
         initializeGames();
+        startOddsWorker();
     </script>
 </body>
 </html>
@@ -6,8 +6,7 @@ Calculates distribution metrics for passing targets, rushing attempts, etc.
 
 import csv
 from pathlib import Path
-from collections import defaultdict
-from stats_common import load_csv, safe_float, normalize_team_display
+from stats_common import load_csv, safe_float, normalize_team_display, group_by_team
 
 def calculate_herfindahl_index(shares):
     """Calculate Herfindahl-Hirschman Index for concentration."""
@@ -38,6 +37,9 @@ def aggregate_player_usage(base_path):
     team_names = sorted(teams_map.keys())
     
     print(f"Processing {len(team_names)} teams...")
+
+    # Bucket trade-aware stints by team once instead of rescanning per team.
+    stints_by_team = group_by_team(stints, "team")
     
     team_usage = []
     
@@ -61,8 +63,7 @@ def aggregate_player_usage(base_path):
             else 0
         )
 
-        # Slice trade-aware stints for this team.
-        team_stints = [s for s in stints if s.get("team") == team]
+        team_stints = stints_by_team.get(team, [])
         team_receiving = [
             r
             for r in team_stints
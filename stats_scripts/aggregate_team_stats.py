@@ -4,33 +4,225 @@ Aggregate player-level statistics to team-level metrics.
 Creates CSV files with team-aggregated stats and derived efficiency metrics.
 """
 
+import argparse
 import csv
+import sys
 from pathlib import Path
-from collections import defaultdict
 
-from stats_common import load_csv, safe_float, normalize_team_display
+from stats_common import (
+    GroupedColumns, load_columns, load_csv, load_stat_table, load_weekly_table, safe_float, normalize_team_display,
+)
 
 
-def safe_mean(values):
-    """Calculate mean of list, ignoring non-numeric values."""
-    nums = [safe_float(v) for v in values if v and v != ""]
-    return sum(nums) / len(nums) if nums else 0.0
+# ---------------------------------------------------------------------------
+# Metric table
+#
+# Each metric is a (column, fn) pair; fn(sources, columns) returns the
+# column's value for every team, in team order. ``sources`` maps a source name
+# to its stat rows as GroupedColumns, and ``columns`` holds the columns
+# computed so far, so a metric may refer to any column listed above it.
+# Columns starting with "_" are scratch values and are not written out.
+# ---------------------------------------------------------------------------
+
+def at_least(field, minimum):
+    """Row filter: ``field`` is at least ``minimum``."""
+    return lambda rows: rows.mask(lambda v: v >= minimum, field)
+
+
+def qualified_receiver(rows):
+    """Row filter: at least 5 catchable targets (catches + drops)."""
+    return rows.mask(lambda catches, drops: catches + drops >= 5, "recTotalCatches", "recTotalDrops")
+
+
+def field_sum(source, field, where=None):
+    """Sum of ``field`` over the team's ``source`` rows."""
+    def metric(sources, columns):
+        rows = sources[source]
+        return rows.sum(field, where(rows) if where else None)
+    return metric
+
+
+def field_mean(source, field, where):
+    """Mean of ``field`` over the team's ``source`` rows that pass ``where``."""
+    def metric(sources, columns):
+        rows = sources[source]
+        return rows.mean(field, where(rows))
+    return metric
+
+
+def _added(columns, names):
+    if isinstance(names, str):
+        return columns[names]
+    totals = list(columns[names[0]])
+    for name in names[1:]:
+        totals = [t + v for t, v in zip(totals, columns[name])]
+    return totals
+
+
+def added(*names):
+    """Sum of already computed columns."""
+    return lambda sources, columns: _added(columns, names)
+
+
+def difference(a, b):
+    """Column ``a`` minus column ``b``."""
+    return lambda sources, columns: [x - y for x, y in zip(columns[a], columns[b])]
+
+
+def ratio(numerator, denominator, scale=1):
+    """numerator / denominator * scale, or 0 without a positive denominator.
+
+    ``denominator`` may be a tuple of columns, which are added first.
+    """
+    def metric(sources, columns):
+        return [
+            num / den * scale if den > 0 else 0
+            for num, den in zip(columns[numerator], _added(columns, denominator))
+        ]
+    return metric
+
+
+def per_game(column):
+    """Column divided by games played (at least 1)."""
+    def metric(sources, columns):
+        games = [max(g, 1) for g in _added(columns, ("wins", "losses", "ties"))]
+        return [value / g for value, g in zip(columns[column], games)]
+    return metric
+
+
+TEAM_METRICS = [
+    # Offensive passing from trade-aware stints (adjusted and raw).
+    ("pass_att", field_sum("stints", "passTotalAtt")),
+    ("pass_comp", field_sum("stints", "passTotalComp")),
+    ("pass_yds", field_sum("stints", "passTotalYds")),
+    ("pass_tds", field_sum("stints", "passTotalTDs")),
+    ("pass_ints", field_sum("stints", "passTotalInts")),
+    ("pass_ints_raw", field_sum("stints", "passTotalInts_raw")),
+    ("pass_ints_adjustment", difference("pass_ints", "pass_ints_raw")),
+    ("pass_sacks", field_sum("stints", "passTotalSacks")),
+    # QB rating still uses raw MEGA_passing rows.
+    ("qb_rating", field_mean("passing", "passerAvgRating", at_least("passTotalAtt", 20))),
+    # Offensive rushing (adjusted)
+    ("rush_att", field_sum("stints", "rushTotalAtt")),
+    ("rush_yds", field_sum("stints", "rushTotalYds")),
+    ("rush_tds", field_sum("stints", "rushTotalTDs")),
+    ("rush_fum", field_sum("stints", "rushTotalFum")),
+    ("rush_broken_tackles", field_sum("stints", "rushTotalBrokenTackles")),
+    ("rush_yac", field_sum("stints", "rushTotalYdsAfterContact")),
+    ("rush_20plus", field_sum("stints", "rushTotal20PlusYds")),
+    # Receiving (adjusted)
+    ("rec_catches", field_sum("stints", "recTotalCatches")),
+    ("rec_yds", field_sum("stints", "recTotalYds")),
+    ("rec_tds", field_sum("stints", "recTotalTDs")),
+    ("rec_drops", field_sum("stints", "recTotalDrops")),
+    ("rec_yac", field_sum("stints", "recTotalYdsAfterCatch")),
+    # Defensive stats remain based on MEGA_defense rows (already split per team).
+    ("def_sacks", field_sum("defense", "defTotalSacks")),
+    ("def_ints", field_sum("defense", "defTotalInts")),
+    ("def_forced_fum", field_sum("defense", "defTotalForcedFum")),
+    ("def_fum_rec", field_sum("defense", "defTotalFumRec")),
+    ("def_tds", field_sum("defense", "defTotalTDs")),
+    ("def_tackles", field_sum("defense", "defTotalTackles")),
+    ("def_deflections", field_sum("defense", "defTotalDeflections")),
+    # Special teams from MEGA_punting / MEGA_kicking (no trade-specific logic needed).
+    ("punts", field_sum("punting", "puntTotalAtt")),
+    ("punt_avg", field_mean("punting", "puntAvgYdsPerAtt", at_least("puntTotalAtt", 5))),
+    ("punt_net_avg", field_mean("punting", "puntAvgNetYdsPerAtt", at_least("puntTotalAtt", 5))),
+    ("punts_in_20", field_sum("punting", "puntsTotalIn20")),
+    ("punts_touchbacks", field_sum("punting", "puntTotalTBs")),
+    ("fg_att", field_sum("kicking", "fGTotalAtt")),
+    ("fg_made", field_sum("kicking", "fGTotalMade")),
+    ("fg_50plus_att", field_sum("kicking", "fGTotal50PlusAtt")),
+    ("fg_50plus_made", field_sum("kicking", "fGTotal50PlusMade")),
+    ("xp_att", field_sum("kicking", "xPTotalAtt")),
+    ("xp_made", field_sum("kicking", "xPTotalMade")),
+    ("kickoff_touchbacks", field_sum("kicking", "kickoffTotalTBs")),
+    # Totals
+    ("total_off_plays", added("pass_att", "rush_att")),
+    ("total_off_yds", added("pass_yds", "rush_yds")),
+    ("total_off_tds", added("pass_tds", "rush_tds")),
+    ("total_turnovers", added("pass_ints", "rush_fum")),
+    ("total_takeaways", added("def_ints", "def_fum_rec")),
+    # Efficiency
+    ("pass_yds_per_att", ratio("pass_yds", "pass_att")),
+    ("rush_yds_per_att", ratio("rush_yds", "rush_att")),
+    ("pass_comp_pct", ratio("pass_comp", "pass_att", 100)),
+    ("pass_td_pct", ratio("pass_tds", "pass_att", 100)),
+    ("pass_int_pct", ratio("pass_ints", "pass_att", 100)),
+    ("sack_rate", ratio("pass_sacks", ("pass_att", "pass_sacks"), 100)),
+    ("rush_td_pct", ratio("rush_tds", "rush_att", 100)),
+    ("rush_broken_tackle_rate", ratio("rush_broken_tackles", "rush_att")),
+    ("rush_yac_pct", ratio("rush_yac", "rush_yds", 100)),
+    ("rush_explosive_rate", ratio("rush_20plus", "rush_att", 100)),
+    # Drop rate only counts receivers with 5+ catchable targets.
+    ("_qualified_catches", field_sum("stints", "recTotalCatches", qualified_receiver)),
+    ("_qualified_drops", field_sum("stints", "recTotalDrops", qualified_receiver)),
+    ("drop_rate", ratio("_qualified_drops", ("_qualified_catches", "_qualified_drops"), 100)),
+    ("rec_yac_pct", ratio("rec_yac", "rec_yds", 100)),
+    ("rec_yds_per_catch", ratio("rec_yds", "rec_catches")),
+    ("td_per_play", ratio("total_off_tds", "total_off_plays")),
+    ("yds_per_play", ratio("total_off_yds", "total_off_plays")),
+    ("turnover_diff", difference("total_takeaways", "total_turnovers")),
+    # Per game
+    ("pass_yds_per_game", per_game("pass_yds")),
+    ("rush_yds_per_game", per_game("rush_yds")),
+    ("rec_yds_per_game", per_game("rec_yds")),
+    ("off_yds_per_game", per_game("total_off_yds")),
+    ("pass_att_per_game", per_game("pass_att")),
+    ("rush_att_per_game", per_game("rush_att")),
+    ("punts_per_game", per_game("punts")),
+    ("def_sacks_per_game", per_game("def_sacks")),
+    ("def_ints_per_game", per_game("def_ints")),
+    ("pass_ints_per_game", per_game("pass_ints")),
+    ("sacks_allowed_per_game", per_game("pass_sacks")),
+    ("explosive_plays", added("rush_20plus")),
+    ("explosive_plays_per_game", per_game("explosive_plays")),
+    ("pass_rush_ratio", ratio("pass_att", "rush_att")),
+    ("fg_pct", ratio("fg_made", "fg_att", 100)),
+    ("fg_50plus_pct", ratio("fg_50plus_made", "fg_50plus_att", 100)),
+    ("xp_pct", ratio("xp_made", "xp_att", 100)),
+    ("punts_in_20_pct", ratio("punts_in_20", "punts", 100)),
+]
+
+
+# Rolling-window team totals, from the weekly increments the stat store
+# derives from successive exports (raw per-team rows, not trade-adjusted).
+ROLLING_WEEKS = 3
+ROLLING_SOURCES = ("passing", "rushing", "receiving", "defense")
+ROLLING_METRICS = [
+    ("pass_att", field_sum("passing", "passTotalAtt")),
+    ("pass_yds", field_sum("passing", "passTotalYds")),
+    ("pass_tds", field_sum("passing", "passTotalTDs")),
+    ("pass_ints", field_sum("passing", "passTotalInts")),
+    ("pass_yds_per_att", ratio("pass_yds", "pass_att")),
+    ("rush_att", field_sum("rushing", "rushTotalAtt")),
+    ("rush_yds", field_sum("rushing", "rushTotalYds")),
+    ("rush_tds", field_sum("rushing", "rushTotalTDs")),
+    ("rush_yds_per_att", ratio("rush_yds", "rush_att")),
+    ("rec_yds", field_sum("receiving", "recTotalYds")),
+    ("rec_tds", field_sum("receiving", "recTotalTDs")),
+    ("def_sacks", field_sum("defense", "defTotalSacks")),
+    ("def_ints", field_sum("defense", "defTotalInts")),
+    ("def_forced_fum", field_sum("defense", "defTotalForcedFum")),
+]
+
+
+def evaluate_metrics(metrics, sources, columns):
+    """Add every metric in table order to ``columns``, then drop scratch columns."""
+    for column, metric in metrics:
+        columns[column] = metric(sources, columns)
+    for column, _ in metrics:
+        if column.startswith("_"):
+            del columns[column]
+    return columns
+
 
 def aggregate_team_stats(base_path):
     """Aggregate all team statistics from player-level CSVs."""
     
     print("Loading data files...")
     
-    # Raw MEGA stat CSVs (used for QB rating, special teams, and defensive extras).
-    passing = load_csv(base_path / "MEGA_passing.csv")
-    rushing = load_csv(base_path / "MEGA_rushing.csv")
-    receiving = load_csv(base_path / "MEGA_receiving.csv")
-    defense = load_csv(base_path / "MEGA_defense.csv")
-    punting = load_csv(base_path / "MEGA_punting.csv")
-    kicking = load_csv(base_path / "MEGA_kicking.csv")
     teams = load_csv(base_path / "MEGA_teams.csv")
-    # Trade-aware per-team/per-player stints (source of adjusted team volumes).
-    stints = load_csv(base_path / "output" / "player_team_stints.csv")
     
     teams_map = {}
     for t in teams:
@@ -40,6 +232,20 @@ def aggregate_team_stats(base_path):
     
     team_names = sorted(teams_map.keys())
     
+    # Stat rows are loaded as typed columns and grouped by team once; every
+    # metric is then a grouped reduction over those columns.
+    sources = {
+        # Trade-aware per-team/per-player stints (source of adjusted team volumes).
+        "stints": GroupedColumns(
+            load_columns(base_path / "output" / "player_team_stints.csv"), "team", team_names
+        ),
+    }
+    # Raw MEGA stat exports, read from the stat store (used for QB rating,
+    # special teams, and defensive extras).
+    for source in ("passing", "defense", "punting", "kicking"):
+        table = load_stat_table(base_path, source)
+        sources[source] = GroupedColumns(table, "team__displayName", team_names)
+    
     print(f"Processing {len(team_names)} teams...")
     
     team_stats = []
@@ -65,329 +271,15 @@ def aggregate_team_stats(base_path):
             if total_games > 0
             else 0
         )
-
-        # Trade-aware per-team stats from player_team_stints (adjusted layer).
-        team_stints = [s for s in stints if s.get("team") == team]
-
-        # Offensive passing (adjusted and raw)
-        team_data["pass_att"] = sum(
-            safe_float(s.get("passTotalAtt")) for s in team_stints
-        )
-        team_data["pass_comp"] = sum(
-            safe_float(s.get("passTotalComp")) for s in team_stints
-        )
-        team_data["pass_yds"] = sum(
-            safe_float(s.get("passTotalYds")) for s in team_stints
-        )
-        team_data["pass_tds"] = sum(
-            safe_float(s.get("passTotalTDs")) for s in team_stints
-        )
-        team_data["pass_ints"] = sum(
-            safe_float(s.get("passTotalInts")) for s in team_stints
-        )
-        team_data["pass_ints_raw"] = sum(
-            safe_float(s.get("passTotalInts_raw")) for s in team_stints
-        )
-        team_data["pass_ints_adjustment"] = (
-            team_data["pass_ints"] - team_data["pass_ints_raw"]
-        )
-        team_data["pass_sacks"] = sum(
-            safe_float(s.get("passTotalSacks")) for s in team_stints
-        )
-
-        # QB rating still uses raw MEGA_passing rows.
-        team_passing_megarows = [
-            p for p in passing if normalize_team_display(p.get("team__displayName", "")) == team
-        ]
-        team_data["qb_rating"] = safe_mean(
-            [
-                p.get("passerAvgRating")
-                for p in team_passing_megarows
-                if safe_float(p.get("passTotalAtt")) >= 20
-            ]
-        )
-
-        # Offensive rushing (adjusted)
-        team_data["rush_att"] = sum(
-            safe_float(s.get("rushTotalAtt")) for s in team_stints
-        )
-        team_data["rush_yds"] = sum(
-            safe_float(s.get("rushTotalYds")) for s in team_stints
-        )
-        team_data["rush_tds"] = sum(
-            safe_float(s.get("rushTotalTDs")) for s in team_stints
-        )
-        team_data["rush_fum"] = sum(
-            safe_float(s.get("rushTotalFum")) for s in team_stints
-        )
-        team_data["rush_broken_tackles"] = sum(
-            safe_float(s.get("rushTotalBrokenTackles")) for s in team_stints
-        )
-        team_data["rush_yac"] = sum(
-            safe_float(s.get("rushTotalYdsAfterContact")) for s in team_stints
-        )
-        team_data["rush_20plus"] = sum(
-            safe_float(s.get("rushTotal20PlusYds")) for s in team_stints
-        )
-
-        # Receiving (adjusted)
-        team_data["rec_catches"] = sum(
-            safe_float(s.get("recTotalCatches")) for s in team_stints
-        )
-        team_data["rec_yds"] = sum(
-            safe_float(s.get("recTotalYds")) for s in team_stints
-        )
-        team_data["rec_tds"] = sum(
-            safe_float(s.get("recTotalTDs")) for s in team_stints
-        )
-        team_data["rec_drops"] = sum(
-            safe_float(s.get("recTotalDrops")) for s in team_stints
-        )
-        team_data["rec_yac"] = sum(
-            safe_float(s.get("recTotalYdsAfterCatch")) for s in team_stints
-        )
-
-        # Defensive stats remain based on MEGA_defense rows (already split per team).
-        team_defense = [
-            d for d in defense if normalize_team_display(d.get("team__displayName", "")) == team
-        ]
-        
-        team_data["def_sacks"] = sum(
-            safe_float(d.get("defTotalSacks")) for d in team_defense
-        )
-        team_data["def_ints"] = sum(
-            safe_float(d.get("defTotalInts")) for d in team_defense
-        )
-        team_data["def_forced_fum"] = sum(
-            safe_float(d.get("defTotalForcedFum")) for d in team_defense
-        )
-        team_data["def_fum_rec"] = sum(
-            safe_float(d.get("defTotalFumRec")) for d in team_defense
-        )
-        team_data["def_tds"] = sum(
-            safe_float(d.get("defTotalTDs")) for d in team_defense
-        )
-        team_data["def_tackles"] = sum(
-            safe_float(d.get("defTotalTackles")) for d in team_defense
-        )
-        team_data["def_deflections"] = sum(
-            safe_float(d.get("defTotalDeflections")) for d in team_defense
-        )
-
-        # Special teams from MEGA_punting / MEGA_kicking (no trade-specific logic needed).
-        team_punting = [
-            p for p in punting if normalize_team_display(p.get("team__displayName", "")) == team
-        ]
-        team_kicking = [
-            k for k in kicking if normalize_team_display(k.get("team__displayName", "")) == team
-        ]
-
-        team_data["punts"] = sum(
-            safe_float(p.get("puntTotalAtt")) for p in team_punting
-        )
-        team_data["punt_avg"] = safe_mean(
-            [
-                p.get("puntAvgYdsPerAtt")
-                for p in team_punting
-                if safe_float(p.get("puntTotalAtt")) >= 5
-            ]
-        )
-        team_data["punt_net_avg"] = safe_mean(
-            [
-                p.get("puntAvgNetYdsPerAtt")
-                for p in team_punting
-                if safe_float(p.get("puntTotalAtt")) >= 5
-            ]
-        )
-        team_data["punts_in_20"] = sum(
-            safe_float(p.get("puntsTotalIn20")) for p in team_punting
-        )
-        team_data["punts_touchbacks"] = sum(
-            safe_float(p.get("puntTotalTBs")) for p in team_punting
-        )
-
-        team_data["fg_att"] = sum(
-            safe_float(k.get("fGTotalAtt")) for k in team_kicking
-        )
-        team_data["fg_made"] = sum(
-            safe_float(k.get("fGTotalMade")) for k in team_kicking
-        )
-        team_data["fg_50plus_att"] = sum(
-            safe_float(k.get("fGTotal50PlusAtt")) for k in team_kicking
-        )
-        team_data["fg_50plus_made"] = sum(
-            safe_float(k.get("fGTotal50PlusMade")) for k in team_kicking
-        )
-        team_data["xp_att"] = sum(
-            safe_float(k.get("xPTotalAtt")) for k in team_kicking
-        )
-        team_data["xp_made"] = sum(
-            safe_float(k.get("xPTotalMade")) for k in team_kicking
-        )
-        team_data["kickoff_touchbacks"] = sum(
-            safe_float(k.get("kickoffTotalTBs")) for k in team_kicking
-        )
-
-        team_data["total_off_plays"] = team_data["pass_att"] + team_data["rush_att"]
-        team_data["total_off_yds"] = team_data["pass_yds"] + team_data["rush_yds"]
-        team_data["total_off_tds"] = team_data["pass_tds"] + team_data["rush_tds"]
-        team_data["total_turnovers"] = team_data["pass_ints"] + team_data["rush_fum"]
-        team_data["total_takeaways"] = (
-            team_data["def_ints"] + team_data["def_fum_rec"]
-        )
-
-        team_data["pass_yds_per_att"] = (
-            team_data["pass_yds"] / team_data["pass_att"]
-            if team_data["pass_att"] > 0
-            else 0
-        )
-        team_data["rush_yds_per_att"] = (
-            team_data["rush_yds"] / team_data["rush_att"]
-            if team_data["rush_att"] > 0
-            else 0
-        )
-        team_data["pass_comp_pct"] = (
-            team_data["pass_comp"] / team_data["pass_att"] * 100
-            if team_data["pass_att"] > 0
-            else 0
-        )
-        team_data["pass_td_pct"] = (
-            team_data["pass_tds"] / team_data["pass_att"] * 100
-            if team_data["pass_att"] > 0
-            else 0
-        )
-        team_data["pass_int_pct"] = (
-            team_data["pass_ints"] / team_data["pass_att"] * 100
-            if team_data["pass_att"] > 0
-            else 0
-        )
-        team_data["sack_rate"] = (
-            team_data["pass_sacks"]
-            / (team_data["pass_att"] + team_data["pass_sacks"])
-            * 100
-            if (team_data["pass_att"] + team_data["pass_sacks"]) > 0
-            else 0
-        )
-
-        team_data["rush_td_pct"] = (
-            team_data["rush_tds"] / team_data["rush_att"] * 100
-            if team_data["rush_att"] > 0
-            else 0
-        )
-        team_data["rush_broken_tackle_rate"] = (
-            team_data["rush_broken_tackles"] / team_data["rush_att"]
-            if team_data["rush_att"] > 0
-            else 0
-        )
-        team_data["rush_yac_pct"] = (
-            team_data["rush_yac"] / team_data["rush_yds"] * 100
-            if team_data["rush_yds"] > 0
-            else 0
-        )
-        team_data["rush_explosive_rate"] = (
-            team_data["rush_20plus"] / team_data["rush_att"] * 100
-            if team_data["rush_att"] > 0
-            else 0
-        )
-
-        qualified_rec_catches = sum(
-            safe_float(s.get("recTotalCatches"))
-            for s in team_stints
-            if (
-                safe_float(s.get("recTotalCatches"))
-                + safe_float(s.get("recTotalDrops"))
-            )
-            >= 5
-        )
-        qualified_rec_drops = sum(
-            safe_float(s.get("recTotalDrops"))
-            for s in team_stints
-            if (
-                safe_float(s.get("recTotalCatches"))
-                + safe_float(s.get("recTotalDrops"))
-            )
-            >= 5
-        )
-        team_data["drop_rate"] = (
-            qualified_rec_drops
-            / (qualified_rec_catches + qualified_rec_drops)
-            * 100
-            if (qualified_rec_catches + qualified_rec_drops) > 0
-            else 0
-        )
-        team_data["rec_yac_pct"] = (
-            team_data["rec_yac"] / team_data["rec_yds"] * 100
-            if team_data["rec_yds"] > 0
-            else 0
-        )
-        team_data["rec_yds_per_catch"] = (
-            team_data["rec_yds"] / team_data["rec_catches"]
-            if team_data["rec_catches"] > 0
-            else 0
-        )
-
-        team_data["td_per_play"] = (
-            team_data["total_off_tds"] / team_data["total_off_plays"]
-            if team_data["total_off_plays"] > 0
-            else 0
-        )
-        team_data["yds_per_play"] = (
-            team_data["total_off_yds"] / team_data["total_off_plays"]
-            if team_data["total_off_plays"] > 0
-            else 0
-        )
-        team_data["turnover_diff"] = (
-            team_data["total_takeaways"] - team_data["total_turnovers"]
-        )
-
-        games = max(
-            team_data["wins"] + team_data["losses"] + team_data["ties"],
-            1,
-        )
-
-        team_data["pass_yds_per_game"] = team_data["pass_yds"] / games
-        team_data["rush_yds_per_game"] = team_data["rush_yds"] / games
-        team_data["rec_yds_per_game"] = team_data["rec_yds"] / games
-        team_data["off_yds_per_game"] = team_data["total_off_yds"] / games
-        team_data["pass_att_per_game"] = team_data["pass_att"] / games
-        team_data["rush_att_per_game"] = team_data["rush_att"] / games
-        team_data["punts_per_game"] = team_data["punts"] / games
-        team_data["def_sacks_per_game"] = team_data["def_sacks"] / games
-        team_data["def_ints_per_game"] = team_data["def_ints"] / games
-        team_data["pass_ints_per_game"] = team_data["pass_ints"] / games
-        team_data["sacks_allowed_per_game"] = team_data["pass_sacks"] / games
-        team_data["explosive_plays"] = team_data["rush_20plus"]
-        team_data["explosive_plays_per_game"] = (
-            team_data["explosive_plays"] / games
-        )
-
-        team_data["pass_rush_ratio"] = (
-            team_data["pass_att"] / team_data["rush_att"]
-            if team_data["rush_att"] > 0
-            else 0
-        )
-        team_data["fg_pct"] = (
-            team_data["fg_made"] / team_data["fg_att"] * 100
-            if team_data["fg_att"] > 0
-            else 0
-        )
-        team_data["fg_50plus_pct"] = (
-            team_data["fg_50plus_made"] / team_data["fg_50plus_att"] * 100
-            if team_data["fg_50plus_att"] > 0
-            else 0
-        )
-        team_data["xp_pct"] = (
-            team_data["xp_made"] / team_data["xp_att"] * 100
-            if team_data["xp_att"] > 0
-            else 0
-        )
-        team_data["punts_in_20_pct"] = (
-            team_data["punts_in_20"] / team_data["punts"] * 100
-            if team_data["punts"] > 0
-            else 0
-        )
         
         team_stats.append(team_data)
+
+    columns = {name: [t[name] for t in team_stats] for name in ("wins", "losses", "ties")}
+    evaluate_metrics(TEAM_METRICS, sources, columns)
+    for i, team_data in enumerate(team_stats):
+        for column, _ in TEAM_METRICS:
+            if column in columns:
+                team_data[column] = columns[column][i]
     
     output_dir = base_path / 'output'
     output_dir.mkdir(exist_ok=True, parents=True)
@@ -414,10 +306,63 @@ def aggregate_team_stats(base_path):
     
     return team_stats
 
+
+def aggregate_rolling_team_stats(base_path, weeks=ROLLING_WEEKS):
+    """Team totals over the last ``weeks`` weeks of exports, written to
+    output/team_rolling_stats.csv.
+
+    ``first_week``/``last_week`` give the weekIndex range the stat store's
+    weekly facts cover. Until the store holds a complete window (e.g. after
+    the first export of a season, whose increments span the season so far)
+    nothing is written, any earlier file is removed and None is returned.
+    """
+    team_names = sorted({normalize_team_display(t.get("displayName", ""))
+                         for t in load_csv(base_path / "MEGA_teams.csv")} - {""})
+    sources = {}
+    spans = []
+    for source in ROLLING_SOURCES:
+        table, span = load_weekly_table(base_path, source, weeks)
+        sources[source] = GroupedColumns(table, "team__displayName", team_names)
+        spans.append(span)
+    first_week = max(first for first, _ in spans)
+    last_week = min(last for _, last in spans)
+
+    output_file = base_path / 'output' / 'team_rolling_stats.csv'
+    if first_week > last_week:
+        output_file.unlink(missing_ok=True)
+        print(f"⚠ No complete {weeks}-week window in the stat store yet; "
+              f"{output_file.name} not written", file=sys.stderr)
+        return None
+
+    columns = evaluate_metrics(ROLLING_METRICS, sources, {})
+    rows = [
+        {"team": team, "first_week": first_week, "last_week": last_week,
+         **{column: columns[column][i] for column, _ in ROLLING_METRICS}}
+        for i, team in enumerate(team_names)
+    ]
+
+    output_file.parent.mkdir(exist_ok=True, parents=True)
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["team", "first_week", "last_week"] + [c for c, _ in ROLLING_METRICS])
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"✓ Saved {weeks}-week rolling stats (weeks {first_week}-{last_week}) to: {output_file}")
+    return rows
+
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Aggregate team statistics from the MEGA stat exports.")
+    parser.add_argument('--rolling', action='store_true',
+                        help=f"write output/team_rolling_stats.csv ({ROLLING_WEEKS}-week totals) instead; "
+                             "exits with an error while the stat store has no complete window")
+    args = parser.parse_args()
+
     base_path = Path(__file__).parent.parent
     print(f"Working directory: {base_path}\n")
     
-    df = aggregate_team_stats(base_path)
+    if args.rolling:
+        if aggregate_rolling_team_stats(base_path) is None:
+            sys.exit(1)
+    else:
+        df = aggregate_team_stats(base_path)
     
-    print("\n✓ Done! Use team_aggregated_stats.csv for visualizations.")
+        print("\n✓ Done! Use team_aggregated_stats.csv for visualizations.")
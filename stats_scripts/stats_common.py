@@ -3,23 +3,64 @@
 Shared helper utilities for stats scripts.
 """
 
-import csv
 import sys
+from array import array
+from collections import defaultdict
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; grouped sums fall back to plain loops
+    np = None
+
+# league_data lives in scripts/ and caches parsed CSVs for the whole process
+SCRIPTS_DIR = str(Path(__file__).resolve().parent.parent / "scripts")
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import stat_store  # noqa: E402
+from league_data import MappedTable, Table, load_table, read_rows  # noqa: E402
 
 
 def load_csv(filepath: Path) -> List[Dict[str, Any]]:
     """Load a CSV file into a list of dicts with basic error handling."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            return list(reader)
+        return read_rows(str(filepath))
     except Exception as e:
         print(f"Error loading {filepath}: {e}", file=sys.stderr)
         return []
 
 
+def load_columns(filepath: Path) -> Table:
+    """Load a CSV file as a column-oriented ``league_data.Table`` (empty on error)."""
+    try:
+        return load_table(str(filepath))
+    except Exception as e:
+        print(f"Error loading {filepath}: {e}", file=sys.stderr)
+        return Table([], {})
+
+
+def load_stat_table(base_path: Path, kind: str) -> Table:
+    """Load the current ``MEGA_<kind>.csv`` export through the season-partitioned
+    stat store (``stat_store``), as columns (empty on error)."""
+    try:
+        return stat_store.stats_table(kind, root=str(base_path))
+    except Exception as e:
+        print(f"Error loading {kind} stats from {base_path}: {e}", file=sys.stderr)
+        return Table([], {})
+
+
+def load_weekly_table(base_path: Path, kind: str, weeks: int) -> Tuple[Table, Tuple[int, int]]:
+    """Weekly ``kind`` increments over the last ``weeks`` weeks, from the stat
+    store's fact table, with the (first, last) weekIndex covered (empty on error)."""
+    try:
+        return stat_store.weekly_table(kind, weeks, root=str(base_path))
+    except Exception as e:
+        print(f"Error loading weekly {kind} stats from {base_path}: {e}", file=sys.stderr)
+        return Table([], {}), (0, -1)
+
+
 def safe_float(value, default: float = 0.0) -> float:
     """Safely convert a value to float, returning a default on error."""
     try:
@@ -28,6 +69,16 @@ def safe_float(value, default: float = 0.0) -> float:
         return default
 
 
+def float_column(table: Table, name: str) -> List[float]:
+    """Column ``name`` of ``table`` as floats in file order, converted like
+    ``safe_float`` (blank, missing or unparseable cells are 0.0)."""
+    cells = table.columns[name] if name in table.fieldnames else [None] * len(table)
+    try:
+        return list(map(float, cells))
+    except (TypeError, ValueError):
+        return [safe_float(v) for v in cells]
+
+
 def normalize_team_display(name: str) -> str:
     """
     Normalize team display names to a canonical form.
@@ -49,3 +100,147 @@ def normalize_team_display(name: str) -> str:
 
     return text
 
+
+
+def group_by_team(rows: List[Dict[str, Any]], field: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Bucket rows by the canonical team name in ``field`` in a single pass.
+
+    Rows keep their file order inside each bucket; rows without a team are
+    dropped. Look teams up with ``.get(team, [])`` so a team without rows
+    gets an empty bucket.
+    """
+    buckets: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        team = normalize_team_display(row.get(field, ""))
+        if team:
+            buckets[team].append(row)
+    return dict(buckets)
+
+
+class GroupedColumns:
+    """
+    Numeric columns of one table, grouped by the canonical team in ``field``.
+
+    The rows are ordered by team once (file order within a team) and each
+    column is converted to floats once, blanks and unparseable cells being
+    0.0 as with ``safe_float``. ``sum`` and ``mean`` then reduce all teams
+    at once: with NumPy through ``np.add.reduceat`` over the team segments,
+    otherwise by summing ``array('d')`` slices. Results are lists in
+    ``teams`` order, equal to the row-by-row ``sum()`` over each team's rows:
+    a team without rows (or whose rows are all filtered out) gets int 0.
+    """
+
+    def __init__(self, table: Table, field: str, teams: List[str]):
+        self.table = table
+        self.teams = teams
+        self._values: Dict[str, Any] = {}
+        team_ids = {team: i for i, team in enumerate(teams)}
+        raw = table.columns[field] if field in table.fieldnames else [None] * len(table)
+        labels = {v: team_ids.get(normalize_team_display(v), -1) for v in set(raw)}
+        codes = [labels[v] for v in raw]
+        self.order = sorted((i for i, c in enumerate(codes) if c >= 0), key=codes.__getitem__)
+        self.groups: List[int] = []
+        self.bounds: List[int] = []
+        for pos, i in enumerate(self.order):
+            if not self.groups or codes[i] != self.groups[-1]:
+                self.groups.append(codes[i])
+                self.bounds.append(pos)
+        self.bounds.append(len(self.order))
+        if np is not None:
+            self._rows = np.array(self.order, dtype=np.int64)
+            self._starts = np.array(self.bounds[:-1], dtype=np.int64)
+
+    def _cells(self, name: str, typed: bool) -> List[Any]:
+        """Cells of ``name`` in team order: typed values or the raw strings."""
+        if name not in self.table.fieldnames:
+            return [None] * len(self.order)
+        column = self.table.column(name) if typed else self.table.columns[name]
+        return [column[i] for i in self.order]
+
+    def values(self, name: str):
+        """Column ``name`` as floats in team order."""
+        if name in self._values:
+            return self._values[name]
+        floats = None
+        numeric = name in self.table.fieldnames and self.table.kind(name) is not str
+        if isinstance(self.table, MappedTable) and np is not None and numeric:
+            # Converted exports already hold packed numbers. Blank float cells
+            # come back as NaN there, so those columns take the path below.
+            packed = np.asarray(self.table.array(name), dtype=np.float64)
+            if self.table.kind(name) is int or not np.isnan(packed).any():
+                floats = packed[self._rows]
+        if floats is None:
+            floats = float_column(self.table, name)
+            if np is not None:
+                floats = np.array(floats, dtype=np.float64)[self._rows]
+            else:
+                floats = array("d", [floats[i] for i in self.order])
+        self._values[name] = floats
+        return floats
+
+    def present(self, name: str):
+        """Mask of the rows where ``name`` is not blank."""
+        typed = name in self.table.fieldnames and self.table.kind(name) is not str
+        mask = [v is not None and v != "" for v in self._cells(name, typed)]
+        return np.array(mask, dtype=bool) if np is not None else mask
+
+    def mask(self, test: Callable[..., Any], *names: str):
+        """Row mask ``test(*values)``; ``test`` sees whole NumPy columns when
+        NumPy is installed and one row's floats otherwise."""
+        columns = [self.values(name) for name in names]
+        if np is not None:
+            return np.asarray(test(*columns), dtype=bool)
+        return [bool(test(*row)) for row in zip(*columns)]
+
+    def sum(self, name: str, where=None) -> List[Any]:
+        """Per-team sum of ``name`` over the rows where the ``where`` mask holds."""
+        totals, _ = self._reduce(self.values(name), where)
+        return totals
+
+    def mean(self, name: str, where=None) -> List[float]:
+        """Per-team mean of the non-blank ``name`` values passing ``where``
+        (0.0 when there are none)."""
+        present = self.present(name)
+        if where is not None:
+            present = present & where if np is not None else [p and w for p, w in zip(present, where)]
+        totals, counts = self._reduce(self.values(name), present)
+        return [t / c if c else 0.0 for t, c in zip(totals, counts)]
+
+    def _reduce(self, values, where):
+        totals: List[Any] = [0] * len(self.teams)
+        counts = [0] * len(self.teams)
+        if not self.groups:
+            return totals, counts
+        if np is not None:
+            sums, sizes = self._reduce_numpy(values, where)
+        else:
+            sums, sizes = [], []
+            for a, b in zip(self.bounds, self.bounds[1:]):
+                if where is None:
+                    sums.append(sum(values[a:b]))
+                    sizes.append(b - a)
+                else:
+                    picked = [v for v, keep in zip(values[a:b], where[a:b]) if keep]
+                    sums.append(sum(picked))
+                    sizes.append(len(picked))
+        for team, total, size in zip(self.groups, sums, sizes):
+            totals[team] = total if size else 0
+            counts[team] = size
+        return totals, counts
+
+    def _reduce_numpy(self, values, where):
+        if where is None:
+            sizes = np.diff(self.bounds).tolist()
+        else:
+            sizes = np.add.reduceat(where.astype(np.int64), self._starts).tolist()
+            values = np.where(where, values, 0.0)
+        # Multiples of 1/1024 (stat counts, half sacks) add up exactly in any
+        # order while the running total stays below 2**42, so reduceat gives
+        # the same floats as a left-to-right sum. Other columns (averages,
+        # ratings) are summed per team in row order instead.
+        scaled = values * 1024.0
+        if np.array_equal(scaled, np.floor(scaled)) and np.abs(values).sum() < 2.0 ** 42:
+            # + 0.0 turns a -0.0 total into 0.0, as sum() starting from 0 does.
+            return (np.add.reduceat(values, self._starts) + 0.0).tolist(), sizes
+        return [sum(values[a:b].tolist()) for a, b in zip(self.bounds, self.bounds[1:])], sizes